@@ -2,8 +2,10 @@ from flask import Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
 from config import config
-from services import AuthService, InMemoryDBService
-from routes import auth_bp, requests_bp, inventory_bp, donor_bp
+from services import AuthService, InMemoryDBService, InventoryCache, RateLimiter, create_rate_limit_backend
+from services.events import EventBroker
+from routes import auth_bp, requests_bp, inventory_bp, donor_bp, debug_bp, events_bp
+from middleware import FastJSONProvider, compress_response, init_metrics
 import os
 import logging
 
@@ -20,6 +22,9 @@ def create_app(config_name='default'):
     config_obj = config[config_name]()
     app.config.from_object(config_obj)
     
+    # orjson (+ MessagePack on request) for jsonify and dict responses
+    app.json = FastJSONProvider(app)
+    
     # Initialize CORS
     CORS(app, resources={
         r"/api/*": {
@@ -46,23 +51,64 @@ def create_app(config_name='default'):
         logger.info("No DATABASE_URL set — using in-memory database service (local dev mode)")
         app.db_service = InMemoryDBService(config_obj)
     
+    # The in-memory store lives in this process, so no other process can see its
+    # changes: serve /api/events from here. With Postgres the ASGI app serves it.
+    app.event_broker = None
+    if isinstance(app.db_service, InMemoryDBService):
+        app.event_broker = EventBroker(app.config['EVENTS_HISTORY_SIZE'], app.config['EVENTS_QUEUE_SIZE'])
+        app.db_service.events = app.event_broker
+    
     app.auth_service = AuthService(config_obj)
     
+    # Prometheus instrumentation; wraps db_service/auth_service, so before the cache takes its reference
+    if app.config['METRICS_ENABLED']:
+        init_metrics(app)
+    
+    app.inventory_cache = InventoryCache(app.db_service, app.config)
+    app.rate_limiter = RateLimiter(
+        app.config['RATE_LIMITS'],
+        backend=create_rate_limit_backend(app.config['RATE_LIMIT_STORAGE_URL']),
+        enabled=app.config['RATE_LIMIT_ENABLED']
+    )
+    
+    # gzip/brotli large buffered responses (streams are left alone)
+    if app.config['COMPRESS_MIN_SIZE']:
+        @app.after_request
+        def compress(response):
+            return compress_response(response, app.config['COMPRESS_MIN_SIZE'])
+    
     # Register blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(requests_bp)
     app.register_blueprint(inventory_bp)
     app.register_blueprint(donor_bp)
+    app.register_blueprint(debug_bp)
+    if app.event_broker:
+        app.register_blueprint(events_bp)
     
     # Health check endpoint
     @app.route('/health')
     def health():
         db_status = 'connected' if app.db_service.health_check() else 'disconnected'
-        return {
+        response = {
             'status': 'healthy' if db_status == 'connected' else 'unhealthy',
             'service': 'BloodBridge API',
             'database': db_status
-        }, 200 if db_status == 'connected' else 503
+        }
+        
+        # Connection pool stats (RDS only)
+        if hasattr(app.db_service, 'get_pool_stats'):
+            response['pool'] = app.db_service.get_pool_stats()
+            response['statements'] = app.db_service.get_statement_stats()
+        
+        # Password hashing queue
+        response['hashing'] = app.auth_service.hasher.stats()
+        
+        # Change feed (in-memory backend only)
+        if app.event_broker:
+            response['events'] = app.event_broker.stats()
+        
+        return response, 200 if db_status == 'connected' else 503
     
     @app.route('/')
     def index():
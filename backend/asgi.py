@@ -0,0 +1,158 @@
+"""
+ASGI entry point (async serving mode)
+
+Serves the core of app.py's API (auth, requests, inventory, donor) from a
+Quart app with async route handlers and an asyncpg-backed data service, so
+one worker can keep many requests waiting on Postgres at once, plus the
+/api/events change feed. It is not a full replacement for app.py; it does
+not serve:
+
+    POST /api/inventory/bulk, POST /api/inventory/<blood_type>/adjust
+        (inventory changes are absolute PUTs only; AsyncRDSService has no
+        adjust_inventory or bulk_update_inventory)
+    GET  /api/requests/export
+    GET  /api/requests/<request_id>/eligible-donors
+    POST /api/donor/eligibility/batch
+    GET  /api/debug/slow-queries, GET /metrics
+
+and its responses carry no ETag/Last-Modified (no 304s), orjson/MessagePack
+encoding or compression. Run with:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+    gunicorn -k uvicorn.workers.UvicornWorker -c deploy/gunicorn_config.py asgi:app
+"""
+from quart import Quart
+from quart_cors import cors
+from dotenv import load_dotenv
+from config import config
+from services import AuthService, InMemoryDBService, RateLimiter, create_rate_limit_backend
+from services.async_adapter import AsyncServiceAdapter
+from services.inventory_cache import AsyncInventoryCache
+from services.events import EventBroker, PostgresChangeListener
+from async_routes import auth_bp, requests_bp, inventory_bp, donor_bp, events_bp
+import os
+import logging
+
+# Load .env file before anything else
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+def create_async_app(config_name='default'):
+    """Application factory for the ASGI app"""
+    app = Quart(__name__)
+
+    # Load configuration
+    config_obj = config[config_name]()
+    app.config.from_object(config_obj)
+
+    # Initialize CORS
+    app = cors(
+        app,
+        allow_origin=app.config['CORS_ORIGINS'],
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=["Content-Type", "Authorization"]
+    )
+
+    # Change feed behind /api/events: Postgres NOTIFY relayed by a listener,
+    # or published straight from the in-memory service
+    app.event_broker = EventBroker(app.config['EVENTS_HISTORY_SIZE'], app.config['EVENTS_QUEUE_SIZE'])
+    app.change_listener = None
+
+    def in_memory_service():
+        service = InMemoryDBService(config_obj)
+        service.events = app.event_broker
+        return AsyncServiceAdapter(service)
+
+    # Initialize services
+    # Same selection as app.py: AsyncRDSService (asyncpg) if DATABASE_URL is set,
+    # otherwise the in-memory service behind an async adapter
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        from services.async_rds_service import AsyncRDSService
+        app.db_service = AsyncRDSService(config_obj)
+    else:
+        logger.info("No DATABASE_URL set — using in-memory database service (local dev mode)")
+        app.db_service = in_memory_service()
+
+    app.auth_service = AuthService(config_obj)
+    app.inventory_cache = AsyncInventoryCache(app.db_service, app.config)
+    app.rate_limiter = RateLimiter(
+        app.config['RATE_LIMITS'],
+        backend=create_rate_limit_backend(app.config['RATE_LIMIT_STORAGE_URL']),
+        enabled=app.config['RATE_LIMIT_ENABLED']
+    )
+
+    # The asyncpg pool must be created inside the server's event loop
+    @app.before_serving
+    async def startup():
+        try:
+            await app.db_service.initialize()
+            logger.info("Database service initialized")
+        except Exception as e:
+            logger.warning(f"Failed to connect to PostgreSQL: {e}")
+            logger.info("Falling back to in-memory database service")
+            app.db_service = in_memory_service()
+            app.inventory_cache.db_service = app.db_service
+            return
+
+        if database_url:
+            app.change_listener = PostgresChangeListener(app.config['DATABASE_URL'], app.event_broker)
+            await app.change_listener.start()
+
+    @app.after_serving
+    async def shutdown():
+        if app.change_listener:
+            await app.change_listener.stop()
+        await app.db_service.close()
+
+    # Register blueprints
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(requests_bp)
+    app.register_blueprint(inventory_bp)
+    app.register_blueprint(donor_bp)
+    app.register_blueprint(events_bp)
+
+    # Health check endpoint
+    @app.route('/health')
+    async def health():
+        db_status = 'connected' if await app.db_service.health_check() else 'disconnected'
+        response = {
+            'status': 'healthy' if db_status == 'connected' else 'unhealthy',
+            'service': 'BloodBridge API',
+            'mode': 'asgi',
+            'database': db_status
+        }
+
+        # Connection pool stats (RDS only)
+        if hasattr(app.db_service, 'get_pool_stats'):
+            response['pool'] = app.db_service.get_pool_stats()
+
+        # Password hashing queue
+        response['hashing'] = app.auth_service.hasher.stats()
+
+        # Change feed subscribers
+        response['events'] = app.event_broker.stats()
+        if app.change_listener:
+            response['events']['listening'] = app.change_listener.connected
+
+        return response, 200 if db_status == 'connected' else 503
+
+    @app.route('/')
+    async def index():
+        return {
+            'message': 'BloodBridge API',
+            'version': '1.0.0',
+            'endpoints': {
+                'auth': '/api/auth',
+                'requests': '/api/requests',
+                'inventory': '/api/inventory',
+                'donor': '/api/donor',
+                'events': '/api/events'
+            }
+        }, 200
+
+    return app
+
+
+app = create_async_app(os.getenv('FLASK_ENV', 'development'))
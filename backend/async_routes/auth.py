@@ -0,0 +1,147 @@
+from quart import Blueprint, request, jsonify, current_app
+from services import HashingUnavailable
+from middleware.async_middleware import async_rate_limit, async_check_rate_limit
+from datetime import datetime
+import asyncio
+import uuid
+
+auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
+
+@auth_bp.route('/register', methods=['POST'])
+@async_rate_limit('register_ip')
+async def register():
+    """Register a new user"""
+    data = await request.get_json()
+    
+    # Validate required fields
+    required_fields = ['name', 'email', 'password', 'role']
+    if not all(field in data for field in required_fields):
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    # Validate role
+    valid_roles = ['donor', 'hospital', 'manager']
+    if data['role'] not in valid_roles:
+        return jsonify({'error': 'Invalid role'}), 400
+    
+    # Validate blood type for donors
+    if data['role'] == 'donor' and 'blood_type' not in data:
+        return jsonify({'error': 'Blood type required for donors'}), 400
+    
+    # Check if user already exists
+    db_service = current_app.db_service
+    existing_user = await db_service.get_user_by_email(data['email'], fields=['user_id'])
+    
+    if existing_user:
+        return jsonify({'error': 'User with this email already exists'}), 409
+    
+    # Hash password
+    auth_service = current_app.auth_service
+    try:
+        password_hash = await asyncio.to_thread(auth_service.hash_password, data['password'])
+    except HashingUnavailable:
+        return jsonify({'error': 'Server is busy, please try again'}), 503
+    
+    # Create user
+    user_id = str(uuid.uuid4())
+    user_data = {
+        'user_id': user_id,
+        'name': data['name'],
+        'email': data['email'],
+        'password_hash': password_hash,
+        'role': data['role'],
+        'phone': data.get('phone', ''),
+        'created_at': datetime.utcnow().isoformat()
+    }
+    
+    # Add donor-specific fields
+    if data['role'] == 'donor':
+        user_data['blood_type'] = data['blood_type']
+        user_data['last_donation'] = data.get('last_donation', None)
+    
+    # Add hospital-specific fields
+    if data['role'] == 'hospital':
+        user_data['hospital_name'] = data.get('hospital_name', '')
+        user_data['location'] = data.get('location', '')
+    
+    result = await db_service.create_user(user_data)
+    
+    # InMemoryDBService returns True/False, RDSService returns user_id/None
+    if not result:
+        return jsonify({'error': 'Failed to create user'}), 500
+    
+    # If RDS returned a user_id string, use it; otherwise use the one we generated
+    final_user_id = result if isinstance(result, str) else user_id
+    
+    return jsonify({
+        'message': 'User registered successfully',
+        'user_id': final_user_id
+    }), 201
+
+
+@auth_bp.route('/login', methods=['POST'])
+@async_rate_limit('login_ip')
+async def login():
+    """Login user"""
+    data = await request.get_json()
+    
+    # Validate required fields
+    if not all(field in data for field in ['email', 'password']):
+        return jsonify({'error': 'Email and password required'}), 400
+    
+    # Throttle per account before any DB lookup or bcrypt work
+    limited = async_check_rate_limit('login_email', str(data['email']).strip().lower())
+    if limited:
+        return limited
+    
+    # Get user
+    db_service = current_app.db_service
+    user = await db_service.get_user_by_email(data['email'])
+    
+    if not user:
+        return jsonify({'error': 'Invalid credentials'}), 401
+    
+    # Verify password
+    auth_service = current_app.auth_service
+    try:
+        if not await asyncio.to_thread(auth_service.verify_password, data['password'], user['password_hash']):
+            return jsonify({'error': 'Invalid credentials'}), 401
+    except HashingUnavailable:
+        return jsonify({'error': 'Server is busy, please try again'}), 503
+    
+    # Upgrade hashes made with an older, cheaper cost; best effort, the
+    # next login retries if no hashing capacity is free now
+    if auth_service.needs_rehash(user['password_hash']):
+        try:
+            await db_service.update_user(user['user_id'], {
+                'password_hash': await asyncio.to_thread(auth_service.hash_password, data['password'])
+            })
+        except HashingUnavailable:
+            pass
+    
+    # Generate token
+    token = auth_service.generate_token(
+        user['user_id'],
+        user['email'],
+        user['role']
+    )
+    
+    # Prepare user data (exclude password hash)
+    user_data = {
+        'user_id': user['user_id'],
+        'name': user['name'],
+        'email': user['email'],
+        'role': user['role']
+    }
+    
+    if user['role'] == 'donor':
+        user_data['blood_type'] = user.get('blood_type')
+        user_data['last_donation'] = user.get('last_donation')
+    
+    if user['role'] == 'hospital':
+        user_data['hospital_name'] = user.get('hospital_name')
+        user_data['location'] = user.get('location')
+    
+    return jsonify({
+        'token': token,
+        'user': user_data
+    }), 200
@@ -0,0 +1,59 @@
+from quart import Blueprint, request, jsonify, current_app, make_response
+from services.events import EVENT_TYPES
+
+events_bp = Blueprint('events', __name__, url_prefix='/api/events')
+
+@events_bp.route('', methods=['GET'])
+async def stream_events():
+    """Server-Sent Events feed of inventory and request changes
+
+    Each subscriber is a coroutine waiting on its own queue, so idle
+    dashboards hold no worker. Browsers' EventSource cannot send headers,
+    so the token may also be passed as ?access_token=. Optional
+    ?types=inventory.updated,request.created narrows the feed; clients
+    should refetch whatever they display on a 'resync' event.
+    """
+    token = None
+    auth_header = request.headers.get('Authorization')
+    if auth_header:
+        try:
+            token = auth_header.split(' ')[1]  # Bearer <token>
+        except IndexError:
+            return jsonify({'error': 'Invalid token format'}), 401
+    else:
+        token = request.args.get('access_token')
+
+    if not token:
+        return jsonify({'error': 'Token is missing'}), 401
+    if not current_app.auth_service.verify_token(token):
+        return jsonify({'error': 'Token is invalid or expired'}), 401
+
+    types = None
+    if request.args.get('types'):
+        types = set(request.args['types'].split(','))
+        if not types <= EVENT_TYPES:
+            return jsonify({'error': f"types must be among {', '.join(sorted(EVENT_TYPES))}"}), 400
+
+    config = current_app.config
+    subscription = current_app.event_broker.subscribe(
+        last_event_id=request.headers.get('Last-Event-ID') or request.args.get('last_event_id'),
+        types=types
+    )
+
+    async def generate():
+        try:
+            yield f"retry: {config['EVENTS_RETRY_MS']}\n\n"
+            while True:
+                # Comment lines keep proxies from closing idle streams
+                event = await subscription.get(timeout=config['EVENTS_HEARTBEAT_SECONDS'])
+                yield event.text if event else ": keep-alive\n\n"
+        finally:
+            subscription.close()
+
+    response = await make_response(generate(), 200, {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.timeout = None  # stream for as long as the client stays
+    return response
@@ -0,0 +1,92 @@
+from quart import Blueprint, request, jsonify, current_app
+from middleware.async_middleware import async_token_required, async_role_required
+from services import INVENTORY_FIELDS, parse_fields, project
+
+inventory_bp = Blueprint('inventory', __name__, url_prefix='/api/inventory')
+
+@inventory_bp.route('', methods=['GET'])
+@async_token_required
+async def get_inventory():
+    """Get blood inventory"""
+    inventory_cache = current_app.inventory_cache
+    
+    try:
+        fields = parse_fields(request.args.get('fields'), INVENTORY_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Cached inventory is already annotated with stock status and sorted by blood type
+    inventory = await inventory_cache.get_inventory()
+    
+    # The rows are already in this worker's cache, so the fieldset is applied here
+    if fields:
+        inventory = [project(item, fields) for item in inventory]
+    return jsonify({'inventory': inventory}), 200
+
+
+@inventory_bp.route('/<blood_type>', methods=['GET'])
+@async_token_required
+async def get_inventory_by_type(blood_type):
+    """Get inventory for specific blood type"""
+    inventory_cache = current_app.inventory_cache
+    
+    item = await inventory_cache.get_inventory(blood_type)
+    
+    if not item:
+        return jsonify({'error': 'Blood type not found'}), 404
+    
+    return jsonify(item), 200
+
+
+@inventory_bp.route('', methods=['PUT'])
+@async_token_required
+@async_role_required(['manager'])
+async def update_inventory():
+    """Update blood inventory (manager only)"""
+    data = await request.get_json()
+    
+    # Validate required fields
+    if not all(field in data for field in ['blood_type', 'units_available']):
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    # Validate blood type
+    valid_blood_types = ['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']
+    if data['blood_type'] not in valid_blood_types:
+        return jsonify({'error': 'Invalid blood type'}), 400
+    
+    # Validate units
+    try:
+        units = int(data['units_available'])
+        if units < 0:
+            return jsonify({'error': 'Units cannot be negative'}), 400
+    except ValueError:
+        return jsonify({'error': 'Invalid units value'}), 400
+    
+    # Update inventory (invalidates the inventory cache)
+    inventory_cache = current_app.inventory_cache
+    success = await inventory_cache.update_inventory(
+        data['blood_type'],
+        units,
+        request.user['user_id']
+    )
+    
+    if not success:
+        return jsonify({'error': 'Failed to update inventory'}), 500
+    
+    return jsonify({'message': 'Inventory updated successfully'}), 200
+
+
+@inventory_bp.route('/low-stock', methods=['GET'])
+@async_token_required
+@async_role_required(['manager'])
+async def get_low_stock():
+    """Get low stock alerts (manager only)"""
+    inventory_cache = current_app.inventory_cache
+    config = current_app.config
+    
+    threshold = request.args.get('threshold', config['LOW_STOCK_THRESHOLD'], type=int)
+    
+    # Derived from the cached inventory, with severity already set
+    low_stock_items = await inventory_cache.get_low_stock_items(threshold)
+    
+    return jsonify({'low_stock_items': low_stock_items}), 200
@@ -0,0 +1,176 @@
+from quart import Blueprint, request, jsonify, current_app
+from middleware.async_middleware import async_token_required, async_role_required
+from services import REQUEST_FIELDS, parse_fields
+from datetime import datetime
+import uuid
+
+requests_bp = Blueprint('requests', __name__, url_prefix='/api/requests')
+
+@requests_bp.route('', methods=['POST'])
+@async_token_required
+@async_role_required(['hospital', 'manager'])
+async def create_request():
+    """Create a new blood request"""
+    data = await request.get_json()
+    
+    # Validate required fields
+    required_fields = ['blood_type', 'quantity', 'urgency']
+    if not all(field in data for field in required_fields):
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    # Validate blood type
+    valid_blood_types = ['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']
+    if data['blood_type'] not in valid_blood_types:
+        return jsonify({'error': 'Invalid blood type'}), 400
+    
+    # Validate urgency
+    if data['urgency'] not in ['normal', 'high']:
+        return jsonify({'error': 'Urgency must be normal or high'}), 400
+    
+    # Create request
+    db_service = current_app.db_service
+    request_id = str(uuid.uuid4())
+    
+    request_data = {
+        'request_id': request_id,
+        'blood_type': data['blood_type'],
+        'quantity': int(data['quantity']),
+        'urgency': data['urgency'],
+        'status': 'open',
+        'created_by': request.user['user_id'],
+        'timestamp': datetime.utcnow().isoformat(),
+        'hospital_name': data.get('hospital_name', ''),
+        'location': data.get('location', ''),
+        'notes': data.get('notes', '')
+    }
+    
+    success = await db_service.create_request(request_data)
+    
+    if not success:
+        return jsonify({'error': 'Failed to create request'}), 500
+    
+    return jsonify({
+        'message': 'Request created successfully',
+        'request_id': request_id
+    }), 201
+
+
+@requests_bp.route('', methods=['GET'])
+@async_token_required
+async def get_requests():
+    """Get blood requests with optional filters"""
+    db_service = current_app.db_service
+    
+    config = current_app.config
+    
+    # Get query parameters
+    status = request.args.get('status')
+    blood_type = request.args.get('blood_type')
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    
+    # Sparse fieldset: only these columns are read and returned
+    try:
+        fields = parse_fields(request.args.get('fields'), REQUEST_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Pagination is opt-in: without limit/cursor the full list is returned
+    paginated = limit is not None or cursor is not None
+    if paginated:
+        # Parsed here, not with type=int: a bad value must not fall back to the full list
+        try:
+            limit = config['REQUESTS_PAGE_SIZE'] if limit is None else int(limit)
+        except ValueError:
+            return jsonify({'error': 'Limit must be an integer'}), 400
+        if limit < 1:
+            return jsonify({'error': 'Limit must be positive'}), 400
+        limit = min(limit, config['REQUESTS_MAX_PAGE_SIZE'])
+    
+    # Get requests (sorted newest first by the data layer)
+    try:
+        requests, next_cursor = await db_service.get_requests_page(
+            blood_type=blood_type,
+            status=status,
+            limit=limit,
+            cursor=cursor,
+            fields=fields
+        )
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    response = {'requests': requests}
+    if paginated:
+        response['next_cursor'] = next_cursor
+    
+    return jsonify(response), 200
+
+
+@requests_bp.route('/<request_id>', methods=['GET'])
+@async_token_required
+async def get_request(request_id):
+    """Get a specific blood request"""
+    db_service = current_app.db_service
+    blood_request = await db_service.get_request_by_id(request_id)
+    
+    if not blood_request:
+        return jsonify({'error': 'Request not found'}), 404
+    
+    return jsonify(blood_request), 200
+
+
+@requests_bp.route('/<request_id>', methods=['PUT'])
+@async_token_required
+@async_role_required(['hospital', 'manager'])
+async def update_request(request_id):
+    """Update a blood request"""
+    data = await request.get_json()
+    db_service = current_app.db_service
+    
+    # Check if request exists
+    existing_request = await db_service.get_request_by_id(request_id)
+    if not existing_request:
+        return jsonify({'error': 'Request not found'}), 404
+    
+    # Validate status if provided
+    if 'status' in data and data['status'] not in ['open', 'fulfilled', 'cancelled']:
+        return jsonify({'error': 'Invalid status'}), 400
+    
+    # Update request
+    update_data = {}
+    allowed_fields = ['status', 'notes']
+    
+    for field in allowed_fields:
+        if field in data:
+            update_data[field] = data[field]
+    
+    if not update_data:
+        return jsonify({'error': 'No valid fields to update'}), 400
+    
+    success = await db_service.update_request(request_id, update_data)
+    
+    if not success:
+        return jsonify({'error': 'Failed to update request'}), 500
+    
+    return jsonify({'message': 'Request updated successfully'}), 200
+
+
+@requests_bp.route('/<request_id>', methods=['DELETE'])
+@async_token_required
+@async_role_required(['hospital', 'manager'])
+async def delete_request(request_id):
+    """Cancel a blood request (soft delete by updating status)"""
+    db_service = current_app.db_service
+    
+    # Check if request exists
+    existing_request = await db_service.get_request_by_id(request_id)
+    if not existing_request:
+        return jsonify({'error': 'Request not found'}), 404
+    
+    # Update status to cancelled
+    success = await db_service.update_request(request_id, {'status': 'cancelled'})
+    
+    if not success:
+        return jsonify({'error': 'Failed to cancel request'}), 500
+    
+    return jsonify({'message': 'Request cancelled successfully'}), 200
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Inventory Contention Benchmark
+Concurrent issuers decrementing one blood type: read-modify-write through
+get_inventory/update_inventory vs the atomic adjust_inventory delta.
+With --spread each thread issues a different blood type, so writers share
+no inventory row (only per-table bookkeeping such as the table version).
+
+On a 1-CPU local PostgreSQL, 16 threads x 200 --spread atomic deltas ran
+at ~1.6k ops/s with a single table_versions row per table, ~2.0k with the
+per-backend slots of migration 007 and ~2.3k with no version trigger.
+
+Uses RDSService when DATABASE_URL is set, otherwise InMemoryDBService.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+from services import InMemoryDBService
+from services.compatibility import BLOOD_TYPES
+
+
+def create_service():
+    if os.getenv('DATABASE_URL'):
+        from services import RDSService
+        return RDSService(Config())
+    return InMemoryDBService(Config())
+
+
+def read_modify_write(service, blood_type):
+    """What clients had to do before: two round trips, racy"""
+    item = service.get_inventory(blood_type)
+    service.update_inventory(blood_type, item['units_available'] - 1, None)
+
+
+def atomic_delta(service, blood_type):
+    service.adjust_inventory(blood_type, -1, None)
+
+
+def run(service, operation, blood_types, threads, per_thread):
+    """Start each type at threads * per_thread units and issue one unit per operation
+
+    Thread i issues blood_types[i % len(blood_types)]. Returns the elapsed
+    time and the number of lost updates (units left over beyond expected).
+    """
+    stock = threads * per_thread
+    for blood_type in blood_types:
+        service.update_inventory(blood_type, stock, None)
+    barrier = threading.Barrier(threads)
+
+    def worker(blood_type):
+        barrier.wait()
+        for _ in range(per_thread):
+            operation(service, blood_type)
+
+    workers = [threading.Thread(target=worker, args=(blood_types[i % len(blood_types)],)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    remaining = sum(service.get_inventory(blood_type)['units_available'] for blood_type in blood_types)
+    return elapsed, remaining - (stock * len(blood_types) - threads * per_thread)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--per-thread', type=int, default=200)
+    parser.add_argument('--blood-type', default='O-')
+    parser.add_argument('--spread', action='store_true', help='one blood type per thread (cycling through all 8)')
+    args = parser.parse_args()
+
+    service = create_service()
+    total = args.threads * args.per_thread
+    blood_types = list(BLOOD_TYPES[:args.threads]) if args.spread else [args.blood_type]
+
+    print("=" * 60)
+    print("BloodBridge Inventory Contention Benchmark")
+    print(f"{type(service).__name__}: {args.threads} threads x {args.per_thread} decrements of {', '.join(blood_types)}")
+    print("=" * 60)
+
+    for label, operation in [('read-modify-write', read_modify_write), ('atomic delta', atomic_delta)]:
+        elapsed, lost = run(service, operation, blood_types, args.threads, args.per_thread)
+        print(f"{label:>18}: {total / elapsed:9.0f} ops/s  "
+              f"lost updates {lost:6d} of {total}")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Memory Layout Benchmark
+Compares InMemoryDBService memory use with dict records vs compact slotted records
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+from services import InMemoryDBService
+
+BLOOD_TYPES = ['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']
+STATUSES = ['open', 'fulfilled', 'cancelled']
+ROLES = ['donor', 'hospital', 'manager']
+
+
+def fresh(value):
+    """Return a new string object, as json.loads would for each request body"""
+    return value.encode('utf-8').decode('utf-8')
+
+
+def synthetic_request(i, base_time):
+    return {
+        'request_id': str(uuid.uuid4()),
+        'blood_type': fresh(BLOOD_TYPES[i % 8]),
+        'quantity': i % 5 + 1,
+        'urgency': fresh('high' if i % 4 == 0 else 'normal'),
+        'status': fresh(STATUSES[i % 3]),
+        'created_by': str(uuid.uuid4()),
+        'timestamp': (base_time + timedelta(seconds=i)).isoformat(),
+        'hospital_name': f'Hospital {i % 50}',
+        'location': f'City {i % 20}',
+        'notes': ''
+    }
+
+
+def synthetic_user(i):
+    role = fresh(ROLES[i % 3])
+    user = {
+        'user_id': str(uuid.uuid4()),
+        'name': f'User {i}',
+        'email': f'user{i}@example.com',
+        'password_hash': '$2b$12$' + 'x' * 53,
+        'role': role,
+        'phone': '',
+        'created_at': datetime.utcnow().isoformat()
+    }
+    if role == 'donor':
+        user['blood_type'] = fresh(BLOOD_TYPES[i % 8])
+        user['last_donation'] = None
+    return user
+
+
+def measure(compact, num_requests, num_users):
+    """Load synthetic data and return bytes allocated by the service"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    service = InMemoryDBService(Config(), compact=compact)
+    base_time = datetime(2026, 1, 1)
+    for i in range(num_requests):
+        service.create_request(synthetic_request(i, base_time))
+    for i in range(num_users):
+        service.create_user(synthetic_user(i))
+
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del service
+    return after - before
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200000)
+    parser.add_argument('--users', type=int, default=50000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BloodBridge In-Memory Layout Benchmark")
+    print(f"{args.requests} requests, {args.users} users")
+    print("=" * 60)
+
+    records = args.requests + args.users
+    results = {}
+    for label, compact in [('dict', False), ('compact', True)]:
+        used = measure(compact, args.requests, args.users)
+        results[label] = used
+        print(f"{label:>8}: {used / 1024 / 1024:8.1f} MiB  ({used / records:6.0f} bytes/record)")
+
+    saved = 1 - results['compact'] / results['dict']
+    print(f"\nCompact layout uses {saved:.0%} less memory")
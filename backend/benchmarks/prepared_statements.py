@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Prepared Statement Benchmark
+Hot RDSService lookups with the statement cache on (PREPARE once, then
+EXECUTE) vs off (full SQL text parsed and planned on every call).
+
+Requires DATABASE_URL; seeds one user and one request.
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+
+
+def create_service(prepared):
+    from services import RDSService
+    config = Config()
+    config.DB_PREPARED_STATEMENTS = prepared
+    config.DB_POOL_MIN_SIZE = 1
+    return RDSService(config)
+
+
+def seed(service):
+    user_id = service.create_user({
+        'name': 'Benchmark User',
+        'email': f'bench-{uuid.uuid4().hex[:8]}@example.com',
+        'password_hash': 'x',
+        'role': 'hospital'
+    })
+    request_id = service.create_request({
+        'blood_type': 'O-',
+        'quantity': 1,
+        'urgency': 'normal',
+        'created_by': user_id
+    })
+    return user_id, request_id
+
+
+def run(service, operation, iterations):
+    operation()  # warm up (and prepare, when enabled)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    return (time.perf_counter() - start) / iterations
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    if not os.getenv('DATABASE_URL'):
+        print("Error: DATABASE_URL environment variable not set")
+        sys.exit(1)
+
+    services = {'unprepared': create_service(False), 'prepared': create_service(True)}
+    user_id, request_id = seed(services['prepared'])
+
+    operations = {
+        'get_user_by_id': lambda s: s.get_user_by_id(user_id),
+        'get_request_by_id': lambda s: s.get_request_by_id(request_id),
+        'get_inventory': lambda s: s.get_inventory(),
+        'update_user': lambda s: s.update_user(user_id, {'phone': '555-0100'})
+    }
+
+    print("=" * 60)
+    print("BloodBridge Prepared Statement Benchmark")
+    print(f"{args.iterations} calls per operation")
+    print("=" * 60)
+    print(f"{'operation':>18} {'unprepared':>12} {'prepared':>12} {'speedup':>8}")
+
+    for name, operation in operations.items():
+        timings = {
+            label: run(service, lambda: operation(service), args.iterations)
+            for label, service in services.items()
+        }
+        print(f"{name:>18} {timings['unprepared'] * 1e6:10.0f}us {timings['prepared'] * 1e6:10.0f}us "
+              f"{timings['unprepared'] / timings['prepared']:7.2f}x")
+
+    for service in services.values():
+        service.close_all_connections()
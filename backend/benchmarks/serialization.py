@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Response Serialization Benchmark
+GET /api/requests returning 10k rows, end to end through the Flask app:
+Flask's default JSON provider vs the orjson provider (Flask's RFC 822
+dates, or ISO 8601), MessagePack, and gzip/brotli on top.
+
+With DATABASE_URL, rows are seeded into PostgreSQL and the row fetch is
+also timed: RealDictCursor + dict() copies vs tuple cursor + row_dicts().
+Without it, the in-memory backend is used.
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app
+from middleware import FastJSONProvider
+from services.compatibility import BLOOD_TYPES
+
+
+def seed_memory(service, count, created_by):
+    now = datetime.utcnow()
+    for i in range(count):
+        created_at = (now - timedelta(minutes=i)).isoformat()
+        service.create_request({
+            'request_id': str(uuid.uuid4()),
+            'blood_type': BLOOD_TYPES[i % len(BLOOD_TYPES)],
+            'quantity': i % 5 + 1,
+            'urgency': 'high' if i % 3 == 0 else 'normal',
+            'status': 'open',
+            'hospital_name': 'St. Mary General Hospital',
+            'patient_name': f'Patient {i}',
+            'contact_number': '555-0100',
+            'notes': 'Scheduled surgery',
+            'created_by': created_by,
+            'created_at': created_at,
+            'updated_at': created_at
+        })
+
+
+def seed_postgres(service, count, created_by):
+    conn = service.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO blood_requests (blood_type, quantity, urgency, hospital_name, patient_name,
+                                        contact_number, notes, created_by, created_at)
+            SELECT (%s::text[])[1 + g %% 8], 1 + g %% 5, CASE WHEN g %% 3 = 0 THEN 'high' ELSE 'normal' END,
+                   'St. Mary General Hospital', 'Patient ' || g, '555-0100', 'Scheduled surgery',
+                   %s, CURRENT_TIMESTAMP - g * INTERVAL '1 minute'
+            FROM generate_series(1, %s) g
+        """, (list(BLOOD_TYPES), created_by, count))
+        conn.commit()
+        cursor.close()
+    finally:
+        service.return_connection(conn)
+
+
+def time_fetch(service, iterations):
+    """Row fetch only: the old RealDictCursor path vs tuple rows"""
+    from psycopg2 import extras
+    from services.rds_service import row_dicts
+
+    query = """
+        SELECT r.*, u.name as created_by_name
+        FROM blood_requests r
+        LEFT JOIN users u ON r.created_by = u.user_id
+        ORDER BY r.created_at DESC, r.request_id DESC
+    """
+
+    def real_dict():
+        cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+        cursor.execute(query)
+        rows = [dict(row) for row in cursor.fetchall()]
+        cursor.close()
+        return rows
+
+    def tuples():
+        cursor = conn.cursor()
+        cursor.execute(query)
+        rows = row_dicts(cursor, cursor.fetchall())
+        cursor.close()
+        return rows
+
+    conn = service.get_connection()
+    try:
+        return {'RealDictCursor + dict()': run(real_dict, iterations), 'tuple cursor + row_dicts': run(tuples, iterations)}
+    finally:
+        service.return_connection(conn)
+
+
+def run(operation, iterations):
+    operation()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    return (time.perf_counter() - start) / iterations
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app('production')
+    service = app.db_service
+    client = app.test_client()
+    client.post('/api/auth/register', json={
+        'name': 'Benchmark Manager', 'email': 'bench-manager@example.com', 'password': 'benchmark', 'role': 'manager'
+    })
+    login = client.post('/api/auth/login', json={'email': 'bench-manager@example.com', 'password': 'benchmark'})
+    token = login.get_json()['token']
+    created_by = app.auth_service.verify_token(token)['user_id']
+
+    postgres = bool(os.getenv('DATABASE_URL'))
+    (seed_postgres if postgres else seed_memory)(service, args.rows, created_by)
+    total = len(service.get_requests_page()[0])
+
+    print("=" * 72)
+    print("BloodBridge Response Serialization Benchmark")
+    print(f"GET /api/requests, {total} rows ({'PostgreSQL' if postgres else 'in-memory'}), "
+          f"{args.iterations} iterations")
+    print("=" * 72)
+
+    if postgres:
+        fetch = time_fetch(service, args.iterations)
+        baseline = fetch['RealDictCursor + dict()']
+        for label, seconds in fetch.items():
+            print(f"{label:>28} {seconds * 1000:9.1f}ms {baseline / seconds:6.2f}x")
+        print()
+
+    variants = [
+        ('Flask default JSON', DefaultJSONProvider, 'http', {}),
+        ('orjson', FastJSONProvider, 'http', {}),
+        ('orjson, ISO dates', FastJSONProvider, 'iso', {}),
+        ('MessagePack', FastJSONProvider, 'http', {'Accept': 'application/msgpack'}),
+        ('orjson + gzip', FastJSONProvider, 'http', {'Accept-Encoding': 'gzip'}),
+        ('orjson + brotli', FastJSONProvider, 'http', {'Accept-Encoding': 'br'})
+    ]
+    print(f"{'encoding':>28} {'time':>11} {'speedup':>7} {'bytes':>10}")
+    baseline = None
+    for label, provider, datetime_format, headers in variants:
+        app.config['JSON_DATETIME_FORMAT'] = datetime_format
+        app.json = provider(app)
+        headers = {'Authorization': f'Bearer {token}', **headers}
+        size = len(client.get('/api/requests', headers=headers).data)
+        seconds = run(lambda: client.get('/api/requests', headers=headers), args.iterations)
+        baseline = baseline or seconds
+        print(f"{label:>28} {seconds * 1000:9.1f}ms {baseline / seconds:6.2f}x {size:10d}")
+
+    if postgres:
+        service.close_all_connections()
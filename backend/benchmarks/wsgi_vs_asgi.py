@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+WSGI vs ASGI Benchmark
+Drives the same endpoint on the sync (gunicorn + app.py) and async (uvicorn + asgi.py)
+servers at a fixed concurrency and compares throughput and latency.
+
+Point DATABASE_URL at Postgres for a meaningful comparison; the async mode
+only pays off when requests spend their time waiting on the database.
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import urlparse
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from config import Config
+from services import AuthService
+
+
+def start_server(mode, port, workers):
+    """Start the WSGI or ASGI server as a subprocess"""
+    if mode == 'wsgi':
+        cmd = [
+            sys.executable, '-m', 'gunicorn', '-w', str(workers), '-k', 'sync',
+            '-b', f'127.0.0.1:{port}', 'app:create_app()'
+        ]
+    else:
+        cmd = [
+            sys.executable, '-m', 'uvicorn', 'asgi:app', '--workers', str(workers),
+            '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'
+        ]
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers))
+    process = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Wait for the server to answer
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health')
+            conn.getresponse().read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{mode} server did not start on port {port}")
+
+
+def run_load(base_url, path, token, concurrency, duration):
+    """Hit base_url + path from concurrency threads; return latencies and errors"""
+    url = urlparse(base_url)
+    headers = {'Authorization': f'Bearer {token}'}
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker():
+        conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+        local = []
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    raise RuntimeError(response.status)
+                local.append(time.perf_counter() - start)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def report(label, latencies, errors, duration):
+    if not latencies:
+        print(f"{label:>5}: no successful requests ({errors} errors)")
+        return
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(f"{label:>5}: {len(latencies) / duration:8.1f} req/s  "
+          f"p50 {p(0.50):7.1f} ms  p99 {p(0.99):7.1f} ms  "
+          f"mean {statistics.mean(latencies) * 1000:7.1f} ms  errors {errors}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default='/api/requests?limit=50')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--wsgi-url', help='use an already running WSGI server')
+    parser.add_argument('--asgi-url', help='use an already running ASGI server')
+    args = parser.parse_args()
+
+    # JWTs are stateless, so a token signed with the shared secret works on every worker
+    token = AuthService(Config()).generate_token(str(uuid.uuid4()), 'bench@example.com', 'manager')
+
+    print("=" * 60)
+    print("BloodBridge WSGI vs ASGI Benchmark")
+    print(f"GET {args.path}  concurrency={args.concurrency}  duration={args.duration}s  "
+          f"workers={args.workers}  database={'postgres' if os.getenv('DATABASE_URL') else 'in-memory'}")
+    print("=" * 60)
+
+    for mode, url, port in [('wsgi', args.wsgi_url, 5801), ('asgi', args.asgi_url, 5802)]:
+        process = None
+        if not url:
+            process = start_server(mode, port, args.workers)
+            url = f'http://127.0.0.1:{port}'
+        try:
+            latencies, errors = run_load(url, args.path, token, args.concurrency, args.duration)
+            report(mode, latencies, errors, args.duration)
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
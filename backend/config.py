@@ -10,19 +10,89 @@ class Config:
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET', 'jwt-secret-key-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    JWT_CACHE_SIZE = int(os.getenv('JWT_CACHE_SIZE', 10000))  # verified tokens kept per worker, 0 disables
+    
+    # Password hashing
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    # Hashing processes and jobs running or queued per process; under gunicorn both are for
+    # the node's hashing service (deploy/gunicorn_config.py)
+    BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', 2))  # 0 = inline
+    BCRYPT_MAX_QUEUE = int(os.getenv('BCRYPT_MAX_QUEUE', 8))
+    BCRYPT_TIMEOUT = float(os.getenv('BCRYPT_TIMEOUT', 10))  # seconds
     
     # Database (PostgreSQL RDS)
     DATABASE_URL = os.getenv('DATABASE_URL', 'postgresql://localhost/bloodbank')
     
+    # Database connection pool (per worker process)
+    DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 2))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 20))
+    DB_POOL_TOTAL_CONNECTIONS = int(os.getenv('DB_POOL_TOTAL_CONNECTIONS', 0))  # budget shared by all workers, 0 = no limit
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 5))  # seconds to wait for a free connection
+    DB_POOL_MAX_LIFETIME = int(os.getenv('DB_POOL_MAX_LIFETIME', 1800))  # seconds before a connection is recycled
+    DB_POOL_MAX_WAITERS = int(os.getenv('DB_POOL_MAX_WAITERS', 100))
+    
+    # Server-side prepared statements (disable behind PgBouncer transaction pooling)
+    DB_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', 'true').lower() == 'true'
+    
+    # Slow query log (ms, 0 = off); EXPLAIN (ANALYZE, BUFFERS) re-runs each slow SELECT, so only while diagnosing
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
+    SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', 'false').lower() == 'true'
+    
+    # Gunicorn worker count (exported by deploy/gunicorn_config.py)
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+    
+    # In-memory database (local dev / load tests): store records in compact slotted form
+    MEMORY_DB_COMPACT = os.getenv('MEMORY_DB_COMPACT', 'false').lower() == 'true'
+    
     # CORS
     CORS_ORIGINS = os.getenv('CORS_ORIGIN', 'http://localhost:5173').split(',')
     
+    # Auth rate limiting (token buckets, '<requests>/<seconds>')
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_STORAGE_URL = os.getenv('RATE_LIMIT_STORAGE_URL', '')  # e.g. redis://localhost:6379/0, empty = per worker
+    # Use nginx's X-Real-IP, only on requests from RATE_LIMIT_TRUSTED_PROXIES; enable only behind nginx
+    RATE_LIMIT_TRUST_PROXY = os.getenv('RATE_LIMIT_TRUST_PROXY', 'false').lower() == 'true'
+    RATE_LIMIT_TRUSTED_PROXIES = set(os.getenv('RATE_LIMIT_TRUSTED_PROXIES', '127.0.0.1,::1').split(','))
+    RATE_LIMITS = {
+        'login_ip': os.getenv('LOGIN_RATE_LIMIT_PER_IP', '20/60'),
+        'login_email': os.getenv('LOGIN_RATE_LIMIT_PER_EMAIL', '5/60'),
+        'register_ip': os.getenv('REGISTER_RATE_LIMIT_PER_IP', '10/3600')
+    }
+    
+    # Request listing pagination
+    REQUESTS_PAGE_SIZE = int(os.getenv('REQUESTS_PAGE_SIZE', 50))
+    REQUESTS_MAX_PAGE_SIZE = int(os.getenv('REQUESTS_MAX_PAGE_SIZE', 500))
+    
+    # Rows fetched per round trip when streaming exports
+    EXPORT_FETCH_SIZE = int(os.getenv('EXPORT_FETCH_SIZE', 1000))
+    
+    # Response encoding: datetimes as 'http' (RFC 822, Flask's default) or 'iso' (ISO 8601, encoded natively by orjson)
+    JSON_DATETIME_FORMAT = os.getenv('JSON_DATETIME_FORMAT', 'http')
+    # gzip/brotli responses of at least this many bytes, 0 = off (e.g. when nginx compresses)
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    
+    # Prometheus /metrics (set PROMETHEUS_MULTIPROC_DIR to aggregate gunicorn workers)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    
+    # DynamoDB full-table scans: parallel segments (one thread each), 1 = sequential
+    DYNAMODB_SCAN_SEGMENTS = int(os.getenv('DYNAMODB_SCAN_SEGMENTS', 1))
+    
+    # /api/events change feed (ASGI mode)
+    EVENTS_HEARTBEAT_SECONDS = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', 15))
+    EVENTS_RETRY_MS = int(os.getenv('EVENTS_RETRY_MS', 3000))  # client reconnect delay
+    EVENTS_QUEUE_SIZE = int(os.getenv('EVENTS_QUEUE_SIZE', 100))  # pending events per subscriber before a resync
+    EVENTS_HISTORY_SIZE = int(os.getenv('EVENTS_HISTORY_SIZE', 1000))  # kept for Last-Event-ID replay
+    
     # Blood donation eligibility (days)
     DONATION_INTERVAL_DAYS = 90  # 3 months between donations
     
     # Inventory thresholds
     LOW_STOCK_THRESHOLD = 5
     CRITICAL_STOCK_THRESHOLD = 3
+    
+    # Inventory read cache (seconds); writes through this worker invalidate immediately
+    INVENTORY_CACHE_TTL = float(os.getenv('INVENTORY_CACHE_TTL', 5))
+    INVENTORY_BULK_MAX_ITEMS = 100
 
 
 class DevelopmentConfig(Config):
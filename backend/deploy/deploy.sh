@@ -24,6 +24,7 @@ source $VENV_DIR/bin/activate
 # Install/update dependencies
 echo "📦 Installing dependencies..."
 pip install -r requirements.txt
+pip install -r requirements-async.txt  # /api/events service
 
 # Run database migrations
 echo "🗄️  Running database migrations..."
@@ -34,14 +35,14 @@ python scripts/migrate_db.py
 
 # Restart the application
 echo "🔄 Restarting application..."
-sudo systemctl restart bloodbank
+sudo systemctl restart bloodbank bloodbank_events
 
 # Wait a moment for the service to start
 sleep 3
 
 # Check service status
 echo "🔍 Checking service status..."
-sudo systemctl status bloodbank --no-pager
+sudo systemctl status bloodbank bloodbank_events --no-pager
 
 # Test health endpoint
 echo "🏥 Testing health endpoint..."
@@ -1,18 +1,75 @@
 # Gunicorn Configuration for BloodBridge Backend
 
 import multiprocessing
+import os
+import shutil
 
 # Server socket
 bind = "127.0.0.1:5000"
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = 'sync'
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Serves app.py (WSGI), the whole API except /api/events, which asgi.py
+# serves as its own service (deploy/bloodbank_events.service, port 5001)
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
 worker_connections = 1000
 timeout = 30
 keepalive = 2
 
+# Let the app size its per-worker DB pool from the worker count
+os.environ['WEB_CONCURRENCY'] = str(workers)
+
+# bcrypt runs in a hashing service the master starts, one per node: workers
+# send it their jobs over this socket (BCRYPT_* settings in config.py)
+bcrypt_socket = os.getenv('BCRYPT_SOCKET', '/var/run/bloodbank/bcrypt.sock')
+
+# Workers write Prometheus samples here so /metrics can sum them all
+# (prometheus_client reads this when the app is imported in each worker)
+prometheus_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/var/run/bloodbank/metrics')
+try:
+    # Imported here, not in child_exit: that runs from the SIGCHLD handler
+    from prometheus_client import multiprocess as prometheus_multiprocess
+except ImportError:
+    prometheus_multiprocess = None
+
+
+def on_starting(server):
+    # Samples from a previous run would otherwise be added to the new one
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+
+    # Started once from the master, outside the workers, so a worker killed
+    # on timeout can't take hashing capacity with it
+    from config import Config
+    from services.password_hasher import HashingService
+    server.hashing_service = None
+    if Config.BCRYPT_WORKERS > 0:
+        server.hashing_service = HashingService(
+            bcrypt_socket,
+            workers=Config.BCRYPT_WORKERS,
+            max_queue=Config.BCRYPT_MAX_QUEUE,
+            timeout=Config.BCRYPT_TIMEOUT
+        )
+        server.hashing_service.start()
+
+
+def post_fork(server, worker):
+    if server.hashing_service:
+        from services.password_hasher import use_hashing_service
+        use_hashing_service(server.hashing_service.address)
+
+
+def on_exit(server):
+    if server.hashing_service:
+        server.hashing_service.stop()
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (in-flight requests)
+    if prometheus_multiprocess:
+        prometheus_multiprocess.mark_process_dead(worker.pid)
+
 # Logging
 accesslog = '/var/log/bloodbank/access.log'
 errorlog = '/var/log/bloodbank/error.log'
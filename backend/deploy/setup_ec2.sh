@@ -60,15 +60,17 @@ echo "   cd /home/ubuntu/bloodbank/backend"
 echo "   python3.11 -m venv venv"
 echo "   source venv/bin/activate"
 echo "   pip install -r requirements.txt"
+echo "   pip install -r requirements-async.txt"
 echo ""
 echo "4. Run database migrations:"
 echo "   DATABASE_URL='your-rds-url' python scripts/migrate_db.py"
 echo ""
 echo "5. Setup systemd service:"
 echo "   sudo cp deploy/bloodbank.service /etc/systemd/system/"
+echo "   sudo cp deploy/bloodbank_events.service /etc/systemd/system/bloodbank_events.service"
 echo "   sudo systemctl daemon-reload"
-echo "   sudo systemctl enable bloodbank"
-echo "   sudo systemctl start bloodbank"
+echo "   sudo systemctl enable bloodbank bloodbank_events"
+echo "   sudo systemctl start bloodbank bloodbank_events"
 echo ""
 echo "6. Setup Nginx:"
 echo "   sudo cp deploy/nginx.conf /etc/nginx/sites-available/bloodbank"
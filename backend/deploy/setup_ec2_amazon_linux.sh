@@ -53,6 +53,7 @@ echo "   python3.11 -m venv venv"
 echo "   source venv/bin/activate"
 echo "   pip install --upgrade pip"
 echo "   pip install -r requirements.txt"
+echo "   pip install -r requirements-async.txt"
 echo ""
 echo "3. Configure environment:"
 echo "   cp .env.example .env"
@@ -64,9 +65,10 @@ echo "   python scripts/migrate_db.py"
 echo ""
 echo "5. Setup systemd service:"
 echo "   sudo cp deploy/bloodbank.service /etc/systemd/system/"
+echo "   sudo cp deploy/bloodbank_events_amazon_linux.service /etc/systemd/system/bloodbank_events.service"
 echo "   sudo systemctl daemon-reload"
-echo "   sudo systemctl enable bloodbank"
-echo "   sudo systemctl start bloodbank"
+echo "   sudo systemctl enable bloodbank bloodbank_events"
+echo "   sudo systemctl start bloodbank bloodbank_events"
 echo ""
 echo "6. Setup Nginx:"
 echo "   sudo cp deploy/nginx.conf /etc/nginx/conf.d/bloodbank.conf"
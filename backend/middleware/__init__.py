@@ -1,3 +1,11 @@
 from .auth_middleware import token_required, role_required
+from .rate_limit import rate_limit, check_rate_limit, client_ip
+from .encoding import FastJSONProvider, compress_response, preferred_mimetype
+from .metrics import init_metrics
+from .conditional import version_etag, set_validators, check_not_modified, conditional_body
 
-__all__ = ['token_required', 'role_required']
+__all__ = [
+    'token_required', 'role_required', 'rate_limit', 'check_rate_limit', 'client_ip',
+    'FastJSONProvider', 'compress_response', 'preferred_mimetype',
+    'init_metrics', 'version_etag', 'set_validators', 'check_not_modified', 'conditional_body'
+]
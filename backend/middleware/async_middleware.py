@@ -0,0 +1,85 @@
+"""
+Async counterparts of the auth and rate limit decorators for the ASGI app (Quart)
+"""
+from functools import wraps
+from quart import request, jsonify, current_app
+from .rate_limit import trusted_client_ip
+import math
+
+
+def async_token_required(f):
+    """Decorator to require valid JWT token"""
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        token = None
+
+        # Get token from header
+        if 'Authorization' in request.headers:
+            auth_header = request.headers['Authorization']
+            try:
+                token = auth_header.split(' ')[1]  # Bearer <token>
+            except IndexError:
+                return jsonify({'error': 'Invalid token format'}), 401
+
+        if not token:
+            return jsonify({'error': 'Token is missing'}), 401
+
+        # Verify token (cached after first use, so cheap enough to run inline)
+        auth_service = current_app.auth_service
+        payload = auth_service.verify_token(token)
+
+        if not payload:
+            return jsonify({'error': 'Token is invalid or expired'}), 401
+
+        # Add user info to request context
+        request.user = payload
+        return await f(*args, **kwargs)
+
+    return decorated
+
+
+def async_role_required(allowed_roles):
+    """Decorator to require specific role(s)"""
+    def decorator(f):
+        @wraps(f)
+        async def decorated(*args, **kwargs):
+            if not hasattr(request, 'user'):
+                return jsonify({'error': 'Authentication required'}), 401
+
+            user_role = request.user.get('role')
+
+            if user_role not in allowed_roles:
+                return jsonify({'error': 'Insufficient permissions'}), 403
+
+            return await f(*args, **kwargs)
+        return decorated
+    return decorator
+
+
+def async_client_ip():
+    """Get the client IP, trusting nginx's X-Real-IP when configured to"""
+    return trusted_client_ip(current_app.config, request.remote_addr, request.headers)
+
+
+def async_check_rate_limit(rule, identity):
+    """Return a 429 response if identity has used up rule, otherwise None"""
+    retry_after = current_app.rate_limiter.hit(rule, identity)
+    if not retry_after:
+        return None
+
+    return jsonify({'error': 'Too many requests, please try again later'}), 429, {
+        'Retry-After': str(max(1, math.ceil(retry_after)))
+    }
+
+
+def async_rate_limit(rule):
+    """Decorator to rate limit an endpoint per client IP"""
+    def decorator(f):
+        @wraps(f)
+        async def decorated(*args, **kwargs):
+            limited = async_check_rate_limit(rule, async_client_ip())
+            if limited:
+                return limited
+            return await f(*args, **kwargs)
+        return decorated
+    return decorator
@@ -0,0 +1,75 @@
+"""
+Conditional GET: strong ETags and Last-Modified built from data versions, so
+an unchanged resource is answered with 304 before it is fetched or serialised
+"""
+from datetime import datetime, timedelta, timezone
+from hashlib import sha1
+from flask import request, current_app
+from .encoding import preferred_mimetype, JSON_MIMETYPE
+
+
+def version_etag(*parts):
+    """Strong ETag for the representation identified by parts (resource, version, variant)"""
+    return sha1('\x1f'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _utc(value):
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _http_date(last_modified):
+    """Last-Modified to send: rounded up to the whole second, or None while that second runs
+
+    HTTP dates have no fraction. A truncated date would let If-Modified-Since
+    match a second write later in the same second; a rounded-up one is only
+    safe once that second is over, as every later write is then newer.
+    Until then clients revalidate with the ETag alone.
+    """
+    last_modified = _utc(last_modified)
+    rounded = last_modified.replace(microsecond=0)
+    if rounded < last_modified:
+        rounded += timedelta(seconds=1)
+    return rounded if rounded <= datetime.now(timezone.utc) else None
+
+
+def _representation_etag(etag):
+    # JSON and MessagePack bodies of the same version need distinct tags
+    mimetype = preferred_mimetype()
+    return etag if mimetype == JSON_MIMETYPE else f"{etag}-{mimetype.rsplit('/', 1)[1]}"
+
+
+def set_validators(response, etag, last_modified=None):
+    """Attach ETag/Last-Modified and have clients revalidate on every use"""
+    response.set_etag(_representation_etag(etag))
+    http_date = _http_date(last_modified) if last_modified else None
+    if http_date:
+        response.last_modified = http_date
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def check_not_modified(etag, last_modified=None):
+    """Return a 304 response if the client's copy is current, otherwise None
+
+    If-None-Match wins when present; If-Modified-Since is only consulted
+    without it, against the exact modification time.
+    """
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(_representation_etag(etag))
+    elif last_modified and request.if_modified_since:
+        fresh = _utc(last_modified) <= request.if_modified_since
+    else:
+        fresh = False
+
+    if not fresh:
+        return None
+    return set_validators(current_app.response_class(status=304), etag, last_modified)
+
+
+def conditional_body(response):
+    """Fallback without a data version: ETag the serialised body"""
+    response.add_etag()
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
@@ -0,0 +1,140 @@
+"""
+Prometheus metrics: per-endpoint latency and in-flight requests, db_service
+and auth_service call timings and response encoding time, served at /metrics
+
+Under gunicorn every worker has its own registry, so deploy/gunicorn_config.py
+sets PROMETHEUS_MULTIPROC_DIR: samples are then written to memory-mapped
+files there and /metrics sums all workers, whichever one answers the scrape.
+"""
+import functools
+import inspect
+import logging
+import os
+import time
+from flask import request, g
+
+logger = logging.getLogger(__name__)
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+# Seconds; API requests and auth (bcrypt) calls vs single DB calls/encodes
+REQUEST_BUCKETS = (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1, 2.5, 5, 10)
+CALL_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5)
+
+if prometheus_client is not None:
+    # Metrics are process-wide; create_app may run more than once per process
+    REQUEST_LABELS = ['method', 'blueprint', 'endpoint']
+    REQUEST_DURATION = prometheus_client.Histogram(
+        'bloodbridge_http_request_duration_seconds', 'Request latency by endpoint',
+        REQUEST_LABELS, buckets=REQUEST_BUCKETS
+    )
+    REQUESTS = prometheus_client.Counter(
+        'bloodbridge_http_requests', 'Requests by endpoint and status', REQUEST_LABELS + ['status']
+    )
+    IN_FLIGHT = prometheus_client.Gauge(
+        'bloodbridge_http_requests_in_flight', 'Requests being served by endpoint',
+        REQUEST_LABELS, multiprocess_mode='livesum'
+    )
+    DB_DURATION = prometheus_client.Histogram(
+        'bloodbridge_db_call_duration_seconds', 'db_service call latency by method',
+        ['method'], buckets=CALL_BUCKETS
+    )
+    AUTH_DURATION = prometheus_client.Histogram(
+        'bloodbridge_auth_call_duration_seconds', 'auth_service call latency by method (token checks, bcrypt)',
+        ['method'], buckets=REQUEST_BUCKETS
+    )
+    ENCODE_DURATION = prometheus_client.Histogram(
+        'bloodbridge_response_encode_duration_seconds', 'Time serialising jsonify/dict response bodies',
+        buckets=CALL_BUCKETS
+    )
+
+
+def timed(func, metric):
+    """func, observing each call's duration into metric"""
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metric.observe(time.perf_counter() - start)
+    return call
+
+
+class InstrumentedService:
+    """Times every public method of a service into a histogram labelled by method
+
+    Everything else is read through, so it stands in for the service. A
+    generator method (iter_requests) is only timed until it is created.
+    """
+
+    def __init__(self, service, histogram):
+        self.service = service
+        self.histogram = histogram
+
+    def __getattr__(self, name):
+        attr = getattr(self.service, name)
+        if name.startswith('_') or not inspect.ismethod(attr):
+            return attr
+
+        call = timed(attr, self.histogram.labels(name))
+        self.__dict__[name] = call  # later lookups skip __getattr__
+        return call
+
+
+def _request_labels():
+    # Unrouted requests (404s) share one label so scanners can't add series
+    return request.method, request.blueprint or '', request.endpoint or 'unmatched'
+
+
+def metrics():
+    """Prometheus text exposition, summed over all workers in multiprocess mode"""
+    registry = prometheus_client.REGISTRY
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return prometheus_client.generate_latest(registry), 200, {'Content-Type': prometheus_client.CONTENT_TYPE_LATEST}
+
+
+def init_metrics(app):
+    """Instrument app and serve /metrics
+
+    Wraps app.db_service and app.auth_service, so call it before anything
+    else keeps a reference to them.
+    """
+    if prometheus_client is None:
+        logger.warning("prometheus_client not installed — /metrics disabled")
+        return
+
+    app.db_service = InstrumentedService(app.db_service, DB_DURATION)
+    app.auth_service = InstrumentedService(app.auth_service, AUTH_DURATION)
+    app.json.response = timed(app.json.response, ENCODE_DURATION)
+
+    @app.before_request
+    def start_request_timer():
+        labels = _request_labels()
+        g.metrics_start = (labels, time.perf_counter())
+        IN_FLIGHT.labels(*labels).inc()
+
+    @app.after_request
+    def record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    # Teardown also runs after unhandled errors (no after_request, so 500)
+    # and only once a streamed body has been sent
+    @app.teardown_request
+    def observe_request(exc):
+        started = g.pop('metrics_start', None)
+        if started is None:
+            return
+        labels, start = started
+        REQUEST_DURATION.labels(*labels).observe(time.perf_counter() - start)
+        REQUESTS.labels(*labels, str(g.pop('metrics_status', 500))).inc()
+        IN_FLIGHT.labels(*labels).dec()
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
@@ -0,0 +1,43 @@
+from functools import wraps
+from flask import request, jsonify, current_app
+import math
+
+
+def trusted_client_ip(config, remote_addr, headers):
+    """The client IP: nginx's X-Real-IP if configured to trust it and the
+    request came from a trusted proxy, otherwise the peer address"""
+    if config.get('RATE_LIMIT_TRUST_PROXY') and remote_addr in config.get('RATE_LIMIT_TRUSTED_PROXIES', ()):
+        real_ip = headers.get('X-Real-IP')
+        if real_ip:
+            return real_ip
+    return remote_addr or 'unknown'
+
+
+def client_ip():
+    """Get the client IP, trusting nginx's X-Real-IP when configured to"""
+    return trusted_client_ip(current_app.config, request.remote_addr, request.headers)
+
+
+def check_rate_limit(rule, identity):
+    """Return a 429 response if identity has used up rule, otherwise None"""
+    retry_after = current_app.rate_limiter.hit(rule, identity)
+    if not retry_after:
+        return None
+
+    response = jsonify({'error': 'Too many requests, please try again later'})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def rate_limit(rule):
+    """Decorator to rate limit an endpoint per client IP"""
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            limited = check_rate_limit(rule, client_ip())
+            if limited:
+                return limited
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
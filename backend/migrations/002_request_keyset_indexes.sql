@@ -0,0 +1,8 @@
+-- BloodBridge Database Schema for PostgreSQL
+-- Migration: 002_request_keyset_indexes.sql
+
+-- Composite indexes backing keyset pagination of GET /api/requests
+-- (ORDER BY created_at DESC, request_id DESC with optional filters)
+CREATE INDEX idx_requests_created_at_id ON blood_requests(created_at DESC, request_id DESC);
+CREATE INDEX idx_requests_status_created_at_id ON blood_requests(status, created_at DESC, request_id DESC);
+CREATE INDEX idx_requests_blood_type_created_at_id ON blood_requests(blood_type, created_at DESC, request_id DESC);
@@ -0,0 +1,7 @@
+-- BloodBridge Database Schema for PostgreSQL
+-- Migration: 003_open_request_matching_index.sql
+
+-- Partial index backing donor matching (open requests for a set of
+-- compatible blood types, newest first); stays small as requests close
+CREATE INDEX idx_requests_open_blood_type_created_at ON blood_requests(blood_type, created_at DESC)
+    WHERE status = 'open';
@@ -0,0 +1,16 @@
+-- BloodBridge Database Schema for PostgreSQL
+-- Migration: 004_donor_eligibility.sql
+
+-- Precomputed eligibility date, maintained by the application on every write
+-- of last_donation (last_donation + DONATION_INTERVAL_DAYS). Donors who never
+-- donated keep the 1970-01-01 sentinel so they sort first and stay indexable.
+ALTER TABLE users ADD COLUMN next_eligible_at TIMESTAMP NOT NULL DEFAULT '1970-01-01';
+
+UPDATE users
+SET next_eligible_at = last_donation + INTERVAL '90 days'
+WHERE last_donation IS NOT NULL;
+
+-- Eligible-donor search: one range scan per compatible blood type,
+-- ordered by (next_eligible_at, user_id) for keyset pagination
+CREATE INDEX idx_users_donor_eligibility ON users(blood_type, next_eligible_at, user_id)
+    WHERE role = 'donor';
@@ -0,0 +1,44 @@
+-- BloodBridge Database Schema for PostgreSQL
+-- Migration: 005_change_notifications.sql
+
+-- Publish inventory and request changes on the bloodbridge_events channel
+-- for the /api/events feed. Notifications are sent on commit, so every
+-- writer (either app mode, scripts, manual SQL) is covered. Payloads carry
+-- a fixed set of small fields to stay well under NOTIFY's 8000 byte limit.
+CREATE OR REPLACE FUNCTION notify_bloodbridge_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'inventory' THEN
+        IF TG_OP = 'UPDATE' AND NEW.units_available = OLD.units_available THEN
+            RETURN NULL;
+        END IF;
+        PERFORM pg_notify('bloodbridge_events', json_build_object(
+            'type', 'inventory.updated',
+            'data', json_build_object(
+                'blood_type', NEW.blood_type,
+                'units_available', NEW.units_available,
+                'last_updated', NEW.last_updated
+            )
+        )::text);
+    ELSE
+        PERFORM pg_notify('bloodbridge_events', json_build_object(
+            'type', CASE TG_OP WHEN 'INSERT' THEN 'request.created' ELSE 'request.updated' END,
+            'data', json_build_object(
+                'request_id', NEW.request_id,
+                'blood_type', NEW.blood_type,
+                'quantity', NEW.quantity,
+                'urgency', NEW.urgency,
+                'status', NEW.status,
+                'hospital_name', NEW.hospital_name
+            )
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER notify_inventory_change AFTER INSERT OR UPDATE ON inventory
+    FOR EACH ROW EXECUTE FUNCTION notify_bloodbridge_change();
+
+CREATE TRIGGER notify_request_change AFTER INSERT OR UPDATE ON blood_requests
+    FOR EACH ROW EXECUTE FUNCTION notify_bloodbridge_change();
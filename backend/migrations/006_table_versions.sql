@@ -0,0 +1,31 @@
+-- BloodBridge Database Schema for PostgreSQL
+-- Migration: 006_table_versions.sql
+
+-- Change counter per table, bumped once per writing statement. Conditional
+-- GETs compare ETags against this single-row lookup instead of re-reading
+-- and re-serialising the listing.
+CREATE TABLE table_versions (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO table_versions (table_name) VALUES
+    ('blood_requests'),
+    ('inventory');
+
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE table_versions
+    SET version = version + 1, updated_at = clock_timestamp()
+    WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER bump_requests_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON blood_requests
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE TRIGGER bump_inventory_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON inventory
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
@@ -0,0 +1,30 @@
+-- BloodBridge Database Schema for PostgreSQL
+-- Migration: 007_table_version_slots.sql
+
+-- Spread each table's change counter over 64 slot rows, chosen by backend
+-- pid. With one counter row per table, every writing transaction held that
+-- row's lock until commit, so concurrent writers queued behind each other
+-- even when they touched different inventory rows or inserted unrelated
+-- requests. A table's version is now the sum of its slots: each committed
+-- write still raises it, while writers on different connections update
+-- different rows.
+ALTER TABLE table_versions ADD COLUMN slot SMALLINT NOT NULL DEFAULT 0;
+ALTER TABLE table_versions DROP CONSTRAINT table_versions_pkey;
+ALTER TABLE table_versions ADD PRIMARY KEY (table_name, slot);
+
+-- New slots start at 0 and keep the table's timestamp, so existing ETags
+-- and Last-Modified values stay valid
+INSERT INTO table_versions (table_name, slot, version, updated_at)
+SELECT t.table_name, s.slot, 0, t.updated_at
+FROM table_versions t
+CROSS JOIN generate_series(1, 63) AS s(slot);
+
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE table_versions
+    SET version = version + 1, updated_at = clock_timestamp()
+    WHERE table_name = TG_TABLE_NAME AND slot = pg_backend_pid() % 64;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
@@ -2,5 +2,7 @@ from .auth import auth_bp
 from .requests import requests_bp
 from .inventory import inventory_bp
 from .donor import donor_bp
+from .debug import debug_bp
+from .events import events_bp
 
-__all__ = ['auth_bp', 'requests_bp', 'inventory_bp', 'donor_bp']
+__all__ = ['auth_bp', 'requests_bp', 'inventory_bp', 'donor_bp', 'debug_bp', 'events_bp']
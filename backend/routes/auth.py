@@ -1,10 +1,13 @@
 from flask import Blueprint, request, jsonify, current_app
+from services import HashingUnavailable
+from middleware import rate_limit, check_rate_limit
 from datetime import datetime
 import uuid
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limit('register_ip')
 def register():
     """Register a new user"""
     data = request.get_json()
@@ -25,14 +28,17 @@ def register():
     
     # Check if user already exists
     db_service = current_app.db_service
-    existing_user = db_service.get_user_by_email(data['email'])
+    existing_user = db_service.get_user_by_email(data['email'], fields=['user_id'])
     
     if existing_user:
         return jsonify({'error': 'User with this email already exists'}), 409
     
     # Hash password
     auth_service = current_app.auth_service
-    password_hash = auth_service.hash_password(data['password'])
+    try:
+        password_hash = auth_service.hash_password(data['password'])
+    except HashingUnavailable:
+        return jsonify({'error': 'Server is busy, please try again'}), 503
     
     # Create user
     user_id = str(uuid.uuid4())
@@ -72,6 +78,7 @@ def register():
 
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit('login_ip')
 def login():
     """Login user"""
     data = request.get_json()
@@ -80,6 +87,11 @@ def login():
     if not all(field in data for field in ['email', 'password']):
         return jsonify({'error': 'Email and password required'}), 400
     
+    # Throttle per account before any DB lookup or bcrypt work
+    limited = check_rate_limit('login_email', str(data['email']).strip().lower())
+    if limited:
+        return limited
+    
     # Get user
     db_service = current_app.db_service
     user = db_service.get_user_by_email(data['email'])
@@ -89,8 +101,21 @@ def login():
     
     # Verify password
     auth_service = current_app.auth_service
-    if not auth_service.verify_password(data['password'], user['password_hash']):
-        return jsonify({'error': 'Invalid credentials'}), 401
+    try:
+        if not auth_service.verify_password(data['password'], user['password_hash']):
+            return jsonify({'error': 'Invalid credentials'}), 401
+    except HashingUnavailable:
+        return jsonify({'error': 'Server is busy, please try again'}), 503
+    
+    # Upgrade hashes made with an older, cheaper cost; best effort, the
+    # next login retries if no hashing capacity is free now
+    if auth_service.needs_rehash(user['password_hash']):
+        try:
+            db_service.update_user(user['user_id'], {
+                'password_hash': auth_service.hash_password(data['password'])
+            })
+        except HashingUnavailable:
+            pass
     
     # Generate token
     token = auth_service.generate_token(
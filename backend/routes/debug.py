@@ -0,0 +1,34 @@
+from flask import Blueprint, request, jsonify, current_app
+from middleware import token_required, role_required
+import os
+
+debug_bp = Blueprint('debug', __name__, url_prefix='/api/debug')
+
+SLOW_QUERIES_DEFAULT = 20
+SLOW_QUERIES_MAX = 200
+
+@debug_bp.route('/slow-queries', methods=['GET'])
+@token_required
+@role_required(['manager'])
+def slow_queries():
+    """Slowest SQL statements since this worker started (manager only)"""
+    db_service = current_app.db_service
+    if not hasattr(db_service, 'get_query_stats'):
+        return jsonify({'error': 'Query statistics are only collected by the PostgreSQL service'}), 404
+    
+    # Parsed here, not with type=int: a bad value must not fall back to the default
+    try:
+        limit = int(request.args.get('limit', SLOW_QUERIES_DEFAULT))
+    except ValueError:
+        return jsonify({'error': 'Limit must be an integer'}), 400
+    if limit < 1:
+        return jsonify({'error': 'Limit must be positive'}), 400
+    
+    try:
+        stats = db_service.get_query_stats(min(limit, SLOW_QUERIES_MAX), request.args.get('sort', 'max_ms'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Counters are per process; each gunicorn worker answers with its own
+    stats['pid'] = os.getpid()
+    return jsonify(stats), 200
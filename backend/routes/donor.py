@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify, current_app
 from middleware import token_required, role_required
-from datetime import datetime, timedelta
+from services import can_donate, compatible_recipients, next_eligible_at, parse_donation_date, find_matching_requests, batch_eligibility
+from datetime import datetime
+import uuid
 
 donor_bp = Blueprint('donor', __name__, url_prefix='/api/donor')
 
@@ -30,15 +32,10 @@ def check_eligibility():
             'message': 'You are eligible to donate!'
         }), 200
     
-    # Parse last donation date
-    try:
-        last_donation_date = datetime.fromisoformat(last_donation.replace('Z', '+00:00'))
-    except:
-        last_donation_date = datetime.fromisoformat(last_donation)
-    
-    # Calculate next eligible date
-    interval_days = config['DONATION_INTERVAL_DAYS']
-    next_eligible_date = last_donation_date + timedelta(days=interval_days)
+    # Next eligible date, precomputed by the data layer when last_donation is written
+    next_eligible_date = parse_donation_date(user.get('next_eligible_at'))
+    if next_eligible_date is None:
+        next_eligible_date = next_eligible_at(last_donation, config['DONATION_INTERVAL_DAYS'])
     
     # Check if eligible
     now = datetime.utcnow()
@@ -55,6 +52,50 @@ def check_eligibility():
     }), 200
 
 
+@donor_bp.route('/eligibility/batch', methods=['POST'])
+@token_required
+@role_required(['manager'])
+def check_batch_eligibility():
+    """Eligibility for many donors at once, with counts per blood type
+    
+    Optional body: user_ids, blood_types, include_donors (default true).
+    Without filters every donor is included.
+    """
+    data = request.get_json(silent=True) or {}
+    user_ids = data.get('user_ids')
+    blood_types = data.get('blood_types')
+    
+    for value in (user_ids, blood_types):
+        if value is not None and not (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+            return jsonify({'error': 'user_ids and blood_types must be lists of strings'}), 400
+    
+    # A malformed id would fail the whole uuid[] lookup, not just miss
+    try:
+        for user_id in user_ids or ():
+            uuid.UUID(user_id)
+    except ValueError:
+        return jsonify({'error': f'Invalid user id: {user_id}'}), 400
+    
+    include_donors = data.get('include_donors', True)
+    if not isinstance(include_donors, bool):
+        return jsonify({'error': 'include_donors must be true or false'}), 400
+    
+    db_service = current_app.db_service
+    config = current_app.config
+    
+    columns = db_service.get_donor_columns(blood_types=blood_types, user_ids=user_ids)
+    now = datetime.utcnow()
+    report = batch_eligibility(
+        columns,
+        config['DONATION_INTERVAL_DAYS'],
+        now=now,
+        include_donors=include_donors
+    )
+    report['as_of'] = now.isoformat()
+    
+    return jsonify(report), 200
+
+
 @donor_bp.route('/schedule', methods=['POST'])
 @token_required
 @role_required(['donor'])
@@ -80,9 +121,9 @@ def schedule_donation():
     # Get user data
     user = db_service.get_user_by_id(request.user['user_id'])
     
-    # Check blood type compatibility
-    if user.get('blood_type') != blood_request.get('blood_type'):
-        return jsonify({'error': 'Blood type mismatch'}), 400
+    # Check blood type compatibility (ABO/Rh)
+    if not can_donate(user.get('blood_type'), blood_request.get('blood_type')):
+        return jsonify({'error': 'Blood type not compatible with this request'}), 400
     
     # In a real system, this would create a donation appointment
     # For now, we'll just return success
@@ -98,7 +139,7 @@ def schedule_donation():
 @token_required
 @role_required(['donor'])
 def get_matching_requests():
-    """Get blood requests matching donor's blood type"""
+    """Get open blood requests the donor's blood type can cover"""
     db_service = current_app.db_service
     
     # Get user data
@@ -112,17 +153,14 @@ def get_matching_requests():
     if not blood_type:
         return jsonify({'error': 'Blood type not set'}), 400
     
-    # Get matching requests
-    requests = db_service.get_requests_by_blood_type(blood_type, status='open')
-    
-    # Sort by urgency and timestamp
-    requests.sort(key=lambda x: (
-        0 if x.get('urgency') == 'high' else 1,
-        x.get('timestamp', '')
-    ), reverse=True)
+    # Open requests for every compatible recipient type, ranked by
+    # urgency, then how scarce the recipient type's stock is, then age
+    inventory = current_app.inventory_cache.get_inventory()
+    requests = find_matching_requests(db_service, blood_type, inventory)
     
     return jsonify({
         'blood_type': blood_type,
+        'compatible_recipients': list(compatible_recipients(blood_type)),
         'matching_requests': requests,
         'count': len(requests)
     }), 200
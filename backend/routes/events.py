@@ -0,0 +1,56 @@
+from flask import Blueprint, Response, request, jsonify, current_app
+from services.events import EVENT_TYPES
+
+events_bp = Blueprint('events', __name__, url_prefix='/api/events')
+
+@events_bp.route('', methods=['GET'])
+def stream_events():
+    """Server-Sent Events feed of in-memory backend changes (local dev)
+
+    Registered only when app.py runs on the in-memory service, whose writes
+    all happen in this process. Each open stream holds a server thread;
+    with Postgres the feed is served by the ASGI app (async_routes/events.py),
+    same parameters and events.
+    """
+    token = None
+    auth_header = request.headers.get('Authorization')
+    if auth_header:
+        try:
+            token = auth_header.split(' ')[1]  # Bearer <token>
+        except IndexError:
+            return jsonify({'error': 'Invalid token format'}), 401
+    else:
+        token = request.args.get('access_token')
+
+    if not token:
+        return jsonify({'error': 'Token is missing'}), 401
+    if not current_app.auth_service.verify_token(token):
+        return jsonify({'error': 'Token is invalid or expired'}), 401
+
+    types = None
+    if request.args.get('types'):
+        types = set(request.args['types'].split(','))
+        if not types <= EVENT_TYPES:
+            return jsonify({'error': f"types must be among {', '.join(sorted(EVENT_TYPES))}"}), 400
+
+    config = current_app.config
+    subscription = current_app.event_broker.subscribe_blocking(
+        last_event_id=request.headers.get('Last-Event-ID') or request.args.get('last_event_id'),
+        types=types
+    )
+
+    def generate():
+        try:
+            yield f"retry: {config['EVENTS_RETRY_MS']}\n\n"
+            while True:
+                # Comment lines keep proxies from closing idle streams
+                event = subscription.get(timeout=config['EVENTS_HEARTBEAT_SECONDS'])
+                yield event.text if event else ": keep-alive\n\n"
+        finally:
+            subscription.close()
+
+    return Response(generate(), 200, {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
@@ -1,60 +1,44 @@
 from flask import Blueprint, request, jsonify, current_app
-from middleware import token_required, role_required
+from middleware import token_required, role_required, version_etag, set_validators, check_not_modified
+from services import InsufficientStock, INVENTORY_FIELDS, parse_fields, project
 
 inventory_bp = Blueprint('inventory', __name__, url_prefix='/api/inventory')
 
 @inventory_bp.route('', methods=['GET'])
 @token_required
 def get_inventory():
-    """Get blood inventory"""
-    db_service = current_app.db_service
-    config = current_app.config
+    """Get blood inventory (answers If-None-Match/If-Modified-Since with 304)"""
+    inventory_cache = current_app.inventory_cache
     
-    # Get all inventory
-    inventory = db_service.get_inventory()
-    
-    # Add low stock indicators
-    for item in inventory:
-        units = item.get('units_available', 0)
-        if units < config['CRITICAL_STOCK_THRESHOLD']:
-            item['stock_status'] = 'critical'
-        elif units < config['LOW_STOCK_THRESHOLD']:
-            item['stock_status'] = 'low'
-        else:
-            item['stock_status'] = 'good'
-        
-        item['is_low_stock'] = units < config['LOW_STOCK_THRESHOLD']
+    try:
+        fields = parse_fields(request.args.get('fields'), INVENTORY_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Sort by blood type
-    blood_type_order = ['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']
-    inventory.sort(key=lambda x: blood_type_order.index(x['blood_type']) if x['blood_type'] in blood_type_order else 999)
+    # Cached inventory is already annotated with stock status and sorted by blood type
+    snapshot = inventory_cache.get_snapshot()
     
-    return jsonify({'inventory': inventory}), 200
+    etag = version_etag('inventory', snapshot.version, request.query_string.decode())
+    not_modified = check_not_modified(etag, snapshot.last_modified)
+    if not_modified:
+        return not_modified
+    
+    # The rows are already in this worker's cache, so the fieldset is applied here
+    items = snapshot.items if fields is None else [project(item, fields) for item in snapshot.items]
+    return set_validators(jsonify({'inventory': items}), etag, snapshot.last_modified)
 
 
 @inventory_bp.route('/<blood_type>', methods=['GET'])
 @token_required
 def get_inventory_by_type(blood_type):
     """Get inventory for specific blood type"""
-    db_service = current_app.db_service
-    config = current_app.config
+    inventory_cache = current_app.inventory_cache
     
-    item = db_service.get_inventory(blood_type)
+    item = inventory_cache.get_inventory(blood_type)
     
     if not item:
         return jsonify({'error': 'Blood type not found'}), 404
     
-    # Add stock status
-    units = item.get('units_available', 0)
-    if units < config['CRITICAL_STOCK_THRESHOLD']:
-        item['stock_status'] = 'critical'
-    elif units < config['LOW_STOCK_THRESHOLD']:
-        item['stock_status'] = 'low'
-    else:
-        item['stock_status'] = 'good'
-    
-    item['is_low_stock'] = units < config['LOW_STOCK_THRESHOLD']
-    
     return jsonify(item), 200
 
 
@@ -82,9 +66,9 @@ def update_inventory():
     except ValueError:
         return jsonify({'error': 'Invalid units value'}), 400
     
-    # Update inventory
-    db_service = current_app.db_service
-    success = db_service.update_inventory(
+    # Update inventory (invalidates the inventory cache)
+    inventory_cache = current_app.inventory_cache
+    success = inventory_cache.update_inventory(
         data['blood_type'],
         units,
         request.user['user_id']
@@ -96,23 +80,97 @@ def update_inventory():
     return jsonify({'message': 'Inventory updated successfully'}), 200
 
 
+@inventory_bp.route('/<blood_type>/adjust', methods=['POST'])
+@token_required
+@role_required(['manager'])
+def adjust_inventory(blood_type):
+    """Add or issue units atomically (manager only)"""
+    data = request.get_json()
+    
+    # Validate blood type
+    valid_blood_types = ['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']
+    if blood_type not in valid_blood_types:
+        return jsonify({'error': 'Invalid blood type'}), 400
+    
+    # Validate delta
+    try:
+        delta = int(data['delta'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'Integer delta required'}), 400
+    
+    # Apply in one round trip (invalidates the inventory cache)
+    inventory_cache = current_app.inventory_cache
+    try:
+        units = inventory_cache.adjust_inventory(blood_type, delta, request.user['user_id'])
+    except InsufficientStock as e:
+        return jsonify({'error': str(e)}), 409
+    
+    if units is None:
+        return jsonify({'error': 'Failed to update inventory'}), 500
+    
+    return jsonify({'blood_type': blood_type, 'units_available': units}), 200
+
+
+@inventory_bp.route('/bulk', methods=['POST'])
+@token_required
+@role_required(['manager'])
+def bulk_update_inventory():
+    """Apply a batch of inventory changes atomically (manager only)"""
+    data = request.get_json()
+    config = current_app.config
+    
+    updates = data.get('updates') if isinstance(data, dict) else data
+    if not isinstance(updates, list) or not updates:
+        return jsonify({'error': 'Updates must be a non-empty list'}), 400
+    
+    if len(updates) > config['INVENTORY_BULK_MAX_ITEMS']:
+        return jsonify({'error': f"At most {config['INVENTORY_BULK_MAX_ITEMS']} updates per request"}), 400
+    
+    # Validate every entry before touching the database
+    valid_blood_types = ['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']
+    cleaned = []
+    for index, update in enumerate(updates):
+        if not isinstance(update, dict) or update.get('blood_type') not in valid_blood_types:
+            return jsonify({'error': f'Invalid blood type in update {index}'}), 400
+        
+        has_units = 'units_available' in update
+        if has_units == ('delta' in update):
+            return jsonify({'error': f'Update {index} needs exactly one of units_available or delta'}), 400
+        
+        try:
+            value = int(update['units_available'] if has_units else update['delta'])
+        except (TypeError, ValueError):
+            return jsonify({'error': f'Invalid units value in update {index}'}), 400
+        
+        if has_units and value < 0:
+            return jsonify({'error': f'Units cannot be negative in update {index}'}), 400
+        
+        cleaned.append({'blood_type': update['blood_type'], 'units_available' if has_units else 'delta': value})
+    
+    # Apply in one transaction (invalidates the inventory cache)
+    inventory_cache = current_app.inventory_cache
+    success, results = inventory_cache.bulk_update_inventory(cleaned, request.user['user_id'])
+    
+    # A database failure is not a conflict: the same batch may succeed on retry
+    if success is None:
+        return jsonify({'error': 'Failed to update inventory', 'results': results}), 500
+    if not success:
+        return jsonify({'error': 'Bulk update rolled back', 'results': results}), 409
+    
+    return jsonify({'message': 'Inventory updated successfully', 'results': results}), 200
+
+
 @inventory_bp.route('/low-stock', methods=['GET'])
 @token_required
 @role_required(['manager'])
 def get_low_stock():
     """Get low stock alerts (manager only)"""
-    db_service = current_app.db_service
+    inventory_cache = current_app.inventory_cache
     config = current_app.config
     
     threshold = request.args.get('threshold', config['LOW_STOCK_THRESHOLD'], type=int)
-    low_stock_items = db_service.get_low_stock_items(threshold)
-    
-    # Add severity
-    for item in low_stock_items:
-        units = item.get('units_available', 0)
-        if units < config['CRITICAL_STOCK_THRESHOLD']:
-            item['severity'] = 'critical'
-        else:
-            item['severity'] = 'low'
+    
+    # Derived from the cached inventory, with severity already set
+    low_stock_items = inventory_cache.get_low_stock_items(threshold)
     
     return jsonify({'low_stock_items': low_stock_items}), 200
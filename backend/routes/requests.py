@@ -1,10 +1,22 @@
-from flask import Blueprint, request, jsonify, current_app
-from middleware import token_required, role_required
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from middleware import token_required, role_required, version_etag, set_validators, check_not_modified, conditional_body
+from services import compatible_donors, REQUEST_FIELDS, parse_fields
 from datetime import datetime
+import csv
+import io
+import itertools
 import uuid
 
 requests_bp = Blueprint('requests', __name__, url_prefix='/api/requests')
 
+EXPORT_MIMETYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+EXPORT_CSV_FIELDS = [
+    'request_id', 'blood_type', 'quantity', 'urgency', 'status',
+    'hospital_name', 'location', 'notes', 'created_by', 'created_by_name',
+    'timestamp', 'created_at', 'updated_at', 'fulfilled_at'
+]
+EXPORT_CHUNK_SIZE = 64 * 1024
+
 @requests_bp.route('', methods=['POST'])
 @token_required
 @role_required(['hospital', 'manager'])
@@ -60,20 +72,113 @@ def get_requests():
     """Get blood requests with optional filters"""
     db_service = current_app.db_service
     
+    config = current_app.config
+    
     # Get query parameters
     status = request.args.get('status')
     blood_type = request.args.get('blood_type')
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    
+    # Sparse fieldset: only these columns are read and returned
+    try:
+        fields = parse_fields(request.args.get('fields'), REQUEST_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Pagination is opt-in: without limit/cursor the full list is returned
+    paginated = limit is not None or cursor is not None
+    if paginated:
+        # Parsed here, not with type=int: a bad value must not fall back to the full list
+        try:
+            limit = config['REQUESTS_PAGE_SIZE'] if limit is None else int(limit)
+        except ValueError:
+            return jsonify({'error': 'Limit must be an integer'}), 400
+        if limit < 1:
+            return jsonify({'error': 'Limit must be positive'}), 400
+        limit = min(limit, config['REQUESTS_MAX_PAGE_SIZE'])
+    
+    # The page depends only on the table version and the query string, so an
+    # unchanged version is answered without reading any rows
+    version = db_service.get_table_version('blood_requests')
+    if version:
+        etag = version_etag('requests', version[0], request.query_string.decode())
+        not_modified = check_not_modified(etag, version[1])
+        if not_modified:
+            return not_modified
+    
+    # Get requests (sorted newest first by the data layer)
+    try:
+        requests, next_cursor = db_service.get_requests_page(
+            blood_type=blood_type,
+            status=status,
+            limit=limit,
+            cursor=cursor,
+            fields=fields
+        )
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    response = {'requests': requests}
+    if paginated:
+        response['next_cursor'] = next_cursor
     
-    # Get requests
-    if blood_type:
-        requests = db_service.get_requests_by_blood_type(blood_type, status)
-    else:
-        requests = db_service.get_all_requests(status)
+    if version:
+        return set_validators(jsonify(response), etag, version[1])
+    return conditional_body(jsonify(response))
+
+
+@requests_bp.route('/export', methods=['GET'])
+@token_required
+@role_required(['manager'])
+def export_requests():
+    """Stream all matching requests as NDJSON (default) or CSV"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_MIMETYPES:
+        return jsonify({'error': 'Format must be ndjson or csv'}), 400
+    
+    rows = current_app.db_service.iter_requests(
+        blood_type=request.args.get('blood_type'),
+        status=request.args.get('status'),
+        fetch_size=current_app.config['EXPORT_FETCH_SIZE']
+    )
+    encode = current_app.json.dumps
     
-    # Sort by timestamp (newest first)
-    requests.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+    # Read the first page before answering, so a failing query is still a 500.
+    # Later errors propagate out of generate(): the server then drops the
+    # connection before the final chunk, so clients (and nginx) see an
+    # incomplete transfer, not a short but well-formed file, in either format.
+    # Every data line stays a record; completion is the chunked framing.
+    try:
+        first = next(rows, None)
+    except Exception:
+        return jsonify({'error': 'Export failed'}), 500
     
-    return jsonify({'requests': requests}), 200
+    def generate():
+        buffer = io.StringIO()
+        if export_format == 'csv':
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            write = lambda row: buffer.write(encode(row) + '\n')
+        
+        # Send in ~64KB chunks rather than one write per row
+        for row in itertools.chain([first], rows) if first is not None else ():
+            write(row)
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    filename = f"blood_requests_{datetime.utcnow():%Y%m%d%H%M%S}.{export_format}"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
 
 
 @requests_bp.route('/<request_id>', methods=['GET'])
@@ -81,12 +186,64 @@ def get_requests():
 def get_request(request_id):
     """Get a specific blood request"""
     db_service = current_app.db_service
+    
+    # Row version first: a match skips the fetch and serialisation entirely
+    version = db_service.get_request_version(request_id)
+    if version:
+        etag = version_etag('request', request_id, version[0])
+        not_modified = check_not_modified(etag, version[1])
+        if not_modified:
+            return not_modified
+    
     blood_request = db_service.get_request_by_id(request_id)
     
     if not blood_request:
         return jsonify({'error': 'Request not found'}), 404
     
-    return jsonify(blood_request), 200
+    if version:
+        return set_validators(jsonify(blood_request), etag, version[1])
+    return conditional_body(jsonify(blood_request))
+
+
+@requests_bp.route('/<request_id>/eligible-donors', methods=['GET'])
+@token_required
+@role_required(['hospital', 'manager'])
+def get_eligible_donors(request_id):
+    """Find donors who are compatible with a request and eligible to donate now"""
+    db_service = current_app.db_service
+    config = current_app.config
+
+    blood_request = db_service.get_request_by_id(request_id)
+    if not blood_request:
+        return jsonify({'error': 'Request not found'}), 404
+
+    # Parsed here, not with type=int: a bad value must not fall back to the default page
+    try:
+        limit = int(request.args.get('limit', config['REQUESTS_PAGE_SIZE']))
+    except ValueError:
+        return jsonify({'error': 'Limit must be an integer'}), 400
+    if limit < 1:
+        return jsonify({'error': 'Limit must be positive'}), 400
+    limit = min(limit, config['REQUESTS_MAX_PAGE_SIZE'])
+
+    donor_types = compatible_donors(blood_request.get('blood_type'))
+    try:
+        donors, next_cursor = db_service.get_eligible_donors(
+            donor_types,
+            eligible_at=datetime.utcnow(),
+            limit=limit,
+            cursor=request.args.get('cursor')
+        )
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    return jsonify({
+        'request_id': request_id,
+        'blood_type': blood_request.get('blood_type'),
+        'donor_blood_types': list(donor_types),
+        'donors': donors,
+        'next_cursor': next_cursor
+    }), 200
 
 
 @requests_bp.route('/<request_id>', methods=['PUT'])
@@ -33,7 +33,9 @@ def create_dynamodb_tables():
         ],
         'AttributeDefinitions': [
             {'AttributeName': 'user_id', 'AttributeType': 'S'},
-            {'AttributeName': 'email', 'AttributeType': 'S'}
+            {'AttributeName': 'email', 'AttributeType': 'S'},
+            {'AttributeName': 'blood_type', 'AttributeType': 'S'},
+            {'AttributeName': 'eligible_key', 'AttributeType': 'S'}
         ],
         'GlobalSecondaryIndexes': [
             {
@@ -46,6 +48,23 @@ def create_dynamodb_tables():
                     'ReadCapacityUnits': 5,
                     'WriteCapacityUnits': 5
                 }
+            },
+            {
+                # Eligible-donor search; eligible_key is "<next_eligible_at>#<user_id>"
+                # and only set on donors, so the index holds donors only
+                'IndexName': 'EligibilityIndex',
+                'KeySchema': [
+                    {'AttributeName': 'blood_type', 'KeyType': 'HASH'},
+                    {'AttributeName': 'eligible_key', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {
+                    'ProjectionType': 'INCLUDE',
+                    'NonKeyAttributes': ['name', 'email', 'phone', 'role', 'last_donation', 'next_eligible_at']
+                },
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
             }
         ],
         'ProvisionedThroughput': {
@@ -64,7 +83,9 @@ def create_dynamodb_tables():
         'AttributeDefinitions': [
             {'AttributeName': 'request_id', 'AttributeType': 'S'},
             {'AttributeName': 'blood_type', 'AttributeType': 'S'},
-            {'AttributeName': 'timestamp', 'AttributeType': 'S'}
+            {'AttributeName': 'timestamp', 'AttributeType': 'S'},
+            {'AttributeName': 'status', 'AttributeType': 'S'},
+            {'AttributeName': 'blood_type_status', 'AttributeType': 'S'}
         ],
         'GlobalSecondaryIndexes': [
             {
@@ -78,6 +99,33 @@ def create_dynamodb_tables():
                     'ReadCapacityUnits': 5,
                     'WriteCapacityUnits': 5
                 }
+            },
+            {
+                # Listings filtered by status only, newest first
+                'IndexName': 'StatusIndex',
+                'KeySchema': [
+                    {'AttributeName': 'status', 'KeyType': 'HASH'},
+                    {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            },
+            {
+                # Listings filtered by blood type and status; blood_type_status
+                # is "<blood_type>#<status>", kept in step by DynamoDBService
+                'IndexName': 'BloodTypeStatusIndex',
+                'KeySchema': [
+                    {'AttributeName': 'blood_type_status', 'KeyType': 'HASH'},
+                    {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
             }
         ],
         'ProvisionedThroughput': {
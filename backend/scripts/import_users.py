@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Bulk User Import Script
+Streams donors/users from CSV or NDJSON into PostgreSQL (COPY + merge) or DynamoDB (batch_writer)
+
+Each row needs name, email and either password (hashed here on a process pool)
+or password_hash (an existing bcrypt hash). role defaults to donor; donors need
+a blood_type. Optional: phone, last_donation (ISO date).
+
+Rows whose email already has an account are skipped (listed in --rejects), so
+re-running an import is safe on both targets. Postgres can instead update their
+profile fields with --on-conflict update; DynamoDB only skips.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/import_users.py donors.csv
+    python scripts/import_users.py donors.ndjson --target dynamodb --rejects rejects.ndjson
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import bcrypt
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+from services.eligibility import next_eligible_at, format_timestamp, eligibility_key
+
+# Load environment variables
+load_dotenv()
+
+VALID_ROLES = {'donor', 'hospital', 'manager'}
+VALID_BLOOD_TYPES = {'A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-'}
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+BCRYPT_PATTERN = re.compile(r'^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$')
+
+COLUMNS = ['user_id', 'name', 'email', 'password_hash', 'role', 'blood_type', 'phone', 'last_donation', 'next_eligible_at', 'created_at']
+
+
+def read_rows(path, fmt):
+    """Yield (row dict, parse error) one record at a time"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            for row in csv.DictReader(f):
+                yield row, None
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield None, f'Invalid JSON: {e}'
+                    continue
+                if not isinstance(row, dict):
+                    yield None, 'Row is not an object'
+                    continue
+                yield row, None
+
+
+def validate(row, seen_emails):
+    """Return (clean user dict, None) or (None, reason)"""
+    name = (row.get('name') or '').strip()
+    email = (row.get('email') or '').strip()
+    role = (row.get('role') or 'donor').strip()
+    blood_type = (row.get('blood_type') or '').strip() or None
+    password = row.get('password') or None
+    password_hash = (row.get('password_hash') or '').strip() or None
+
+    if not name:
+        return None, 'Missing name'
+    if not EMAIL_PATTERN.match(email):
+        return None, 'Invalid email'
+    if email in seen_emails:
+        return None, 'Duplicate email in file'
+    if role not in VALID_ROLES:
+        return None, 'Invalid role'
+    if role == 'donor' and blood_type is None:
+        return None, 'Blood type required for donors'
+    if blood_type is not None and blood_type not in VALID_BLOOD_TYPES:
+        return None, 'Invalid blood type'
+    if password_hash is not None and not BCRYPT_PATTERN.match(password_hash):
+        return None, 'Invalid password_hash'
+    if password_hash is None and not password:
+        return None, 'Missing password or password_hash'
+
+    last_donation = (row.get('last_donation') or '').strip() or None
+    if last_donation:
+        try:
+            last_donation = datetime.fromisoformat(last_donation.replace('Z', '+00:00')).isoformat()
+        except ValueError:
+            return None, 'Invalid last_donation'
+
+    seen_emails.add(email)
+    user_id = str(uuid.uuid4())
+    next_eligible = next_eligible_at(last_donation, Config.DONATION_INTERVAL_DAYS)
+    return {
+        'user_id': user_id,
+        'name': name,
+        'email': email,
+        'password': password if password_hash is None else None,
+        'password_hash': password_hash,
+        'role': role,
+        'blood_type': blood_type,
+        'phone': (row.get('phone') or '').strip(),
+        'last_donation': last_donation,
+        'next_eligible_at': format_timestamp(next_eligible),
+        # DynamoDB EligibilityIndex sort key (donors only, so the index stays sparse)
+        'eligible_key': eligibility_key(next_eligible, user_id) if role == 'donor' else None,
+        'created_at': datetime.utcnow().isoformat()
+    }, None
+
+
+def hash_password(args):
+    """Runs in a worker process"""
+    password, rounds = args
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def hash_batch(batch, executor, rounds, workers):
+    """Fill in password_hash for rows that came with a plain password"""
+    pending = [user for user in batch if user['password_hash'] is None]
+    if pending:
+        chunksize = max(1, len(pending) // (workers * 4))
+        hashes = executor.map(hash_password, [(user['password'], rounds) for user in pending], chunksize=chunksize)
+        for user, hashed in zip(pending, hashes):
+            user['password_hash'] = hashed
+    for user in batch:
+        user.pop('password', None)
+
+
+class PostgresLoader:
+    """COPY each batch into a temp staging table, then merge into users"""
+
+    def __init__(self, database_url, on_conflict):
+        import psycopg2
+        self.conn = psycopg2.connect(database_url)
+        self.on_conflict = on_conflict
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TEMP TABLE users_import (LIKE users INCLUDING DEFAULTS)
+            ON COMMIT DELETE ROWS
+        """)
+        self.conn.commit()
+        cursor.close()
+
+    def existing_emails(self, emails):
+        """Emails already in users (checked before hashing so skipped rows cost no bcrypt)"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SELECT email FROM users WHERE email = ANY(%s)", (list(emails),))
+            return {row[0] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+            self.conn.commit()
+
+    def load(self, batch):
+        """Load a batch; return the emails that were not inserted"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for user in batch:
+            writer.writerow([user[column] for column in COLUMNS])
+        buffer.seek(0)
+
+        if self.on_conflict == 'update':
+            conflict_clause = """
+                ON CONFLICT (email) DO UPDATE SET
+                    name = EXCLUDED.name,
+                    phone = EXCLUDED.phone,
+                    blood_type = EXCLUDED.blood_type,
+                    last_donation = COALESCE(EXCLUDED.last_donation, users.last_donation),
+                    next_eligible_at = CASE WHEN EXCLUDED.last_donation IS NULL
+                        THEN users.next_eligible_at ELSE EXCLUDED.next_eligible_at END
+            """
+        else:
+            conflict_clause = "ON CONFLICT (email) DO NOTHING"
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY users_import ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+            cursor.execute(f"""
+                INSERT INTO users ({', '.join(COLUMNS)})
+                SELECT {', '.join(COLUMNS)} FROM users_import
+                {conflict_clause}
+                RETURNING email
+            """)
+            merged = {row[0] for row in cursor.fetchall()}
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        return [user['email'] for user in batch if user['email'] not in merged]
+
+    def close(self):
+        self.conn.close()
+
+
+class DynamoDBLoader:
+    """Write each batch with batch_writer (25-item BatchWriteItem calls)
+
+    DynamoDB has no unique email constraint, so existing emails are looked
+    up on EmailIndex before each batch is hashed and written, and skipped.
+    The index is eventually consistent: an account created moments before
+    the import (e.g. a registration during it) may not be seen yet.
+    """
+
+    # Concurrent EmailIndex queries per batch
+    LOOKUP_THREADS = 16
+
+    def __init__(self, table_name):
+        import boto3
+        region = os.getenv('AWS_REGION', 'us-east-1')
+        endpoint = os.getenv('DYNAMODB_ENDPOINT', None)
+        if endpoint:
+            resource = boto3.resource('dynamodb', region_name=region, endpoint_url=endpoint)
+        else:
+            resource = boto3.resource('dynamodb', region_name=region)
+        self.table = resource.Table(table_name)
+        # The low-level client is thread-safe; Table resources are not
+        self.client = resource.meta.client
+
+    def _email_exists(self, email):
+        response = self.client.query(
+            TableName=self.table.name,
+            IndexName='EmailIndex',
+            KeyConditionExpression='email = :email',
+            ExpressionAttributeValues={':email': email},
+            Select='COUNT'
+        )
+        return response['Count'] > 0
+
+    def existing_emails(self, emails):
+        """Emails that already have an account (checked before hashing, like Postgres)"""
+        emails = list(emails)
+        with ThreadPoolExecutor(max_workers=self.LOOKUP_THREADS) as pool:
+            found = pool.map(self._email_exists, emails)
+            return {email for email, exists in zip(emails, found) if exists}
+
+    def load(self, batch):
+        # Existing emails were filtered out by existing_emails
+        with self.table.batch_writer(overwrite_by_pkeys=['user_id']) as writer:
+            for user in batch:
+                writer.put_item(Item={key: value for key, value in user.items() if value is not None})
+        return []
+
+    def close(self):
+        pass
+
+
+def run_import(args):
+    if args.target == 'postgres':
+        database_url = os.getenv('DATABASE_URL')
+        if not database_url:
+            print("Error: DATABASE_URL environment variable not set")
+            sys.exit(1)
+        loader = PostgresLoader(database_url, args.on_conflict)
+    else:
+        # No email key to merge on: re-imports can only skip existing accounts
+        if args.on_conflict != 'skip':
+            print("Error: --target dynamodb supports only --on-conflict skip")
+            sys.exit(1)
+        loader = DynamoDBLoader(args.table)
+
+    fmt = args.format or ('csv' if args.file.endswith('.csv') else 'ndjson')
+    rejects = open(args.rejects, 'w', encoding='utf-8') if args.rejects else None
+    seen_emails = set()
+    stats = {'read': 0, 'loaded': 0, 'rejected': 0}
+    start = time.perf_counter()
+
+    def reject(record, reason, row=None):
+        stats['rejected'] += 1
+        if rejects:
+            row = {k: v for k, v in (row or {}).items() if k not in ('password', 'password_hash')}
+            rejects.write(json.dumps({'record': record, 'reason': reason, 'row': row}, default=str) + '\n')
+
+    def flush(batch):
+        skipped = []
+        if args.on_conflict == 'skip':
+            existing = loader.existing_emails(user['email'] for user in batch)
+            skipped = [user['email'] for user in batch if user['email'] in existing]
+            batch = [user for user in batch if user['email'] not in existing]
+        if batch:
+            hash_batch(batch, executor, args.rounds, args.workers)
+            not_inserted = loader.load(batch)
+            stats['loaded'] += len(batch) - len(not_inserted)
+            skipped += not_inserted
+        for email in skipped:
+            reject(None, 'Email already exists', {'email': email})
+        elapsed = time.perf_counter() - start
+        print(f"  {stats['read']:>9} read  {stats['loaded']:>9} loaded  "
+              f"{stats['rejected']:>7} rejected  {stats['read'] / elapsed:8.0f} rows/s")
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            batch = []
+            for record, (row, error) in enumerate(read_rows(args.file, fmt), start=1):
+                stats['read'] += 1
+                if error:
+                    reject(record, error)
+                    continue
+                user, reason = validate(row, seen_emails)
+                if reason:
+                    reject(record, reason, row)
+                    continue
+                batch.append(user)
+                if len(batch) >= args.batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+    finally:
+        loader.close()
+        if rejects:
+            rejects.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✓ Imported {stats['loaded']} of {stats['read']} rows in {elapsed:.1f}s "
+          f"({stats['read'] / elapsed if elapsed else 0:.0f} rows/s)")
+    if stats['rejected']:
+        print(f"⚠ {stats['rejected']} rows rejected" + (f" (see {args.rejects})" if args.rejects else ""))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk import users from CSV or NDJSON')
+    parser.add_argument('file', help='CSV (with header) or NDJSON file')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help='default: from file extension')
+    parser.add_argument('--target', choices=['postgres', 'dynamodb'], default='postgres')
+    parser.add_argument('--table', default='BloodBridge_Users', help='DynamoDB users table')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='password hashing processes')
+    parser.add_argument('--rounds', type=int, default=int(os.getenv('BCRYPT_ROUNDS', 12)))
+    parser.add_argument('--on-conflict', choices=['skip', 'update'], default='skip',
+                        help='existing email: skip the row or update profile fields (Postgres only)')
+    parser.add_argument('--rejects', help='write rejected rows to this NDJSON file')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BloodBridge Bulk User Import")
+    print("=" * 60)
+
+    run_import(args)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Migration Script
+Brings an existing BloodRequests table up to the schema in create_tables.py:
+backfills blood_type_status ("<blood_type>#<status>") on older items, then
+adds StatusIndex and BloodTypeStatusIndex.
+
+Run it before deploying code that queries the new indexes, and once more
+afterwards to catch requests the old code wrote in between. Both steps are
+idempotent.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import boto3
+from botocore.exceptions import ClientError
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.dynamodb_scan import TableScan
+from services.dynamodb_service import blood_type_status_key
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
+DYNAMODB_ENDPOINT = os.getenv('DYNAMODB_ENDPOINT', None)
+
+ATTRIBUTE_DEFINITIONS = [
+    {'AttributeName': 'timestamp', 'AttributeType': 'S'},
+    {'AttributeName': 'status', 'AttributeType': 'S'},
+    {'AttributeName': 'blood_type_status', 'AttributeType': 'S'}
+]
+
+NEW_INDEXES = [
+    {
+        'IndexName': 'StatusIndex',
+        'KeySchema': [
+            {'AttributeName': 'status', 'KeyType': 'HASH'},
+            {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': 'ALL'}
+    },
+    {
+        'IndexName': 'BloodTypeStatusIndex',
+        'KeySchema': [
+            {'AttributeName': 'blood_type_status', 'KeyType': 'HASH'},
+            {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': 'ALL'}
+    }
+]
+
+
+def backfill(table, segments):
+    """Set blood_type_status wherever it is missing or stale"""
+    scan = TableScan(
+        table,
+        segments=segments,
+        ProjectionExpression='request_id, blood_type, #status, blood_type_status',
+        ExpressionAttributeNames={'#status': 'status'}
+    )
+    updated = current = skipped = raced = 0
+
+    for item in scan:
+        if not item.get('blood_type') or not item.get('status'):
+            skipped += 1
+            continue
+
+        key = blood_type_status_key(item['blood_type'], item['status'])
+        if item.get('blood_type_status') == key:
+            current += 1
+            continue
+
+        try:
+            # Only if nothing changed since the scan read the item
+            table.update_item(
+                Key={'request_id': item['request_id']},
+                UpdateExpression='SET blood_type_status = :key',
+                ConditionExpression='blood_type = :blood_type AND #status = :status',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={
+                    ':key': key,
+                    ':blood_type': item['blood_type'],
+                    ':status': item['status']
+                }
+            )
+            updated += 1
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            raced += 1
+
+        if updated and updated % 1000 == 0:
+            print(f"  {updated} items updated...")
+
+    print(f"✓ Backfill: {updated} updated, {current} already current, "
+          f"{skipped} without blood_type/status, {raced} changed concurrently")
+    print(f"  Scan read {scan.scanned_count} items, {scan.consumed_capacity:.1f} RCU")
+
+
+def wait_for_index(client, table_name, index_name, poll_seconds=10):
+    """Block until a new GSI has finished backfilling"""
+    while True:
+        description = client.describe_table(TableName=table_name)['Table']
+        for index in description.get('GlobalSecondaryIndexes', []):
+            if index['IndexName'] == index_name and index['IndexStatus'] == 'ACTIVE':
+                return
+        time.sleep(poll_seconds)
+
+
+def add_indexes(client, table_name, wait=True):
+    """Create any of NEW_INDEXES the table lacks (DynamoDB builds one at a time)"""
+    description = client.describe_table(TableName=table_name)['Table']
+    existing = {index['IndexName'] for index in description.get('GlobalSecondaryIndexes', [])}
+    on_demand = description.get('BillingModeSummary', {}).get('BillingMode') == 'PAY_PER_REQUEST'
+
+    for index in NEW_INDEXES:
+        name = index['IndexName']
+        if name in existing:
+            print(f"⏭️  Skipping {name} (already exists)")
+            continue
+
+        create = dict(index)
+        if not on_demand:
+            create['ProvisionedThroughput'] = {'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
+
+        print(f"🔄 Creating {name}...")
+        client.update_table(
+            TableName=table_name,
+            AttributeDefinitions=ATTRIBUTE_DEFINITIONS,
+            GlobalSecondaryIndexUpdates=[{'Create': create}]
+        )
+        if wait or name != NEW_INDEXES[-1]['IndexName']:
+            wait_for_index(client, table_name, name)
+            print(f"✅ {name} is active")
+
+
+def migrate(table_name, segments=4, skip_backfill=False, skip_indexes=False, wait=True):
+    if DYNAMODB_ENDPOINT:
+        resource = boto3.resource('dynamodb', region_name=AWS_REGION, endpoint_url=DYNAMODB_ENDPOINT)
+    else:
+        resource = boto3.resource('dynamodb', region_name=AWS_REGION)
+    table = resource.Table(table_name)
+
+    if not skip_backfill:
+        print(f"🔄 Backfilling blood_type_status on {table_name}...")
+        backfill(table, segments)
+    if not skip_indexes:
+        add_indexes(resource.meta.client, table_name, wait)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--table', default='BloodBridge_BloodRequests')
+    parser.add_argument('--segments', type=int, default=4, help='parallel scan segments for the backfill')
+    parser.add_argument('--skip-backfill', action='store_true')
+    parser.add_argument('--skip-indexes', action='store_true')
+    parser.add_argument('--no-wait', action='store_true', help="don't wait for the last index to become active")
+    args = parser.parse_args()
+
+    print("BloodBridge - DynamoDB Migration Script")
+    print("=" * 50)
+    try:
+        migrate(args.table, args.segments, args.skip_backfill, args.skip_indexes, not args.no_wait)
+    except ClientError as e:
+        print(f"✗ Migration failed: {e}")
+        sys.exit(1)
+    print("\n✓ Migration complete!")
@@ -1,5 +1,13 @@
 from .auth_service import AuthService
 from .memory_db_service import InMemoryDBService
+from .inventory_cache import InventoryCache
+from .password_hasher import HashingUnavailable
+from .rate_limiter import RateLimiter, create_rate_limit_backend
+from .inventory_ops import InsufficientStock
+from .eligibility import next_eligible_at, parse_donation_date
+from .batch_eligibility import batch_eligibility
+from .fieldsets import REQUEST_FIELDS, INVENTORY_FIELDS, parse_fields, project
+from .compatibility import can_donate, compatible_recipients, compatible_donors, find_matching_requests, rank_requests
 
 # RDSService requires psycopg2 — import lazily in app.py
 # DynamoDBService requires boto3 — only available in AWS environments
@@ -13,4 +21,4 @@ try:
 except ImportError:
     DynamoDBService = None
 
-__all__ = ['AuthService', 'InMemoryDBService', 'RDSService', 'DynamoDBService']
+__all__ = ['AuthService', 'InMemoryDBService', 'InventoryCache', 'HashingUnavailable', 'RateLimiter', 'create_rate_limit_backend', 'InsufficientStock', 'next_eligible_at', 'parse_donation_date', 'batch_eligibility', 'REQUEST_FIELDS', 'INVENTORY_FIELDS', 'parse_fields', 'project', 'can_donate', 'compatible_recipients', 'compatible_donors', 'find_matching_requests', 'rank_requests', 'RDSService', 'DynamoDBService']
@@ -0,0 +1,33 @@
+"""
+Async Service Adapter
+Exposes a non-blocking sync service (InMemoryDBService) through the async interface
+"""
+import functools
+import inspect
+
+
+class AsyncServiceAdapter:
+    """Wraps every public method of a sync service in a coroutine
+
+    Only for services whose calls never block (the in-memory backend);
+    blocking services need a real async implementation such as AsyncRDSService.
+    """
+
+    def __init__(self, service):
+        self.service = service
+
+    def __getattr__(self, name):
+        attr = getattr(self.service, name)
+        if name.startswith('_') or not inspect.ismethod(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return attr(*args, **kwargs)
+        return call
+
+    async def initialize(self):
+        pass
+
+    async def close(self):
+        pass
@@ -0,0 +1,387 @@
+import asyncpg
+from config import Config
+from .connection_pool import per_worker_pool_size
+from .pagination import encode_cursor, decode_cursor
+from .eligibility import next_eligible_at
+from .fieldsets import USER_FIELDS, request_select_list, project
+from contextlib import asynccontextmanager
+import logging
+from datetime import datetime, timezone
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Columns stored as TIMESTAMP; asyncpg needs datetime objects for them
+TIMESTAMP_COLUMNS = {'last_donation', 'next_eligible_at', 'created_at', 'updated_at', 'fulfilled_at', 'last_updated'}
+
+
+def _to_timestamp(value):
+    """Convert an ISO string (as sent by clients) to a naive UTC datetime"""
+    if not isinstance(value, str):
+        return value
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _row(record):
+    """Convert an asyncpg Record to the dict shape RDSService returns"""
+    if record is None:
+        return None
+    return {
+        key: str(value) if isinstance(value, uuid.UUID) else value
+        for key, value in record.items()
+    }
+
+
+class AsyncRDSService:
+    """Async counterpart of RDSService on asyncpg, for the ASGI serving mode"""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.pool = None
+
+        # Stats
+        self._checkouts = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+
+    async def initialize(self):
+        """Create the asyncpg pool (must run inside the server's event loop)"""
+        try:
+            max_size = per_worker_pool_size(
+                self.config.DB_POOL_MAX_SIZE,
+                self.config.DB_POOL_TOTAL_CONNECTIONS,
+                self.config.WEB_CONCURRENCY
+            )
+            self.pool = await asyncpg.create_pool(
+                self.config.DATABASE_URL,
+                min_size=min(self.config.DB_POOL_MIN_SIZE, max_size),
+                max_size=max_size,
+                max_inactive_connection_lifetime=self.config.DB_POOL_MAX_LIFETIME
+            )
+            logger.info(f"Async database pool created successfully (max {max_size} connections)")
+        except Exception as e:
+            logger.error(f"Error creating async connection pool: {e}")
+            raise
+
+    async def close(self):
+        """Close all connections in the pool"""
+        if self.pool:
+            await self.pool.close()
+
+    @asynccontextmanager
+    async def connection(self):
+        """Acquire a pooled connection, waiting at most DB_POOL_TIMEOUT"""
+        start = time.monotonic()
+        async with self.pool.acquire(timeout=self.config.DB_POOL_TIMEOUT) as conn:
+            waited = time.monotonic() - start
+            self._checkouts += 1
+            self._wait_time += waited
+            self._max_wait = max(self._max_wait, waited)
+            yield conn
+
+    def get_pool_stats(self):
+        """Get connection pool statistics"""
+        if not self.pool:
+            return {}
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {
+            'size': size,
+            'min_size': self.pool.get_min_size(),
+            'max_size': self.pool.get_max_size(),
+            'in_use': size - idle,
+            'idle': idle,
+            'checkouts': self._checkouts,
+            'wait_time_total': round(self._wait_time, 6),
+            'wait_time_max': round(self._max_wait, 6)
+        }
+
+    # User operations
+    async def create_user(self, user_data):
+        """Create a new user"""
+        try:
+            async with self.connection() as conn:
+                user_id = str(uuid.uuid4())
+                query = """
+                    INSERT INTO users (user_id, name, email, password_hash, role, blood_type, phone, last_donation, next_eligible_at)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+                    RETURNING user_id
+                """
+                await conn.execute(
+                    query,
+                    user_id,
+                    user_data.get('name'),
+                    user_data.get('email'),
+                    user_data.get('password_hash'),
+                    user_data.get('role'),
+                    user_data.get('blood_type'),
+                    user_data.get('phone'),
+                    _to_timestamp(user_data.get('last_donation')),
+                    next_eligible_at(user_data.get('last_donation'), self.config.DONATION_INTERVAL_DAYS)
+                )
+                return user_id
+        except Exception as e:
+            logger.error(f"Error creating user: {e}")
+            return None
+
+    async def get_user_by_id(self, user_id):
+        """Get user by ID"""
+        try:
+            async with self.connection() as conn:
+                user = await conn.fetchrow("SELECT * FROM users WHERE user_id = $1", user_id)
+                return _row(user)
+        except Exception as e:
+            logger.error(f"Error getting user by ID: {e}")
+            return None
+
+    async def get_user_by_email(self, email, fields=None):
+        """Get user by email, only the given columns (USER_FIELDS) if fields is set"""
+        columns = "*"
+        if fields:
+            invalid = set(fields) - set(USER_FIELDS)
+            if invalid:
+                raise ValueError(f"Cannot select users columns: {', '.join(sorted(invalid))}")
+            columns = ", ".join(fields)
+        try:
+            async with self.connection() as conn:
+                user = await conn.fetchrow(f"SELECT {columns} FROM users WHERE email = $1", email)
+                return _row(user)
+        except Exception as e:
+            logger.error(f"Error getting user by email: {e}")
+            return None
+
+    async def update_user(self, user_id, update_data):
+        """Update user data"""
+        try:
+            # Keep the precomputed eligibility date in step with last_donation
+            if 'last_donation' in update_data:
+                update_data = dict(update_data, next_eligible_at=next_eligible_at(
+                    update_data['last_donation'], self.config.DONATION_INTERVAL_DAYS
+                ))
+
+            async with self.connection() as conn:
+                # Build dynamic UPDATE query
+                keys = list(update_data.keys())
+                set_clause = ", ".join([f"{key} = ${i}" for i, key in enumerate(keys, start=1)])
+                values = [
+                    _to_timestamp(update_data[key]) if key in TIMESTAMP_COLUMNS else update_data[key]
+                    for key in keys
+                ]
+                values.append(user_id)
+
+                query = f"UPDATE users SET {set_clause} WHERE user_id = ${len(values)}"
+                await conn.execute(query, *values)
+                return True
+        except Exception as e:
+            logger.error(f"Error updating user: {e}")
+            return False
+
+    # Blood request operations
+    async def create_request(self, request_data):
+        """Create a new blood request"""
+        try:
+            async with self.connection() as conn:
+                request_id = str(uuid.uuid4())
+                query = """
+                    INSERT INTO blood_requests
+                    (request_id, blood_type, quantity, urgency, status, hospital_name,
+                     patient_name, contact_number, notes, created_by)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+                    RETURNING request_id
+                """
+                await conn.execute(
+                    query,
+                    request_id,
+                    request_data.get('blood_type'),
+                    request_data.get('quantity'),
+                    request_data.get('urgency', 'normal'),
+                    request_data.get('status', 'open'),
+                    request_data.get('hospital_name'),
+                    request_data.get('patient_name'),
+                    request_data.get('contact_number'),
+                    request_data.get('notes'),
+                    request_data.get('created_by')
+                )
+                return request_id
+        except Exception as e:
+            logger.error(f"Error creating request: {e}")
+            return None
+
+    async def get_request_by_id(self, request_id):
+        """Get request by ID"""
+        try:
+            async with self.connection() as conn:
+                query = """
+                    SELECT r.*, u.name as created_by_name
+                    FROM blood_requests r
+                    LEFT JOIN users u ON r.created_by = u.user_id
+                    WHERE r.request_id = $1
+                """
+                return _row(await conn.fetchrow(query, request_id))
+        except Exception as e:
+            logger.error(f"Error getting request by ID: {e}")
+            return None
+
+    async def get_requests_by_blood_type(self, blood_type, status=None):
+        """Get requests by blood type"""
+        requests, _ = await self.get_requests_page(blood_type=blood_type, status=status)
+        return requests
+
+    async def get_requests_for_blood_types(self, blood_types, status=None):
+        """Get requests for several blood types in one indexed query"""
+        params = [list(blood_types)]
+        status_clause = ""
+        if status:
+            params.append(status)
+            status_clause = "AND r.status = $2"
+
+        try:
+            async with self.connection() as conn:
+                rows = await conn.fetch(f"""
+                    SELECT r.*, u.name as created_by_name
+                    FROM blood_requests r
+                    LEFT JOIN users u ON r.created_by = u.user_id
+                    WHERE r.blood_type = ANY($1::varchar[]) {status_clause}
+                    ORDER BY r.created_at DESC
+                """, *params)
+            return [_row(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error getting requests by blood types: {e}")
+            return []
+
+    async def get_all_requests(self, status=None):
+        """Get all requests, optionally filtered by status"""
+        requests, _ = await self.get_requests_page(status=status)
+        return requests
+
+    async def get_requests_page(self, blood_type=None, status=None, limit=None, cursor=None, fields=None):
+        """Get requests newest first, one keyset page at a time
+
+        fields limits the columns read; the users join is only made for
+        created_by_name.
+        Returns (requests, next_cursor); next_cursor is None on the last page.
+        Raises ValueError for a malformed cursor.
+        """
+        conditions = []
+        params = []
+
+        if blood_type:
+            params.append(blood_type)
+            conditions.append(f"r.blood_type = ${len(params)}")
+        if status:
+            params.append(status)
+            conditions.append(f"r.status = ${len(params)}")
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor)
+            params.extend([_to_timestamp(last_created_at), uuid.UUID(last_id)])
+            conditions.append(f"(r.created_at, r.request_id) < (${len(params) - 1}, ${len(params)})")
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        select_list, join_users = request_select_list(fields)
+        join_clause = "LEFT JOIN users u ON r.created_by = u.user_id" if join_users else ""
+        limit_clause = ""
+        if limit is not None:
+            # Fetch one extra row to know whether another page exists
+            params.append(limit + 1)
+            limit_clause = f"LIMIT ${len(params)}"
+
+        try:
+            async with self.connection() as conn:
+                query = f"""
+                    SELECT {select_list}
+                    FROM blood_requests r
+                    {join_clause}
+                    {where_clause}
+                    ORDER BY r.created_at DESC, r.request_id DESC
+                    {limit_clause}
+                """
+                rows = await conn.fetch(query, *params)
+
+            requests = [_row(row) for row in rows]
+            next_cursor = None
+            if limit is not None and len(requests) > limit:
+                requests = requests[:limit]
+                last = requests[-1]
+                next_cursor = encode_cursor([last['created_at'].isoformat(), last['request_id']])
+
+            if fields:
+                requests = [project(row, fields) for row in requests]
+            return requests, next_cursor
+        except Exception as e:
+            logger.error(f"Error getting requests page: {e}")
+            return [], None
+
+    async def update_request(self, request_id, update_data):
+        """Update request data"""
+        try:
+            async with self.connection() as conn:
+                # Build dynamic UPDATE query
+                keys = list(update_data.keys())
+                set_clause = ", ".join([f"{key} = ${i}" for i, key in enumerate(keys, start=1)])
+                values = [
+                    _to_timestamp(update_data[key]) if key in TIMESTAMP_COLUMNS else update_data[key]
+                    for key in keys
+                ]
+                values.append(request_id)
+
+                query = f"UPDATE blood_requests SET {set_clause} WHERE request_id = ${len(values)}"
+                await conn.execute(query, *values)
+                return True
+        except Exception as e:
+            logger.error(f"Error updating request: {e}")
+            return False
+
+    # Inventory operations
+    async def get_inventory(self, blood_type=None):
+        """Get inventory for specific blood type or all"""
+        try:
+            async with self.connection() as conn:
+                if blood_type:
+                    item = await conn.fetchrow("SELECT * FROM inventory WHERE blood_type = $1", blood_type)
+                    return _row(item)
+                items = await conn.fetch("SELECT * FROM inventory ORDER BY blood_type")
+                return [_row(item) for item in items]
+        except Exception as e:
+            logger.error(f"Error getting inventory: {e}")
+            return None if blood_type else []
+
+    async def update_inventory(self, blood_type, units_available, updated_by):
+        """Update inventory for a blood type"""
+        try:
+            async with self.connection() as conn:
+                query = """
+                    UPDATE inventory
+                    SET units_available = $1, last_updated = CURRENT_TIMESTAMP, updated_by = $2
+                    WHERE blood_type = $3
+                """
+                await conn.execute(query, units_available, updated_by, blood_type)
+                return True
+        except Exception as e:
+            logger.error(f"Error updating inventory: {e}")
+            return False
+
+    async def get_low_stock_items(self, threshold=5):
+        """Get blood types with low stock"""
+        try:
+            async with self.connection() as conn:
+                query = "SELECT * FROM inventory WHERE units_available < $1 ORDER BY units_available ASC"
+                items = await conn.fetch(query, threshold)
+                return [_row(item) for item in items]
+        except Exception as e:
+            logger.error(f"Error getting low stock items: {e}")
+            return []
+
+    # Health check
+    async def health_check(self):
+        """Check database connection health"""
+        try:
+            async with self.connection() as conn:
+                await conn.fetchval("SELECT 1")
+                return True
+        except Exception as e:
+            logger.error(f"Database health check failed: {e}")
+            return False
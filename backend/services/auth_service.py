@@ -1,7 +1,8 @@
 import jwt
-import bcrypt
 from datetime import datetime, timedelta
 from config import Config
+from .token_cache import TokenCache
+from .password_hasher import PasswordHasher
 
 class AuthService:
     """Service for authentication operations"""
@@ -10,16 +11,25 @@ class AuthService:
         self.config = config
         self.jwt_secret = config.JWT_SECRET_KEY
         self.token_expiry = config.JWT_ACCESS_TOKEN_EXPIRES
+        self.token_cache = TokenCache(config.JWT_CACHE_SIZE)
+        self.hasher = PasswordHasher(
+            rounds=config.BCRYPT_ROUNDS,
+            workers=config.BCRYPT_WORKERS,
+            max_queue=config.BCRYPT_MAX_QUEUE,
+            timeout=config.BCRYPT_TIMEOUT
+        )
     
     def hash_password(self, password: str) -> str:
-        """Hash a password using bcrypt"""
-        salt = bcrypt.gensalt(rounds=12)
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        """Hash a password using bcrypt (raises HashingUnavailable when overloaded)"""
+        return self.hasher.hash(password)
     
     def verify_password(self, password: str, hashed: str) -> bool:
-        """Verify a password against its hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+        """Verify a password against its hash (raises HashingUnavailable when overloaded)"""
+        return self.hasher.verify(password, hashed)
+    
+    def needs_rehash(self, hashed: str) -> bool:
+        """Check if a hash was made with fewer rounds than currently configured"""
+        return self.hasher.needs_rehash(hashed)
     
     def generate_token(self, user_id: str, email: str, role: str) -> str:
         """Generate a JWT token"""
@@ -35,8 +45,14 @@ class AuthService:
     
     def verify_token(self, token: str) -> dict:
         """Verify and decode a JWT token"""
+        # Tokens verified before are served from the cache until their exp
+        payload = self.token_cache.get(token)
+        if payload is not None:
+            return payload
+        
         try:
             payload = jwt.decode(token, self.jwt_secret, algorithms=['HS256'])
+            self.token_cache.put(token, payload)
             return payload
         except jwt.ExpiredSignatureError:
             return None
@@ -0,0 +1,88 @@
+"""
+Blood Compatibility
+ABO/Rh red cell compatibility table and donor-to-request matching
+"""
+from datetime import datetime
+
+BLOOD_TYPES = ['O-', 'O+', 'A-', 'A+', 'B-', 'B+', 'AB-', 'AB+']
+
+# Antigens carried on the red cells of each type
+_A, _B, _RH = 1, 2, 4
+_ANTIGENS = {
+    'O-': 0, 'O+': _RH,
+    'A-': _A, 'A+': _A | _RH,
+    'B-': _B, 'B+': _B | _RH,
+    'AB-': _A | _B, 'AB+': _A | _B | _RH
+}
+
+# Bit i set in RECIPIENT_MASKS[donor] means the donor can give to BLOOD_TYPES[i]:
+# a recipient accepts red cells carrying no antigen it lacks itself
+RECIPIENT_MASKS = {
+    donor: sum(
+        1 << i for i, recipient in enumerate(BLOOD_TYPES)
+        if not _ANTIGENS[donor] & ~_ANTIGENS[recipient]
+    )
+    for donor in BLOOD_TYPES
+}
+_BITS = {blood_type: 1 << i for i, blood_type in enumerate(BLOOD_TYPES)}
+_RECIPIENTS = {
+    donor: tuple(bt for bt in BLOOD_TYPES if mask & _BITS[bt])
+    for donor, mask in RECIPIENT_MASKS.items()
+}
+_DONORS = {
+    recipient: tuple(donor for donor in BLOOD_TYPES if RECIPIENT_MASKS[donor] & _BITS[recipient])
+    for recipient in BLOOD_TYPES
+}
+
+
+def can_donate(donor_type, recipient_type):
+    """True if donor_type red cells can be given to recipient_type"""
+    mask = RECIPIENT_MASKS.get(donor_type, 0)
+    return bool(mask & _BITS.get(recipient_type, 0))
+
+
+def compatible_recipients(donor_type):
+    """Recipient blood types a donor can serve (empty for unknown types)"""
+    return _RECIPIENTS.get(donor_type, ())
+
+
+def compatible_donors(recipient_type):
+    """Donor blood types a recipient can receive from (empty for unknown types)"""
+    return _DONORS.get(recipient_type, ())
+
+
+def _created(request):
+    created = request.get('created_at') or request.get('timestamp') or ''
+    return created.isoformat() if isinstance(created, datetime) else created
+
+
+def rank_requests(requests, donor_type, inventory):
+    """Order matches: high urgency first, then scarcest recipient stock, then oldest
+
+    inventory: list of inventory items (blood_type, units_available). Returns
+    copies annotated with exact_match and recipient_units_available.
+    """
+    units = {item['blood_type']: item.get('units_available', 0) for item in inventory or []}
+
+    ranked = []
+    for request in requests:
+        request = dict(request)
+        request['exact_match'] = request.get('blood_type') == donor_type
+        request['recipient_units_available'] = units.get(request.get('blood_type'))
+        ranked.append(request)
+
+    ranked.sort(key=lambda x: (
+        0 if x.get('urgency') == 'high' else 1,
+        x['recipient_units_available'] if x['recipient_units_available'] is not None else float('inf'),
+        _created(x)
+    ))
+    return ranked
+
+
+def find_matching_requests(db_service, donor_type, inventory):
+    """Open requests a donor can cover, one indexed lookup per compatible type"""
+    recipients = compatible_recipients(donor_type)
+    if not recipients:
+        return []
+    requests = db_service.get_requests_for_blood_types(recipients, status='open')
+    return rank_requests(requests, donor_type, inventory)
@@ -0,0 +1,250 @@
+"""
+Connection Pool
+Thread-safe, self-healing PostgreSQL connection pool used by RDSService
+"""
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+from collections import deque
+import threading
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(PoolError):
+    """Raised when no connection becomes available within the checkout timeout"""
+    pass
+
+
+class PoolExhausted(PoolError):
+    """Raised when the wait queue is already full"""
+    pass
+
+
+def per_worker_pool_size(max_size, total_connections, workers):
+    """Split a connection budget across gunicorn workers.
+
+    Every worker process builds its own pool, so a fixed per-process maximum
+    multiplies with the worker count. When a total budget is configured, each
+    worker gets an equal share of it, capped at max_size.
+    """
+    if not total_connections:
+        return max_size
+    share = total_connections // max(1, workers)
+    return max(1, min(max_size, share))
+
+
+class ManagedConnectionPool:
+    """Bounded connection pool with waiting checkouts, liveness checks and recycling"""
+
+    def __init__(self, dsn, min_size=1, max_size=20, timeout=5.0,
+                 max_lifetime=1800, max_waiters=100, check_on_checkout=True, cursor_factory=None):
+        if min_size > max_size:
+            raise ValueError("min_size cannot be larger than max_size")
+
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_waiters = max_waiters
+        self.check_on_checkout = check_on_checkout
+        self.cursor_factory = cursor_factory  # default for conn.cursor() on every connection
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()  # connections ready for checkout
+        self._created_at = {}  # id(conn) -> creation time, for every open connection
+        self._in_use = set()  # id(conn) of checked-out connections
+        self._pending = 0  # connections being opened outside the lock
+        self._waiters = 0
+        self._closed = False
+
+        # Stats
+        self._checkouts = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._rejected = 0
+        self._recycled = 0
+        self._discarded = 0
+
+        self._prewarm()
+
+    def _prewarm(self):
+        """Open min_size connections up front so the first requests don't pay for them"""
+        for _ in range(self.min_size):
+            conn = self._connect()
+            with self._cond:
+                self._idle.append(conn)
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn, cursor_factory=self.cursor_factory)
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    @property
+    def _size(self):
+        return len(self._created_at) + self._pending
+
+    def _expired(self, conn):
+        if not self.max_lifetime:
+            return False
+        created = self._created_at.get(id(conn), 0)
+        return time.monotonic() - created > self.max_lifetime
+
+    def _is_alive(self, conn):
+        """Check that a connection can still talk to the server"""
+        if conn.closed:
+            return False
+        if not self.check_on_checkout:
+            return True
+        try:
+            cursor = conn.cursor(cursor_factory=extensions.cursor)  # not a query worth recording
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        """Close a connection and forget about it (lock must be held)"""
+        self._created_at.pop(id(conn), None)
+        self._in_use.discard(id(conn))
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._cond.notify()
+
+    def getconn(self, timeout=None):
+        """Check out a connection, waiting up to timeout seconds for one to free up"""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        with self._cond:
+            if self._closed:
+                raise PoolError("connection pool is closed")
+
+            waiting = False
+            try:
+                while True:
+                    while self._idle:
+                        conn = self._idle.pop()
+                        if self._expired(conn):
+                            self._recycled += 1
+                            self._discard(conn)
+                            continue
+                        self._in_use.add(id(conn))
+                        break
+                    else:
+                        conn = None
+
+                    if conn is not None:
+                        break
+
+                    if self._size < self.max_size:
+                        self._pending += 1
+                        break
+
+                    if not waiting:
+                        if self._waiters >= self.max_waiters:
+                            self._rejected += 1
+                            raise PoolExhausted("connection pool wait queue is full")
+                        self._waiters += 1
+                        waiting = True
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"no connection available within {timeout:.1f}s"
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                if waiting:
+                    self._waiters -= 1
+
+        if conn is None:
+            # A slot was reserved above; open the connection outside the lock
+            try:
+                conn = self._connect()
+            finally:
+                with self._cond:
+                    self._pending -= 1
+                    if conn is None:
+                        self._cond.notify()
+            with self._cond:
+                self._in_use.add(id(conn))
+        elif not self._is_alive(conn):
+            logger.warning("Discarding dead database connection")
+            with self._cond:
+                self._discarded += 1
+                self._discard(conn)
+            return self.getconn(max(0.0, deadline - time.monotonic()))
+
+        waited = time.monotonic() - start
+        with self._cond:
+            self._checkouts += 1
+            self._wait_time += waited
+            self._max_wait = max(self._max_wait, waited)
+        return conn
+
+    def putconn(self, conn, close=False):
+        """Return a connection to the pool"""
+        with self._cond:
+            if id(conn) not in self._in_use:
+                raise PoolError("trying to put unkeyed connection")
+
+        if not close and not conn.closed:
+            status = conn.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                close = True
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    close = True
+
+        with self._cond:
+            self._in_use.discard(id(conn))
+            if close or conn.closed or self._closed:
+                self._discarded += 1
+                self._discard(conn)
+            elif self._expired(conn):
+                self._recycled += 1
+                self._discard(conn)
+            else:
+                self._idle.append(conn)
+                self._cond.notify()
+
+    def closeall(self):
+        """Close every idle connection and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._cond.notify_all()
+
+    def stats(self):
+        """Return a snapshot of pool counters"""
+        with self._cond:
+            return {
+                'size': len(self._created_at),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'waiting': self._waiters,
+                'checkouts': self._checkouts,
+                'wait_time_total': round(self._wait_time, 6),
+                'wait_time_max': round(self._max_wait, 6),
+                'timeouts': self._timeouts,
+                'rejected': self._rejected,
+                'recycled': self._recycled,
+                'discarded': self._discarded
+            }
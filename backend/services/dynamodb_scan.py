@@ -0,0 +1,116 @@
+"""
+DynamoDB Scan
+Fully paginated, optionally parallel (Segment/TotalSegments) table scans
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Pages buffered per segment before workers wait for the consumer
+_PAGES_PER_SEGMENT = 2
+
+
+class TableScan:
+    """Iterate every item of a table scan, following LastEvaluatedKey
+
+    With segments > 1 each segment is scanned by its own thread and items
+    stream back as pages arrive (in no particular order). Scans go through
+    the table's client, which unlike the resource is thread-safe and still
+    converts values to and from Python types.
+
+    After iteration consumed_capacity holds the read capacity units used,
+    with pages, count (items returned) and scanned_count (items read
+    before FilterExpression).
+    """
+
+    def __init__(self, table, segments=1, **params):
+        self.client = table.meta.client
+        self.table_name = table.name
+        self.segments = max(1, int(segments))
+        self.params = params
+
+        self.consumed_capacity = 0.0
+        self.pages = 0
+        self.count = 0
+        self.scanned_count = 0
+        self._lock = threading.Lock()
+
+    def _request(self, segment):
+        request = dict(self.params, TableName=self.table_name, ReturnConsumedCapacity='TOTAL')
+        if self.segments > 1:
+            request['Segment'] = segment
+            request['TotalSegments'] = self.segments
+        return request
+
+    def _pages(self, segment, stop=None):
+        """Scan one segment, yielding the items of each page"""
+        request = self._request(segment)
+        while stop is None or not stop.is_set():
+            response = self.client.scan(**request)
+            with self._lock:
+                self.pages += 1
+                self.count += response.get('Count', 0)
+                self.scanned_count += response.get('ScannedCount', 0)
+                self.consumed_capacity += response.get('ConsumedCapacity', {}).get('CapacityUnits', 0)
+
+            yield response.get('Items', [])
+
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return
+            request['ExclusiveStartKey'] = last_key
+
+    @staticmethod
+    def _put(pages, value, stop):
+        """Queue value for the consumer unless it has stopped listening"""
+        while not stop.is_set():
+            try:
+                pages.put(value, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _scan_segment(self, segment, pages, stop):
+        try:
+            for items in self._pages(segment, stop):
+                self._put(pages, items, stop)
+        except Exception as e:
+            self._put(pages, e, stop)
+        finally:
+            self._put(pages, None, stop)
+
+    def _parallel(self):
+        pages = queue.Queue(maxsize=self.segments * _PAGES_PER_SEGMENT)
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.segments, thread_name_prefix='dynamodb-scan') as pool:
+            for segment in range(self.segments):
+                pool.submit(self._scan_segment, segment, pages, stop)
+            try:
+                remaining = self.segments
+                while remaining:
+                    items = pages.get()
+                    if items is None:
+                        remaining -= 1
+                    elif isinstance(items, Exception):
+                        raise items
+                    else:
+                        yield from items
+            finally:
+                # Consumer finished or gave up early: let waiting workers exit
+                stop.set()
+
+    def __iter__(self):
+        if self.segments == 1:
+            for items in self._pages(0):
+                yield from items
+        else:
+            yield from self._parallel()
+
+        logger.debug(
+            f"Scanned {self.table_name}: {self.count} items "
+            f"({self.scanned_count} read) in {self.pages} pages, "
+            f"{self.segments} segments, {self.consumed_capacity:.1f} RCU"
+        )
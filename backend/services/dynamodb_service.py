@@ -1,6 +1,29 @@
 import boto3
 from botocore.exceptions import ClientError
 from config import Config
+from .pagination import encode_cursor, decode_cursor
+from .dynamodb_scan import TableScan
+from .inventory_ops import fold_inventory_updates, bulk_results, InsufficientStock
+from .fieldsets import project
+from .eligibility import next_eligible_at, format_timestamp, eligibility_key, split_eligibility_key, public_donor
+
+BLOOD_TYPES = ['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']
+
+
+def blood_type_status_key(blood_type, status):
+    """Partition key of BloodTypeStatusIndex"""
+    return f"{blood_type}#{status}"
+
+
+def projection_params(attributes):
+    """ProjectionExpression (and its name placeholders) reading only attributes
+    
+    Every name is a placeholder since many (status, timestamp, name) are
+    reserved words.
+    """
+    names = {f"#p{i}": attribute for i, attribute in enumerate(attributes)}
+    return {'ProjectionExpression': ", ".join(names), 'ExpressionAttributeNames': names}
+
 
 class DynamoDBService:
     """Service for DynamoDB operations"""
@@ -28,10 +51,23 @@ class DynamoDBService:
         self.requests_table = self.dynamodb.Table(config.REQUESTS_TABLE)
         self.inventory_table = self.dynamodb.Table(config.INVENTORY_TABLE)
     
+    def _eligibility_fields(self, user_id, last_donation):
+        """next_eligible_at plus the EligibilityIndex sort key"""
+        next_eligible = next_eligible_at(last_donation, getattr(self.config, 'DONATION_INTERVAL_DAYS', 90))
+        return {
+            'next_eligible_at': format_timestamp(next_eligible),
+            'eligible_key': eligibility_key(next_eligible, user_id)
+        }
+    
     # User operations
     def create_user(self, user_data):
         """Create a new user"""
         try:
+            # Only donors get an eligible_key, so EligibilityIndex stays sparse
+            if user_data.get('role') == 'donor':
+                user_data = dict(user_data, **self._eligibility_fields(
+                    user_data['user_id'], user_data.get('last_donation')
+                ))
             self.users_table.put_item(Item=user_data)
             return True
         except ClientError as e:
@@ -47,13 +83,14 @@ class DynamoDBService:
             print(f"Error getting user: {e}")
             return None
     
-    def get_user_by_email(self, email):
-        """Get user by email using GSI"""
+    def get_user_by_email(self, email, fields=None):
+        """Get user by email using GSI (only fields, if given)"""
         try:
             response = self.users_table.query(
                 IndexName='EmailIndex',
                 KeyConditionExpression='email = :email',
-                ExpressionAttributeValues={':email': email}
+                ExpressionAttributeValues={':email': email},
+                **(projection_params(fields) if fields else {})
             )
             items = response.get('Items', [])
             return items[0] if items else None
@@ -64,6 +101,9 @@ class DynamoDBService:
     def update_user(self, user_id, update_data):
         """Update user data"""
         try:
+            if 'last_donation' in update_data:
+                update_data = dict(update_data, **self._eligibility_fields(user_id, update_data['last_donation']))
+            
             update_expression = "SET " + ", ".join([f"{k} = :{k}" for k in update_data.keys()])
             expression_values = {f":{k}": v for k, v in update_data.items()}
             
@@ -77,11 +117,111 @@ class DynamoDBService:
             print(f"Error updating user: {e}")
             return False
     
+    def get_donor_columns(self, blood_types=None, user_ids=None):
+        """Get user_id, blood_type and last_donation of donors as parallel lists
+        
+        Reads user_ids with BatchGetItem (100 keys per call), otherwise a
+        paginated scan projecting only the three attributes.
+        """
+        columns = {'user_id': [], 'blood_type': [], 'last_donation': []}
+        projection = {
+            'ProjectionExpression': 'user_id, blood_type, last_donation, #role',
+            'ExpressionAttributeNames': {'#role': 'role'}
+        }
+        
+        try:
+            items = []
+            if user_ids:
+                keys = [{'user_id': user_id} for user_id in dict.fromkeys(user_ids)]
+                for start in range(0, len(keys), 100):
+                    request_items = {self.users_table.name: dict(projection, Keys=keys[start:start + 100])}
+                    while request_items:
+                        response = self.dynamodb.batch_get_item(RequestItems=request_items)
+                        items.extend(response.get('Responses', {}).get(self.users_table.name, []))
+                        request_items = response.get('UnprocessedKeys')
+            else:
+                params = dict(projection, FilterExpression='#role = :donor', ExpressionAttributeValues={':donor': 'donor'})
+                while True:
+                    response = self.users_table.scan(**params)
+                    items.extend(response.get('Items', []))
+                    if 'LastEvaluatedKey' not in response:
+                        break
+                    params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            print(f"Error reading donor columns: {e}")
+            return columns
+        
+        for item in items:
+            if item.get('role') != 'donor':
+                continue
+            if blood_types and item.get('blood_type') not in blood_types:
+                continue
+            columns['user_id'].append(item['user_id'])
+            columns['blood_type'].append(item.get('blood_type'))
+            columns['last_donation'].append(item.get('last_donation'))
+        return columns
+    
+    def _query_eligible(self, blood_type, after, upper, limit):
+        """Read up to limit donors of one blood type from EligibilityIndex, past after"""
+        params = {
+            'IndexName': 'EligibilityIndex',
+            'KeyConditionExpression': 'blood_type = :blood_type AND eligible_key BETWEEN :lower AND :upper',
+            'FilterExpression': '#role = :donor',
+            'ExpressionAttributeNames': {'#role': 'role'},
+            'ExpressionAttributeValues': {
+                ':blood_type': blood_type,
+                ':lower': after or '0',
+                ':upper': upper,
+                ':donor': 'donor'
+            }
+        }
+        
+        items = []
+        while True:
+            # BETWEEN is inclusive, so the cursor's own item may come back once
+            params['Limit'] = limit - len(items) + 1
+            response = self.users_table.query(**params)
+            items.extend(item for item in response.get('Items', []) if item['eligible_key'] != after)
+            
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key or len(items) >= limit:
+                return items[:limit]
+            params['ExclusiveStartKey'] = last_key
+    
+    def get_eligible_donors(self, blood_types, eligible_at, limit, cursor=None):
+        """Get donors of the given blood types eligible by eligible_at
+        
+        One EligibilityIndex query per blood type, merged by eligible_key.
+        Returns (donors, next_cursor); raises ValueError for a malformed cursor.
+        """
+        after = None
+        if cursor:
+            after = decode_cursor(cursor)
+            split_eligibility_key(after)
+        upper = eligibility_key(eligible_at, '\uffff')
+        
+        try:
+            items = []
+            for blood_type in blood_types:
+                items.extend(self._query_eligible(blood_type, after, upper, limit + 1))
+        except ClientError as e:
+            print(f"Error querying eligible donors: {e}")
+            return [], None
+        
+        items.sort(key=lambda x: x['eligible_key'])
+        donors = [public_donor(item) for item in items[:limit]]
+        if len(items) <= limit:
+            return donors, None
+        return donors, encode_cursor(items[limit - 1]['eligible_key'])
+    
     # Blood request operations
     def create_request(self, request_data):
         """Create a new blood request"""
         try:
-            self.requests_table.put_item(Item=request_data)
+            item = dict(request_data)
+            if item.get('blood_type') and item.get('status'):
+                item['blood_type_status'] = blood_type_status_key(item['blood_type'], item['status'])
+            self.requests_table.put_item(Item=item)
             return True
         except ClientError as e:
             print(f"Error creating request: {e}")
@@ -96,56 +236,203 @@ class DynamoDBService:
             print(f"Error getting request: {e}")
             return None
     
+    def _request_partitions(self, blood_type=None, status=None):
+        """(index, key attribute, key value) of each index partition holding a listing
+        
+        Every filter combination maps to key conditions, so queries never read
+        items only to discard them. Without filters the listing is a merge of
+        the BloodTypeIndex partitions.
+        """
+        if blood_type and status:
+            return [('BloodTypeStatusIndex', 'blood_type_status', blood_type_status_key(blood_type, status))]
+        if blood_type:
+            return [('BloodTypeIndex', 'blood_type', blood_type)]
+        if status:
+            return [('StatusIndex', 'status', status)]
+        return [('BloodTypeIndex', 'blood_type', bt) for bt in BLOOD_TYPES]
+    
+    def _query_partition(self, index, attribute, value, limit=None, start_key=None, attributes=None):
+        """Query one index partition newest first until limit items are read
+        
+        attributes, if given, are the only ones read (ProjectionExpression).
+        """
+        params = {
+            'IndexName': index,
+            'KeyConditionExpression': '#key = :key',
+            'ExpressionAttributeNames': {'#key': attribute},
+            'ExpressionAttributeValues': {':key': value},
+            'ScanIndexForward': False
+        }
+        if attributes:
+            projection = projection_params(attributes)
+            params['ProjectionExpression'] = projection['ProjectionExpression']
+            params['ExpressionAttributeNames'].update(projection['ExpressionAttributeNames'])
+        if start_key:
+            params['ExclusiveStartKey'] = start_key
+        
+        items = []
+        while True:
+            if limit is not None:
+                params['Limit'] = limit - len(items)
+            response = self.requests_table.query(**params)
+            items.extend(response.get('Items', []))
+            
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key or (limit is not None and len(items) >= limit):
+                return items
+            params['ExclusiveStartKey'] = last_key
+    
     def get_requests_by_blood_type(self, blood_type, status=None):
-        """Get requests by blood type using GSI"""
+        """Get requests by blood type (and status) newest first"""
         try:
-            if status:
-                response = self.requests_table.query(
-                    IndexName='BloodTypeIndex',
-                    KeyConditionExpression='blood_type = :blood_type',
-                    FilterExpression='#status = :status',
-                    ExpressionAttributeNames={'#status': 'status'},
-                    ExpressionAttributeValues={
-                        ':blood_type': blood_type,
-                        ':status': status
-                    }
-                )
-            else:
-                response = self.requests_table.query(
-                    IndexName='BloodTypeIndex',
-                    KeyConditionExpression='blood_type = :blood_type',
-                    ExpressionAttributeValues={':blood_type': blood_type}
-                )
-            return response.get('Items', [])
+            [partition] = self._request_partitions(blood_type, status)
+            return self._query_partition(*partition)
+        except ClientError as e:
+            print(f"Error querying requests: {e}")
+            return []
+    
+    def get_requests_for_blood_types(self, blood_types, status=None):
+        """Get requests for several blood types, one index query per type"""
+        try:
+            requests = []
+            for blood_type in blood_types:
+                [partition] = self._request_partitions(blood_type, status)
+                requests.extend(self._query_partition(*partition))
+            return requests
         except ClientError as e:
             print(f"Error querying requests: {e}")
             return []
     
+    def scan_requests(self, status=None, segments=None):
+        """Scan every request, optionally filtered by status
+        
+        Returns a TableScan: iterate it to stream items (segments > 1 scans
+        in parallel threads), then read consumed_capacity for the call.
+        """
+        if segments is None:
+            segments = getattr(self.config, 'DYNAMODB_SCAN_SEGMENTS', 1)
+        params = {}
+        if status:
+            params['FilterExpression'] = '#status = :status'
+            params['ExpressionAttributeNames'] = {'#status': 'status'}
+            params['ExpressionAttributeValues'] = {':status': status}
+        return TableScan(self.requests_table, segments=segments, **params)
+    
     def get_all_requests(self, status=None):
-        """Get all requests, optionally filtered by status"""
+        """Get all requests; with a status this is a StatusIndex query, newest first"""
         try:
             if status:
-                response = self.requests_table.scan(
-                    FilterExpression='#status = :status',
-                    ExpressionAttributeNames={'#status': 'status'},
-                    ExpressionAttributeValues={':status': status}
-                )
-            else:
-                response = self.requests_table.scan()
-            return response.get('Items', [])
+                [partition] = self._request_partitions(status=status)
+                return self._query_partition(*partition)
+            return list(self.scan_requests())
         except ClientError as e:
             print(f"Error scanning requests: {e}")
             return []
     
+    def get_requests_page(self, blood_type=None, status=None, limit=None, cursor=None, fields=None):
+        """Get requests newest first, one keyset page at a time
+        
+        The filters select one or more index partitions (_request_partitions).
+        The cursor holds the LastEvaluatedKey-shaped position reached in every
+        partition, so an unfiltered listing is a merge of one query per partition.
+        fields limits the attributes read and returned.
+        Returns (requests, next_cursor); next_cursor is None on the last page.
+        """
+        positions = decode_cursor(cursor) if cursor else {}
+        if not isinstance(positions, dict):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        
+        partitions = self._request_partitions(blood_type, status)
+        fetch = limit + 1 if limit is not None else None
+        
+        # timestamp and request_id order the merge and make up the cursor
+        attributes = list(dict.fromkeys(['timestamp', 'request_id', *fields])) if fields else None
+        
+        try:
+            results = []
+            for index, attribute, value in partitions:
+                items = self._query_partition(index, attribute, value, fetch, positions.get(value), attributes)
+                results.extend((value, item) for item in items)
+        except ClientError as e:
+            print(f"Error querying requests page: {e}")
+            return [], None
+        
+        # Stable sort keeps each partition's own order for equal timestamps
+        results.sort(key=lambda x: x[1].get('timestamp', ''), reverse=True)
+        
+        next_cursor = None
+        if limit is not None and len(results) > limit:
+            results = results[:limit]
+            key_attributes = {value: attribute for _, attribute, value in partitions}
+            for value, item in results:
+                positions[value] = {
+                    'request_id': item['request_id'],
+                    key_attributes[value]: value,
+                    'timestamp': item['timestamp']
+                }
+            next_cursor = encode_cursor(positions)
+        
+        if fields:
+            return [project(item, fields) for _, item in results], next_cursor
+        return [item for _, item in results], next_cursor
+    
+    def iter_requests(self, blood_type=None, status=None, fetch_size=1000):
+        """Yield requests one page at a time without loading them all
+        
+        With a blood type or status this pages through the matching index
+        partition newest first; otherwise it is a paginated table scan in
+        DynamoDB's (unordered) order. Errors are raised so a failed export
+        can't pass for a complete one.
+        """
+        params = {'Limit': fetch_size}
+        if blood_type or status:
+            [(index, attribute, value)] = self._request_partitions(blood_type, status)
+            params['IndexName'] = index
+            params['KeyConditionExpression'] = '#key = :key'
+            params['ExpressionAttributeNames'] = {'#key': attribute}
+            params['ExpressionAttributeValues'] = {':key': value}
+            params['ScanIndexForward'] = False
+            read_page = self.requests_table.query
+        else:
+            read_page = self.requests_table.scan
+        
+        try:
+            while True:
+                response = read_page(**params)
+                yield from response.get('Items', [])
+                
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    return
+                params['ExclusiveStartKey'] = last_key
+        except ClientError as e:
+            print(f"Error streaming requests: {e}")
+            raise
+    
     def update_request(self, request_id, update_data):
-        """Update request data"""
+        """Update request data, keeping blood_type_status in step with status"""
         try:
-            update_expression = "SET " + ", ".join([f"{k} = :{k}" for k in update_data.keys()])
+            update_data = dict(update_data)
+            if 'status' in update_data or 'blood_type' in update_data:
+                current = self.requests_table.get_item(
+                    Key={'request_id': request_id},
+                    ProjectionExpression='blood_type, #status',
+                    ExpressionAttributeNames={'#status': 'status'}
+                ).get('Item', {})
+                blood_type = update_data.get('blood_type', current.get('blood_type'))
+                status = update_data.get('status', current.get('status'))
+                if blood_type and status:
+                    update_data['blood_type_status'] = blood_type_status_key(blood_type, status)
+            
+            # Attribute names as placeholders: status is a DynamoDB reserved word
+            update_expression = "SET " + ", ".join([f"#{k} = :{k}" for k in update_data.keys()])
+            expression_names = {f"#{k}": k for k in update_data.keys()}
             expression_values = {f":{k}": v for k, v in update_data.items()}
             
             self.requests_table.update_item(
                 Key={'request_id': request_id},
                 UpdateExpression=update_expression,
+                ExpressionAttributeNames=expression_names,
                 ExpressionAttributeValues=expression_values
             )
             return True
@@ -161,8 +448,7 @@ class DynamoDBService:
                 response = self.inventory_table.get_item(Key={'blood_type': blood_type})
                 return response.get('Item')
             else:
-                response = self.inventory_table.scan()
-                return response.get('Items', [])
+                return list(TableScan(self.inventory_table))
         except ClientError as e:
             print(f"Error getting inventory: {e}")
             return None if blood_type else []
@@ -171,25 +457,140 @@ class DynamoDBService:
         """Update inventory for a blood type"""
         try:
             from datetime import datetime
-            self.inventory_table.put_item(Item={
-                'blood_type': blood_type,
-                'units_available': units_available,
-                'last_updated': datetime.utcnow().isoformat(),
-                'updated_by': updated_by
-            })
+            self.inventory_table.update_item(
+                Key={'blood_type': blood_type},
+                UpdateExpression='SET units_available = :units, last_updated = :now, updated_by = :updated_by',
+                ExpressionAttributeValues={
+                    ':units': units_available,
+                    ':now': datetime.utcnow().isoformat(),
+                    ':updated_by': updated_by
+                }
+            )
             return True
         except ClientError as e:
             print(f"Error updating inventory: {e}")
             return False
     
+    def adjust_inventory(self, blood_type, delta, updated_by):
+        """Atomically add delta (negative to issue units) to a blood type
+        
+        A single ADD with a condition keeping the level >= 0; the new level
+        comes back in the same call.
+        Returns the new units_available, or None for an unknown blood type or error.
+        Raises InsufficientStock if the result would be below zero.
+        """
+        from datetime import datetime
+        try:
+            response = self.inventory_table.update_item(
+                Key={'blood_type': blood_type},
+                UpdateExpression='ADD units_available :delta SET last_updated = :now, updated_by = :updated_by',
+                ConditionExpression='attribute_exists(blood_type) AND units_available >= :floor',
+                ExpressionAttributeValues={
+                    ':delta': delta,
+                    ':floor': -delta,
+                    ':now': datetime.utcnow().isoformat(),
+                    ':updated_by': updated_by
+                },
+                ReturnValues='UPDATED_NEW',
+                ReturnValuesOnConditionCheckFailure='ALL_OLD'
+            )
+            return int(response['Attributes']['units_available'])
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                previous = e.response.get('Item')
+                if previous:
+                    raise InsufficientStock(
+                        f"Only {previous['units_available']['N']} units of {blood_type} available"
+                    )
+                return None
+            print(f"Error adjusting inventory: {e}")
+            return None
+    
+    def bulk_update_inventory(self, updates, updated_by):
+        """Apply several {blood_type, units_available | delta} changes atomically
+        
+        Uses one TransactWriteItems call; deltas are applied server-side with a
+        condition that keeps units_available from going below zero.
+        Returns (success, per-item results); nothing is applied if any item
+        fails. success is None when the database failed rather than an item.
+        """
+        from datetime import datetime
+        folded = fold_inventory_updates(updates)
+        now = datetime.utcnow().isoformat()
+        
+        failed = {}
+        actions = []
+        for blood_type, (absolute, delta) in folded.items():
+            values = {':now': now, ':updated_by': updated_by}
+            if absolute is not None:
+                if absolute + delta < 0:
+                    failed[blood_type] = 'Insufficient units'
+                    continue
+                update_expression = 'SET units_available = :units, last_updated = :now, updated_by = :updated_by'
+                condition = 'attribute_exists(blood_type)'
+                values[':units'] = absolute + delta
+            else:
+                update_expression = 'SET units_available = units_available + :delta, last_updated = :now, updated_by = :updated_by'
+                condition = 'attribute_exists(blood_type) AND units_available >= :floor'
+                values[':delta'] = delta
+                values[':floor'] = -delta
+            actions.append((blood_type, {'Update': {
+                'TableName': self.inventory_table.name,
+                'Key': {'blood_type': blood_type},
+                'UpdateExpression': update_expression,
+                'ConditionExpression': condition,
+                'ExpressionAttributeValues': values
+            }}))
+        
+        if failed:
+            return False, bulk_results(updates, {}, failed)
+        
+        try:
+            self.dynamodb.meta.client.transact_write_items(
+                TransactItems=[action for _, action in actions]
+            )
+        except ClientError as e:
+            reasons = e.response.get('CancellationReasons', [])
+            for (blood_type, _), reason in zip(actions, reasons):
+                if reason.get('Code') == 'ConditionalCheckFailed':
+                    failed[blood_type] = 'Insufficient units or unknown blood type'
+            if not failed:
+                print(f"Error bulk updating inventory: {e}")
+                return None, bulk_results(updates, {}, {blood_type: 'Database error' for blood_type in folded})
+            return False, bulk_results(updates, {}, failed)
+        
+        # Read back the committed levels
+        try:
+            response = self.dynamodb.batch_get_item(RequestItems={
+                self.inventory_table.name: {
+                    'Keys': [{'blood_type': blood_type} for blood_type in folded],
+                    'ConsistentRead': True
+                }
+            })
+            items = response.get('Responses', {}).get(self.inventory_table.name, [])
+            levels = {item['blood_type']: int(item['units_available']) for item in items}
+        except ClientError as e:
+            print(f"Error reading inventory after bulk update: {e}")
+            levels = {}
+        return True, bulk_results(updates, levels, {})
+    
     def get_low_stock_items(self, threshold=5):
         """Get blood types with low stock"""
         try:
-            response = self.inventory_table.scan(
+            return list(TableScan(
+                self.inventory_table,
                 FilterExpression='units_available < :threshold',
                 ExpressionAttributeValues={':threshold': threshold}
-            )
-            return response.get('Items', [])
+            ))
         except ClientError as e:
             print(f"Error getting low stock items: {e}")
             return []
+    
+    # Change versions (conditional GET)
+    def get_table_version(self, table):
+        """No change counter is kept in DynamoDB; routes fall back to body ETags"""
+        return None
+    
+    def get_request_version(self, request_id):
+        """No per-item version is kept in DynamoDB; routes fall back to body ETags"""
+        return None
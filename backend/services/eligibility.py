@@ -0,0 +1,61 @@
+"""
+Donor Eligibility
+Precomputed next_eligible_at values and helpers for eligible-donor search
+"""
+from datetime import datetime, date, timedelta, timezone
+
+# Stored as next_eligible_at for donors who have never donated, so every
+# donor has a sortable value (DynamoDB GSIs skip items missing the sort key)
+NEVER_DONATED = datetime(1970, 1, 1)
+
+# Fields returned by eligible-donor search (never password_hash)
+DONOR_FIELDS = ['user_id', 'name', 'email', 'phone', 'blood_type', 'last_donation', 'next_eligible_at']
+
+
+def parse_donation_date(value):
+    """Parse a last_donation value (ISO string, date or datetime) to naive UTC"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def next_eligible_at(last_donation, interval_days):
+    """When a donor may next donate (NEVER_DONATED if they never have)"""
+    last_donation = parse_donation_date(last_donation)
+    if last_donation is None:
+        return NEVER_DONATED
+    return last_donation + timedelta(days=interval_days)
+
+
+def format_timestamp(value):
+    """Fixed-width ISO text so string order matches time order"""
+    return value.isoformat(timespec='microseconds')
+
+
+def eligibility_key(next_eligible, user_id):
+    """Unique sort key for a donor in eligibility order (also the DynamoDB GSI sort key)"""
+    if isinstance(next_eligible, datetime):
+        next_eligible = format_timestamp(next_eligible)
+    return f"{next_eligible}#{user_id}"
+
+
+def split_eligibility_key(key):
+    """Inverse of eligibility_key; raises ValueError for anything else"""
+    if not isinstance(key, str) or key.count('#') != 1:
+        raise ValueError(f"Invalid eligibility key: {key!r}")
+    next_eligible, user_id = key.split('#')
+    return datetime.fromisoformat(next_eligible), user_id
+
+
+def public_donor(user):
+    """Project a user row to DONOR_FIELDS"""
+    donor = {field: user.get(field) for field in DONOR_FIELDS}
+    if not donor['last_donation']:
+        donor['next_eligible_at'] = None
+    return donor
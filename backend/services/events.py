@@ -0,0 +1,293 @@
+"""
+Change Events
+In-process pub/sub for the /api/events Server-Sent Events feed, fed by the
+in-memory backend directly or by Postgres LISTEN/NOTIFY (see
+migrations/005_change_notifications.sql)
+"""
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from collections import deque
+from queue import Queue, Empty, Full
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel written by the Postgres triggers
+EVENTS_CHANNEL = 'bloodbridge_events'
+
+# Fields carried by request events; the triggers send the same set
+REQUEST_EVENT_FIELDS = ['request_id', 'blood_type', 'quantity', 'urgency', 'status', 'hospital_name']
+INVENTORY_EVENT_FIELDS = ['blood_type', 'units_available', 'last_updated']
+
+# Sent when a subscriber may have missed events and should refetch state
+RESYNC = 'resync'
+
+# Types a client may narrow the feed to with ?types=
+EVENT_TYPES = {'inventory.updated', 'request.created', 'request.updated'}
+
+
+def request_event(request):
+    """Payload of a request.created / request.updated event"""
+    return {field: request.get(field) for field in REQUEST_EVENT_FIELDS}
+
+
+def inventory_event(item):
+    """Payload of an inventory.updated event"""
+    return {field: item.get(field) for field in INVENTORY_EVENT_FIELDS}
+
+
+class Event:
+    """One published change, encoded as an SSE message once for all subscribers"""
+
+    __slots__ = ('seq', 'id', 'type', 'data', 'text')
+
+    def __init__(self, seq, event_id, event_type, data):
+        self.seq = seq
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+        payload = json.dumps(data, default=str, separators=(',', ':'))
+        self.text = f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """One SSE client's bounded queue of pending events"""
+
+    queue_class = asyncio.Queue
+
+    def __init__(self, broker, types, queue_size):
+        self.broker = broker
+        self.types = types
+        self.queue = self.queue_class(maxsize=queue_size)
+        self.last_seq = 0
+
+    def deliver(self, event):
+        """Queue an event (on the broker's loop); never blocks"""
+        if event.type != RESYNC:
+            if event.seq <= self.last_seq:
+                return  # already queued by the replay
+            self.last_seq = event.seq
+            if self.types and event.type not in self.types:
+                return
+
+        try:
+            self.queue.put_nowait(event)
+        except (asyncio.QueueFull, Full):
+            # Too far behind: swap the backlog for one resync so memory stays bounded
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(self.broker.resync_event())
+            self.broker.overflows += 1
+
+    async def get(self, timeout=None):
+        """Next event, or None if nothing arrived within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class ThreadSubscription(Subscription):
+    """A subscriber read by a blocking (WSGI) stream instead of a coroutine
+
+    Events are delivered from the publishing thread, under the broker's lock.
+    """
+
+    queue_class = Queue
+
+    def get(self, timeout=None):
+        """Next event, or None if nothing arrived within timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+
+class EventBroker:
+    """Fans change events out to SSE subscribers on the server's event loop
+
+    publish() is thread-safe and never blocks. Every subscriber is just a
+    bounded asyncio.Queue, so idle clients cost no worker or thread. Event
+    ids are "<broker epoch>-<sequence>": a reconnecting client's
+    Last-Event-ID is replayed from the recent history if it came from this
+    broker and is still covered, otherwise the client gets a resync event.
+
+    subscribe_blocking() serves the Flask app, which has no event loop: its
+    subscribers are fed synchronously by publish() instead.
+    """
+
+    def __init__(self, history_size=1000, queue_size=100):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.queue_size = queue_size
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._thread_subscribers = set()
+        self._seq = 0
+        self._loop = None
+        # Reentrant: a thread subscriber that overflows asks for a resync event while it is held
+        self._lock = threading.RLock()
+
+        self.published = 0
+        self.overflows = 0
+
+    def _event(self, event_type, data):
+        self._seq += 1
+        return Event(self._seq, f"{self.epoch}-{self._seq}", event_type, data)
+
+    def resync_event(self):
+        """A resync marker (not kept in history)"""
+        with self._lock:
+            return Event(self._seq, f"{self.epoch}-{self._seq}", RESYNC, {})
+
+    def publish(self, event_type, data):
+        """Record an event and deliver it to every subscriber"""
+        with self._lock:
+            event = self._event(event_type, data)
+            if event_type != RESYNC:
+                self._history.append(event)
+            self.published += 1
+            loop = self._loop
+            # In order, before the next publish can take a sequence number
+            for subscription in self._thread_subscribers:
+                subscription.deliver(event)
+
+        if loop is None:
+            return event
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is loop:
+            self._fanout(event)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._fanout, event)
+            except RuntimeError:
+                pass  # loop closed during shutdown
+        return event
+
+    def _fanout(self, event):
+        for subscription in list(self._subscribers):
+            subscription.deliver(event)
+
+    def _parse_event_id(self, event_id):
+        epoch, _, seq = (event_id or '').partition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def subscribe(self, last_event_id=None, types=None):
+        """Register a subscriber (call from the server's event loop)"""
+        subscription = Subscription(self, set(types) if types else None, self.queue_size)
+
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            history = list(self._history)
+            current = self._seq
+            self._subscribers.add(subscription)
+
+        self._replay(subscription, last_event_id, history, current)
+        return subscription
+
+    def subscribe_blocking(self, last_event_id=None, types=None):
+        """Register a ThreadSubscription (any thread)"""
+        subscription = ThreadSubscription(self, set(types) if types else None, self.queue_size)
+
+        # Replayed under the lock so no live event can overtake the history
+        with self._lock:
+            self._replay(subscription, last_event_id, list(self._history), self._seq)
+            self._thread_subscribers.add(subscription)
+        return subscription
+
+    def _replay(self, subscription, last_event_id, history, current):
+        if last_event_id:
+            seq = self._parse_event_id(last_event_id)
+            oldest = history[0].seq if history else current + 1
+            if seq is None or seq > current or seq < oldest - 1:
+                subscription.deliver(self.resync_event())
+            else:
+                for event in history:
+                    if event.seq > seq:
+                        subscription.deliver(event)
+        subscription.last_seq = max(subscription.last_seq, current)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+            self._thread_subscribers.discard(subscription)
+
+    def stats(self):
+        return {
+            'subscribers': len(self._subscribers) + len(self._thread_subscribers),
+            'published': self.published,
+            'overflows': self.overflows
+        }
+
+
+class PostgresChangeListener:
+    """Relays NOTIFY payloads on EVENTS_CHANNEL into an EventBroker
+
+    Holds one dedicated asyncpg connection per process (LISTEN needs a
+    session, so not a pooled one) and reconnects after losing it, then
+    publishes a resync since notifications sent meanwhile are lost.
+    """
+
+    def __init__(self, dsn, broker, retry_seconds=5):
+        self.dsn = dsn
+        self.broker = broker
+        self.retry_seconds = retry_seconds
+        self.connected = False
+        self._task = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            message = json.loads(payload)
+            self.broker.publish(message['type'], message['data'])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring malformed change notification: {e}")
+
+    async def _listen(self):
+        import asyncpg
+
+        reconnecting = False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(EVENTS_CHANNEL, self._on_notify)
+                self.connected = True
+                logger.info(f"Listening for change notifications on {EVENTS_CHANNEL}")
+                if reconnecting:
+                    self.broker.publish(RESYNC, {})
+                await lost.wait()
+                logger.warning("Change notification connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Change notification listener failed: {e}")
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            reconnecting = True
+            await asyncio.sleep(self.retry_seconds)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
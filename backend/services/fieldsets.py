@@ -0,0 +1,65 @@
+"""
+Sparse Fieldsets
+Fields the request and inventory listings may be narrowed to with ?fields=,
+and projection of rows to the selected fields
+"""
+
+# Every request field some backend stores: PostgreSQL rows have created_at,
+# patient_name etc., in-memory and DynamoDB items timestamp and location
+REQUEST_FIELDS = (
+    'request_id', 'blood_type', 'quantity', 'urgency', 'status', 'hospital_name',
+    'patient_name', 'contact_number', 'location', 'notes', 'created_by', 'created_by_name',
+    'timestamp', 'created_at', 'updated_at', 'fulfilled_at'
+)
+
+# PostgreSQL select list entry per request field (r = blood_requests, u = users)
+REQUEST_COLUMNS = {
+    column: f"r.{column}" for column in (
+        'request_id', 'blood_type', 'quantity', 'urgency', 'status', 'hospital_name', 'patient_name',
+        'contact_number', 'notes', 'created_by', 'created_at', 'updated_at', 'fulfilled_at'
+    )
+}
+REQUEST_COLUMNS['created_by_name'] = "u.name as created_by_name"
+
+# Columns get_user_by_email can be narrowed to (login is the only caller needing password_hash)
+USER_FIELDS = (
+    'user_id', 'name', 'email', 'password_hash', 'role', 'blood_type', 'phone',
+    'last_donation', 'next_eligible_at', 'created_at', 'updated_at'
+)
+
+# inventory table columns
+INVENTORY_COLUMNS = ('blood_type', 'units_available', 'last_updated', 'updated_by')
+
+# Inventory rows as served by InventoryCache, stock flags included
+INVENTORY_FIELDS = ('blood_type', 'units_available', 'last_updated', 'updated_by', 'is_low_stock', 'stock_status')
+
+
+def parse_fields(value, allowed):
+    """Field names from a comma-separated ?fields= value, or None for all
+
+    Raises ValueError for names outside allowed or an empty selection.
+    """
+    if value is None:
+        return None
+    fields = [field for field in dict.fromkeys(part.strip() for part in value.split(',')) if field]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if not fields:
+        raise ValueError("No fields selected")
+    return fields
+
+
+def request_select_list(fields):
+    """(select list, users join needed) for a PostgreSQL request listing
+
+    The keyset columns created_at and request_id are always selected, since
+    the next cursor is built from them.
+    """
+    selected = dict.fromkeys(['created_at', 'request_id', *(fields or REQUEST_COLUMNS)])
+    return ", ".join(REQUEST_COLUMNS[field] for field in selected if field in REQUEST_COLUMNS), 'created_by_name' in selected
+
+
+def project(item, fields):
+    """A dict of item's values for fields (those it has); works on records too"""
+    return {field: item[field] for field in fields if field in item}
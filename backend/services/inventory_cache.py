@@ -0,0 +1,239 @@
+"""
+Inventory Cache
+Process-wide read cache for the inventory table with write-through invalidation
+"""
+import asyncio
+import json
+import threading
+import time
+from hashlib import sha1
+
+BLOOD_TYPE_ORDER = ['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']
+
+
+def stock_status(units, config):
+    """Classify a stock level against the configured thresholds"""
+    if units < config['CRITICAL_STOCK_THRESHOLD']:
+        return 'critical'
+    if units < config['LOW_STOCK_THRESHOLD']:
+        return 'low'
+    return 'good'
+
+
+class _Snapshot:
+    """One cache fill: annotated, sorted inventory plus derived views"""
+
+    def __init__(self, items, config, ttl, version=None):
+        annotated = []
+        for item in items:
+            item = dict(item)
+            units = item.get('units_available', 0)
+            item['stock_status'] = stock_status(units, config)
+            item['is_low_stock'] = units < config['LOW_STOCK_THRESHOLD']
+            annotated.append(item)
+
+        annotated.sort(key=lambda x: BLOOD_TYPE_ORDER.index(x['blood_type'])
+                       if x['blood_type'] in BLOOD_TYPE_ORDER else 999)
+
+        self.items = annotated
+        self.by_type = {item['blood_type']: item for item in annotated}
+        self.low_stock = {}  # threshold -> low stock list
+        self.expires_at = time.monotonic() + ttl
+
+        # Validators for conditional GETs: the table version read before the
+        # rows, or a digest of the rows when the backend keeps no version
+        if version:
+            self.version, self.last_modified = version
+        else:
+            self.version = sha1(json.dumps(annotated, sort_keys=True, default=str).encode()).hexdigest()
+            self.last_modified = None
+
+    def low_stock_items(self, threshold):
+        """Items below threshold, lowest first, with severity (memoised per threshold)"""
+        low_stock = self.low_stock.get(threshold)
+        if low_stock is None:
+            low_stock = []
+            for item in self.items:
+                if item.get('units_available', 0) < threshold:
+                    item = dict(item)
+                    item['severity'] = 'critical' if item['stock_status'] == 'critical' else 'low'
+                    low_stock.append(item)
+            low_stock.sort(key=lambda x: x.get('units_available', 0))
+            self.low_stock[threshold] = low_stock
+        return low_stock
+
+
+class _Fill:
+    """A cache fill in progress that concurrent readers can wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.snapshot = None
+
+
+class InventoryCache:
+    """Caches get_inventory/get_low_stock_items and invalidates on update_inventory
+
+    Each gunicorn worker keeps its own cache, so a write made through another
+    worker becomes visible here once the TTL runs out.
+    """
+
+    def __init__(self, db_service, config):
+        self.db_service = db_service
+        self.config = config
+        self.ttl = config.get('INVENTORY_CACHE_TTL', 5)
+
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._fill = None
+        self._generation = 0
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+
+    def _get_snapshot(self):
+        """Return a fresh snapshot, loading it once for all concurrent misses"""
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot and snapshot.expires_at > time.monotonic():
+                self.hits += 1
+                return snapshot
+
+            self.misses += 1
+            fill = self._fill
+            leader = fill is None
+            if leader:
+                fill = self._fill = _Fill()
+                generation = self._generation
+
+        if not leader:
+            fill.event.wait(self.config.get('DB_POOL_TIMEOUT', 5))
+            if fill.snapshot:
+                return fill.snapshot
+            return self._load()
+
+        try:
+            fill.snapshot = self._load()
+        finally:
+            with self._lock:
+                # Only keep the result if no write invalidated it meanwhile
+                if fill.snapshot and generation == self._generation:
+                    self._snapshot = fill.snapshot
+                self._fill = None
+            fill.event.set()
+        return fill.snapshot
+
+    def _load(self):
+        # Version first: a write landing in between then only costs a refetch
+        version = self.db_service.get_table_version('inventory')
+        items = self.db_service.get_inventory() or []
+        snapshot = _Snapshot(items, self.config, self.ttl, version)
+        if not items:
+            # Don't cache an empty table; it is almost always a DB error
+            snapshot.expires_at = 0
+        return snapshot
+
+    def invalidate(self):
+        """Drop the cached inventory"""
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+
+    def get_snapshot(self):
+        """Get the current snapshot: items plus version/last_modified (shared, do not mutate)"""
+        return self._get_snapshot()
+
+    def get_inventory(self, blood_type=None):
+        """Get annotated inventory for a blood type or all (shared, do not mutate)"""
+        snapshot = self._get_snapshot()
+        if blood_type:
+            return snapshot.by_type.get(blood_type)
+        return snapshot.items
+
+    def get_low_stock_items(self, threshold=5):
+        """Get annotated blood types below threshold, lowest first (shared, do not mutate)"""
+        return self._get_snapshot().low_stock_items(threshold)
+
+    def update_inventory(self, blood_type, units_available, updated_by):
+        """Write through to the database and invalidate"""
+        try:
+            return self.db_service.update_inventory(blood_type, units_available, updated_by)
+        finally:
+            self.invalidate()
+
+    def adjust_inventory(self, blood_type, delta, updated_by):
+        """Write a delta through to the database and invalidate"""
+        try:
+            return self.db_service.adjust_inventory(blood_type, delta, updated_by)
+        finally:
+            self.invalidate()
+
+    def bulk_update_inventory(self, updates, updated_by):
+        """Write a batch through to the database and invalidate"""
+        try:
+            return self.db_service.bulk_update_inventory(updates, updated_by)
+        finally:
+            self.invalidate()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'ttl': self.ttl}
+
+
+class AsyncInventoryCache(InventoryCache):
+    """InventoryCache for the ASGI app, loading through an async db service"""
+
+    async def _get_snapshot(self):
+        snapshot = self._snapshot
+        if snapshot and snapshot.expires_at > time.monotonic():
+            self.hits += 1
+            return snapshot
+
+        self.misses += 1
+        if self._fill is not None:
+            # Another coroutine is already loading; share its result
+            return await asyncio.shield(self._fill)
+
+        generation = self._generation
+        fill = self._fill = asyncio.get_running_loop().create_future()
+        try:
+            items = await self.db_service.get_inventory() or []
+            snapshot = _Snapshot(items, self.config, self.ttl)
+            if not items:
+                snapshot.expires_at = 0
+            elif generation == self._generation:
+                self._snapshot = snapshot
+            fill.set_result(snapshot)
+            return snapshot
+        except asyncio.CancelledError:
+            fill.cancel()
+            raise
+        except Exception as e:
+            fill.set_exception(e)
+            fill.exception()  # waiters still see it; avoids "never retrieved" warnings
+            raise
+        finally:
+            self._fill = None
+
+    def invalidate(self):
+        """Drop the cached inventory"""
+        self._snapshot = None
+        self._generation += 1
+
+    async def get_inventory(self, blood_type=None):
+        """Get annotated inventory for a blood type or all (shared, do not mutate)"""
+        snapshot = await self._get_snapshot()
+        if blood_type:
+            return snapshot.by_type.get(blood_type)
+        return snapshot.items
+
+    async def get_low_stock_items(self, threshold=5):
+        """Get annotated blood types below threshold, lowest first (shared, do not mutate)"""
+        return (await self._get_snapshot()).low_stock_items(threshold)
+
+    async def update_inventory(self, blood_type, units_available, updated_by):
+        """Write through to the database and invalidate"""
+        try:
+            return await self.db_service.update_inventory(blood_type, units_available, updated_by)
+        finally:
+            self.invalidate()
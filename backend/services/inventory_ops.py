@@ -0,0 +1,52 @@
+"""
+Inventory Operations
+Helpers shared by the database services for batched inventory changes
+"""
+from collections import OrderedDict
+
+
+class InsufficientStock(Exception):
+    """Raised when a decrement would take units_available below zero"""
+    pass
+
+
+def fold_inventory_updates(updates):
+    """Collapse a list of {blood_type, units_available | delta} entries
+
+    Entries are applied in order, so for each blood type only the last
+    absolute value matters and later deltas are summed on top of it.
+    Returns OrderedDict blood_type -> (absolute or None, delta).
+    """
+    folded = OrderedDict()
+    for update in updates:
+        blood_type = update['blood_type']
+        absolute, delta = folded.get(blood_type, (None, 0))
+        if update.get('units_available') is not None:
+            absolute, delta = int(update['units_available']), 0
+        else:
+            delta += int(update.get('delta', 0))
+        folded[blood_type] = (absolute, delta)
+    return folded
+
+
+def bulk_results(updates, levels, failed):
+    """Build per-item results for a bulk update
+
+    levels: blood_type -> units available after the batch (when committed)
+    failed: blood_type -> error message for the types that caused a rollback
+    """
+    committed = not failed
+    results = []
+    for update in updates:
+        blood_type = update['blood_type']
+        result = {'blood_type': blood_type}
+        if blood_type in failed:
+            result['status'] = 'failed'
+            result['error'] = failed[blood_type]
+        elif committed:
+            result['status'] = 'updated'
+            result['units_available'] = levels.get(blood_type)
+        else:
+            result['status'] = 'not_applied'
+        results.append(result)
+    return results
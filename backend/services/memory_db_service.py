@@ -3,20 +3,48 @@ In-Memory Database Service
 A simple replacement for DynamoDB for local testing without Docker
 """
 from datetime import datetime
+from .pagination import encode_cursor, decode_cursor
+from .memory_records import UserRecord, RequestRecord
+from .inventory_ops import fold_inventory_updates, bulk_results, InsufficientStock
+from .eligibility import next_eligible_at, format_timestamp, eligibility_key, split_eligibility_key, public_donor
+from .events import request_event, inventory_event
+from .fieldsets import project
+from bisect import bisect_left, bisect_right, insort
+import threading
 import uuid
 
 class InMemoryDBService:
     """Service for in-memory database operations (replaces DynamoDB for testing)"""
     
-    def __init__(self, config):
+    def __init__(self, config, compact=None):
         self.config = config
         
+        # Compact mode stores users/requests as slotted records instead of dicts
+        self.compact = getattr(config, 'MEMORY_DB_COMPACT', False) if compact is None else compact
+        
         # In-memory storage
         self.users = {}  # user_id -> user_data
         self.users_by_email = {}  # email -> user_id
         self.requests = {}  # request_id -> request_data
         self.inventory = {}  # blood_type -> inventory_data
         
+        # Secondary indexes: (blood_type, status) -> sorted [(timestamp, request_id)]
+        # None acts as a wildcard, so (None, None) orders every request,
+        # (bt, None) a blood type, (None, st) a status and (bt, st) the pair
+        self.request_index = {}
+        self.stock_index = []  # sorted [(units_available, blood_type)]
+        self.donor_index = {}  # blood_type -> sorted eligibility keys of donors
+        self._lock = threading.RLock()
+        
+        # Optional EventBroker for /api/events; changes are published under the
+        # lock so subscribers see them in commit order
+        self.events = None
+        
+        # Change versions for conditional GETs: table -> (version, modified),
+        # plus the version of each request's last write
+        self.table_versions = {table: (0, datetime.utcnow()) for table in ('blood_requests', 'inventory')}
+        self.request_versions = {}
+        
         # Initialize inventory with all blood types
         self._initialize_inventory()
     
@@ -30,6 +58,87 @@ class InMemoryDBService:
                 'last_updated': datetime.utcnow().isoformat(),
                 'updated_by': 'system'
             }
+            insort(self.stock_index, (10, blood_type))
+    
+    # Record storage
+    def _store(self, record_class, data):
+        """Wrap incoming data in the storage layout"""
+        return record_class(data) if self.compact else data
+    
+    def _load(self, record):
+        """Return a stored record in the dict shape callers expect"""
+        if record is None or not self.compact:
+            return record
+        return record.to_dict()
+    
+    def _load_fields(self, record, fields):
+        """Like _load, but only fields (when set), read without materialising the record"""
+        if record is None or not fields:
+            return self._load(record)
+        return project(record, fields)
+    
+    # Index maintenance
+    @staticmethod
+    def _index_keys(request):
+        blood_type = request.get('blood_type')
+        status = request.get('status')
+        return [(None, None), (blood_type, None), (None, status), (blood_type, status)]
+    
+    @staticmethod
+    def _sort_key(request):
+        return (request.get('timestamp') or '', request.get('request_id') or '')
+    
+    def _index_request(self, request):
+        """Add a request to every secondary index"""
+        entry = self._sort_key(request)
+        for key in self._index_keys(request):
+            insort(self.request_index.setdefault(key, []), entry)
+    
+    def _unindex_request(self, request):
+        """Remove a request from every secondary index"""
+        entry = self._sort_key(request)
+        for key in self._index_keys(request):
+            index = self.request_index.get(key, [])
+            position = bisect_left(index, entry)
+            if position < len(index) and index[position] == entry:
+                del index[position]
+    
+    def _indexed_requests(self, blood_type=None, status=None):
+        """Requests matching the filters, oldest first, straight from an index"""
+        index = self.request_index.get((blood_type, status), [])
+        return [self._load(self.requests[request_id]) for _, request_id in index]
+    
+    def _bump_version(self, table):
+        version = (self.table_versions[table][0] + 1, datetime.utcnow())
+        self.table_versions[table] = version
+        return version
+    
+    def _publish(self, event_type, data):
+        if self.events is not None:
+            self.events.publish(event_type, data)
+    
+    def _donor_entry(self, user):
+        """(blood_type, eligibility key) for a donor, None for anyone else"""
+        if user.get('role') != 'donor' or not user.get('blood_type'):
+            return None
+        return user.get('blood_type'), eligibility_key(user.get('next_eligible_at'), user.get('user_id'))
+    
+    def _index_donor(self, user):
+        entry = self._donor_entry(user)
+        if entry:
+            insort(self.donor_index.setdefault(entry[0], []), entry[1])
+    
+    def _unindex_donor(self, user):
+        entry = self._donor_entry(user)
+        if entry:
+            index = self.donor_index.get(entry[0], [])
+            position = bisect_left(index, entry[1])
+            if position < len(index) and index[position] == entry[1]:
+                del index[position]
+    
+    def _eligibility_fields(self, last_donation):
+        interval_days = getattr(self.config, 'DONATION_INTERVAL_DAYS', 90)
+        return {'next_eligible_at': format_timestamp(next_eligible_at(last_donation, interval_days))}
     
     # User operations
     def create_user(self, user_data):
@@ -38,12 +147,16 @@ class InMemoryDBService:
             user_id = user_data.get('user_id')
             email = user_data.get('email')
             
-            # Check if email already exists
-            if email in self.users_by_email:
-                return False
-            
-            self.users[user_id] = user_data
-            self.users_by_email[email] = user_id
+            with self._lock:
+                # Check if email already exists
+                if email in self.users_by_email:
+                    return False
+                
+                user_data = dict(user_data, **self._eligibility_fields(user_data.get('last_donation')))
+                user = self._store(UserRecord, user_data)
+                self.users[user_id] = user
+                self.users_by_email[email] = user_id
+                self._index_donor(user)
             return True
         except Exception as e:
             print(f"Error creating user: {e}")
@@ -51,36 +164,104 @@ class InMemoryDBService:
     
     def get_user_by_id(self, user_id):
         """Get user by ID"""
-        return self.users.get(user_id)
+        return self._load(self.users.get(user_id))
     
-    def get_user_by_email(self, email):
-        """Get user by email"""
+    def get_user_by_email(self, email, fields=None):
+        """Get user by email (only fields, if given)"""
         user_id = self.users_by_email.get(email)
         if user_id:
-            return self.users.get(user_id)
+            return self._load_fields(self.users.get(user_id), fields)
         return None
     
     def update_user(self, user_id, update_data):
         """Update user data"""
         try:
-            if user_id not in self.users:
-                return False
-            
-            # Update user data
-            for key, value in update_data.items():
-                self.users[user_id][key] = value
+            with self._lock:
+                if user_id not in self.users:
+                    return False
+                
+                if 'last_donation' in update_data:
+                    update_data = dict(update_data, **self._eligibility_fields(update_data['last_donation']))
+                
+                # Re-index if the donor's position in eligibility order changes
+                user = self.users[user_id]
+                reindex = any(key in update_data for key in ('role', 'blood_type', 'next_eligible_at'))
+                if reindex:
+                    self._unindex_donor(user)
+                
+                # Update user data
+                user.update(update_data)
+                
+                if reindex:
+                    self._index_donor(user)
             
             return True
         except Exception as e:
             print(f"Error updating user: {e}")
             return False
     
+    def get_donor_columns(self, blood_types=None, user_ids=None):
+        """Get user_id, blood_type and last_donation of donors as parallel lists"""
+        columns = {'user_id': [], 'blood_type': [], 'last_donation': []}
+        with self._lock:
+            if user_ids:
+                users = [self.users[user_id] for user_id in user_ids if user_id in self.users]
+            else:
+                users = list(self.users.values())
+        
+        for user in users:
+            if user.get('role') != 'donor':
+                continue
+            if blood_types and user.get('blood_type') not in blood_types:
+                continue
+            columns['user_id'].append(user.get('user_id'))
+            columns['blood_type'].append(user.get('blood_type'))
+            columns['last_donation'].append(user.get('last_donation'))
+        return columns
+    
+    def get_eligible_donors(self, blood_types, eligible_at, limit, cursor=None):
+        """Get donors of the given blood types eligible by eligible_at
+        
+        Bisects each blood type's sorted eligibility keys, then merges.
+        Returns (donors, next_cursor); raises ValueError for a malformed cursor.
+        """
+        after = None
+        if cursor:
+            after = decode_cursor(cursor)
+            split_eligibility_key(after)
+        upper = eligibility_key(eligible_at, '\uffff')
+        
+        with self._lock:
+            keys = []
+            for blood_type in blood_types:
+                index = self.donor_index.get(blood_type, [])
+                start = bisect_right(index, after) if after else 0
+                end = min(bisect_right(index, upper), start + limit + 1)
+                keys.extend(index[start:end])
+            keys.sort()
+            
+            donors = [
+                public_donor(self._load(self.users[key.split('#')[1]]))
+                for key in keys[:limit]
+            ]
+        
+        if len(keys) <= limit:
+            return donors, None
+        return donors, encode_cursor(keys[limit - 1])
+    
     # Blood request operations
     def create_request(self, request_data):
         """Create a new blood request"""
         try:
             request_id = request_data.get('request_id')
-            self.requests[request_id] = request_data
+            with self._lock:
+                if request_id in self.requests:
+                    self._unindex_request(self.requests[request_id])
+                record = self._store(RequestRecord, request_data)
+                self.requests[request_id] = record
+                self._index_request(record)
+                self.request_versions[request_id] = self._bump_version('blood_requests')
+                self._publish('request.created', request_event(record))
             return True
         except Exception as e:
             print(f"Error creating request: {e}")
@@ -88,37 +269,91 @@ class InMemoryDBService:
     
     def get_request_by_id(self, request_id):
         """Get request by ID"""
-        return self.requests.get(request_id)
+        return self._load(self.requests.get(request_id))
     
     def get_requests_by_blood_type(self, blood_type, status=None):
         """Get requests by blood type"""
-        results = []
-        for request in self.requests.values():
-            if request.get('blood_type') == blood_type:
-                if status is None or request.get('status') == status:
-                    results.append(request)
-        return results
+        with self._lock:
+            return self._indexed_requests(blood_type, status)
+    
+    def get_requests_for_blood_types(self, blood_types, status=None):
+        """Get requests for several blood types, one index lookup per type"""
+        with self._lock:
+            requests = []
+            for blood_type in blood_types:
+                requests.extend(self._indexed_requests(blood_type, status))
+            return requests
     
     def get_all_requests(self, status=None):
         """Get all requests, optionally filtered by status"""
         if status is None:
-            return list(self.requests.values())
+            return [self._load(request) for request in self.requests.values()]
+        
+        with self._lock:
+            return self._indexed_requests(None, status)
+    
+    def get_requests_page(self, blood_type=None, status=None, limit=None, cursor=None, fields=None):
+        """Get requests newest first, one keyset page at a time
+
+        fields limits each request to those keys.
+        Returns (requests, next_cursor); next_cursor is None on the last page.
+        """
+        with self._lock:
+            index = self.request_index.get((blood_type or None, status or None), [])
+            
+            # Index is ascending, so the page is read backwards from the cursor
+            end = len(index)
+            if cursor:
+                last_timestamp, last_id = decode_cursor(cursor)
+                end = bisect_left(index, (last_timestamp, last_id))
+            start = 0 if limit is None else max(0, end - limit)
+            
+            entries = index[start:end][::-1]
+            page = [self._load_fields(self.requests[request_id], fields) for _, request_id in entries]
         
-        results = []
-        for request in self.requests.values():
-            if request.get('status') == status:
-                results.append(request)
-        return results
+        if start == 0:
+            return page, None
+        return page, encode_cursor(list(entries[-1]))
+    
+    def iter_requests(self, blood_type=None, status=None, fetch_size=1000):
+        """Yield requests newest first, fetch_size at a time
+        
+        The lock is only held while each chunk is copied out, and the next
+        chunk is located by bisecting from the last position seen.
+        """
+        position = None
+        while True:
+            with self._lock:
+                index = self.request_index.get((blood_type or None, status or None), [])
+                end = len(index) if position is None else bisect_left(index, position)
+                entries = index[max(0, end - fetch_size):end][::-1]
+                chunk = [self._load(self.requests[request_id]) for _, request_id in entries]
+            
+            yield from chunk
+            if len(entries) < fetch_size:
+                return
+            position = entries[-1]
     
     def update_request(self, request_id, update_data):
         """Update request data"""
         try:
-            if request_id not in self.requests:
-                return False
-            
-            # Update request data
-            for key, value in update_data.items():
-                self.requests[request_id][key] = value
+            with self._lock:
+                if request_id not in self.requests:
+                    return False
+                
+                # Re-index if a sorted or indexed field changes
+                request = self.requests[request_id]
+                reindex = any(key in update_data for key in ('blood_type', 'status', 'timestamp'))
+                if reindex:
+                    self._unindex_request(request)
+                
+                # Update request data
+                request.update(update_data)
+                
+                if reindex:
+                    self._index_request(request)
+                self.request_versions[request_id] = self._bump_version('blood_requests')
+                self._publish('request.updated', request_event(request))
             
             return True
         except Exception as e:
@@ -136,24 +371,90 @@ class InMemoryDBService:
     def update_inventory(self, blood_type, units_available, updated_by):
         """Update inventory for a blood type"""
         try:
-            self.inventory[blood_type] = {
-                'blood_type': blood_type,
-                'units_available': units_available,
-                'last_updated': datetime.utcnow().isoformat(),
-                'updated_by': updated_by
-            }
+            with self._lock:
+                previous = self.inventory.get(blood_type)
+                if previous:
+                    entry = (previous['units_available'], blood_type)
+                    position = bisect_left(self.stock_index, entry)
+                    if position < len(self.stock_index) and self.stock_index[position] == entry:
+                        del self.stock_index[position]
+                
+                self.inventory[blood_type] = {
+                    'blood_type': blood_type,
+                    'units_available': units_available,
+                    'last_updated': datetime.utcnow().isoformat(),
+                    'updated_by': updated_by
+                }
+                insort(self.stock_index, (units_available, blood_type))
+                self._bump_version('inventory')
+                
+                if not previous or previous['units_available'] != units_available:
+                    self._publish('inventory.updated', inventory_event(self.inventory[blood_type]))
             return True
         except Exception as e:
             print(f"Error updating inventory: {e}")
             return False
     
+    def adjust_inventory(self, blood_type, delta, updated_by):
+        """Atomically add delta (negative to issue units) to a blood type
+        
+        Returns the new units_available, or None for an unknown blood type.
+        Raises InsufficientStock if the result would be below zero.
+        """
+        with self._lock:
+            item = self.inventory.get(blood_type)
+            if item is None:
+                return None
+            
+            units = item['units_available'] + delta
+            if units < 0:
+                raise InsufficientStock(f"Only {item['units_available']} units of {blood_type} available")
+            
+            self.update_inventory(blood_type, units, updated_by)
+            return units
+    
+    def bulk_update_inventory(self, updates, updated_by):
+        """Apply several {blood_type, units_available | delta} changes atomically
+        
+        Returns (success, per-item results); nothing is applied if any item fails.
+        """
+        folded = fold_inventory_updates(updates)
+        levels = {}
+        failed = {}
+        
+        with self._lock:
+            for blood_type, (absolute, delta) in folded.items():
+                item = self.inventory.get(blood_type)
+                if item is None:
+                    failed[blood_type] = 'Unknown blood type'
+                    continue
+                
+                base = item['units_available'] if absolute is None else absolute
+                if base + delta < 0:
+                    failed[blood_type] = 'Insufficient units'
+                    continue
+                levels[blood_type] = base + delta
+            
+            if not failed:
+                for blood_type, units in levels.items():
+                    self.update_inventory(blood_type, units, updated_by)
+        
+        return not failed, bulk_results(updates, levels, failed)
+    
     def get_low_stock_items(self, threshold=5):
         """Get blood types with low stock"""
-        results = []
-        for item in self.inventory.values():
-            if item.get('units_available', 0) < threshold:
-                results.append(item)
-        return results
+        with self._lock:
+            end = bisect_left(self.stock_index, (threshold,))
+            return [self.inventory[blood_type] for _, blood_type in self.stock_index[:end]]
+    
+    # Change versions (conditional GET)
+    def get_table_version(self, table):
+        """Get (version, modified) of a table, or None"""
+        return self.table_versions.get(table)
+    
+    def get_request_version(self, request_id):
+        """Get (version, modified) of one request, or None"""
+        return self.request_versions.get(request_id)
     
     def health_check(self):
         """Check database health — always healthy for in-memory"""
@@ -0,0 +1,86 @@
+"""
+Compact In-Memory Records
+Slotted record classes used by InMemoryDBService in compact storage mode
+"""
+import sys
+
+_MISSING = object()
+
+
+class Record:
+    """Fixed-layout record with a dict-like read interface
+
+    Known fields live in __slots__; anything else goes into a lazily created
+    `extra` dict. Enum-like string fields are interned so every record shares
+    one copy of 'open', 'A+', 'donor', etc.
+    """
+    __slots__ = ('extra',)
+    FIELDS = ()
+    FIELD_SET = frozenset()
+    INTERNED = frozenset()
+
+    def __init__(self, data):
+        for field in self.FIELDS:
+            setattr(self, field, _MISSING)
+        self.extra = None
+        self.update(data)
+
+    def update(self, data):
+        """Apply a dict of changes, like dict.update"""
+        for key, value in data.items():
+            if key in self.INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            if key in self.FIELD_SET:
+                setattr(self, key, value)
+            else:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[key] = value
+
+    def get(self, key, default=None):
+        if key in self.FIELD_SET:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def to_dict(self):
+        """Materialise the record as a plain dict for callers"""
+        result = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not _MISSING:
+                result[field] = value
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+
+class UserRecord(Record):
+    __slots__ = (
+        'user_id', 'name', 'email', 'password_hash', 'role', 'phone',
+        'blood_type', 'last_donation', 'next_eligible_at', 'hospital_name', 'location', 'created_at'
+    )
+    FIELDS = __slots__
+    FIELD_SET = frozenset(__slots__)
+    INTERNED = frozenset({'role', 'blood_type'})
+
+
+class RequestRecord(Record):
+    __slots__ = (
+        'request_id', 'blood_type', 'quantity', 'urgency', 'status', 'created_by',
+        'timestamp', 'hospital_name', 'location', 'notes'
+    )
+    FIELDS = __slots__
+    FIELD_SET = frozenset(__slots__)
+    INTERNED = frozenset({'blood_type', 'urgency', 'status'})
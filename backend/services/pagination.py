@@ -0,0 +1,22 @@
+"""
+Pagination helpers
+Opaque cursor encoding shared by the database services
+"""
+import base64
+import binascii
+import json
+
+
+def encode_cursor(position):
+    """Encode a keyset position (any JSON-serialisable value) as an opaque cursor"""
+    raw = json.dumps(position, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -0,0 +1,342 @@
+"""
+Password Hasher
+Runs bcrypt hashing and verification on a bounded process pool, in this
+process or in a hashing service shared by every worker on the node
+"""
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import argparse
+import bcrypt
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Longest request line the hashing service reads (bcrypt uses 72 bytes of a password)
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class HashingUnavailable(Exception):
+    """Base error for hashing requests that could not be served"""
+    pass
+
+
+class HashingQueueFull(HashingUnavailable):
+    """Raised when too many hashing jobs are already queued"""
+    pass
+
+
+class HashingTimeout(HashingUnavailable):
+    """Raised when a hashing job does not finish in time"""
+    pass
+
+
+def _hash(password, rounds):
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def _check(password, hashed):
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+OPERATIONS = {'hash': _hash, 'verify': _check}
+
+# Service replies for each HashingUnavailable subclass
+ERRORS = {'queue_full': HashingQueueFull, 'timeout': HashingTimeout, 'unavailable': HashingUnavailable}
+
+
+def hash_cost(hashed):
+    """Read the cost factor out of a bcrypt hash ($2b$<cost>$...)"""
+    try:
+        return int(hashed.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class _ServiceHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, one JSON reply line out"""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline(MAX_REQUEST_BYTES))
+            op, args = request['op'], request.get('args', [])
+        except (ValueError, TypeError, KeyError):
+            return
+
+        hasher = self.server.hasher
+        if op == 'stats':
+            reply = {'result': {**hasher.stats(), 'scope': 'node'}}
+        elif op in OPERATIONS:
+            try:
+                reply = {'result': hasher._run(op, *args)}
+            except HashingUnavailable as e:
+                code = next(code for code, error in ERRORS.items() if type(e) is error)
+                reply = {'error': code, 'message': str(e)}
+            except Exception as e:
+                reply = {'error': 'failed', 'message': str(e)}
+        else:
+            return
+
+        # The caller may have timed out or died meanwhile; its job is done either way
+        try:
+            self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+        except OSError:
+            pass
+
+
+class _ServiceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class HashingService:
+    """A PasswordHasher pool in a process of its own, shared by a node's workers
+
+    deploy/gunicorn_config.py starts one from the gunicorn master before
+    any worker is forked; workers reach it over a Unix socket
+    (use_hashing_service). Jobs queue and run there, not in the request
+    workers, so workers - sync or gevent - only wait on a socket, and one
+    killed mid-login holds nothing: its job finishes or times out and
+    leaves the queue like any other. workers bcrypt processes run at once
+    and at most max_queue jobs wait or run on the node; beyond that
+    callers get HashingQueueFull straight away.
+    """
+
+    def __init__(self, address, workers=2, max_queue=8, timeout=10.0):
+        self.address = address
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._process = None
+
+    def start(self):
+        """Launch the service process and wait until it accepts connections"""
+        # A fresh interpreter rather than a fork, so workers forked from the
+        # master later inherit no multiprocessing state tied to it
+        self._process = subprocess.Popen([
+            sys.executable, os.path.abspath(__file__), self.address,
+            '--workers', str(self.workers),
+            '--max-queue', str(self.max_queue),
+            '--timeout', str(self.timeout)
+        ])
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and self._process.poll() is None:
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(self.address)
+                logger.info(f"Hashing service on {self.address} (pid {self._process.pid})")
+                return
+            except OSError:
+                time.sleep(0.1)
+        self.stop()
+        raise RuntimeError(f"Hashing service did not start on {self.address}")
+
+    def stop(self):
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+
+
+def serve(address, workers, max_queue, timeout):
+    """Run the hashing service on address until SIGTERM or until its parent exits"""
+    parent_pid = os.getppid()
+    # Ctrl-C reaches the whole process group; the master stops the service itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    if os.path.exists(address):
+        os.unlink(address)
+    server = _ServiceServer(address, _ServiceHandler)
+    # Passwords cross this socket: only the workers' user may connect
+    os.chmod(address, 0o600)
+    server.hasher = PasswordHasher(workers=workers, max_queue=max_queue, timeout=timeout)
+    # shutdown() waits for serve_forever, which this (main) thread is running
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+
+    def watch_parent():
+        # Exit with the master even if it was killed without stopping us
+        while os.getppid() == parent_pid:
+            time.sleep(1)
+        server.shutdown()
+
+    threading.Thread(target=watch_parent, daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        server.hasher.shutdown()
+        try:
+            os.unlink(address)
+        except OSError:
+            pass
+
+
+# Set in each gunicorn worker by deploy/gunicorn_config.py (post_fork)
+_service_address = None
+
+
+def use_hashing_service(address):
+    """Make PasswordHashers created from now on in this process use the service at address"""
+    global _service_address
+    _service_address = address
+
+
+class PasswordHasher:
+    """bcrypt on a process pool with a bounded queue
+
+    Keeps bcrypt's CPU time off the request-handling thread and caps how
+    much hashing work is accepted, so a login spike fails fast with
+    HashingQueueFull instead of starving every other endpoint. With
+    workers=0 hashing runs inline.
+
+    When a hashing service is in use (under gunicorn) jobs are sent to it
+    and its pool and queue, shared by the whole node, apply instead of
+    workers and max_queue.
+    """
+
+    def __init__(self, rounds=12, workers=2, max_queue=8, timeout=10.0):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.service = _service_address
+
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+        # Stats
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def _get_executor(self):
+        # Created lazily and per process, so gunicorn workers never share a pool
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _job_done(self, future):
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def _call_service(self, op, *args):
+        request = json.dumps({'op': op, 'args': args}).encode('utf-8') + b'\n'
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                # The service times jobs out itself; the margin covers the round trip
+                sock.settimeout(self.timeout + 1)
+                sock.connect(self.service)
+                sock.sendall(request)
+                with sock.makefile('rb') as reader:
+                    line = reader.readline()
+        except socket.timeout:
+            raise HashingTimeout(f"hashing service did not answer within {self.timeout}s")
+        except OSError as e:
+            logger.error(f"Hashing service at {self.service} unreachable: {e}")
+            raise HashingUnavailable("hashing service unreachable")
+        if not line:
+            raise HashingUnavailable("hashing service closed the connection")
+
+        reply = json.loads(line)
+        error = reply.get('error')
+        if error in ERRORS:
+            raise ERRORS[error](reply['message'])
+        if error:
+            raise ValueError(reply['message'])
+        return reply['result']
+
+    def _run(self, op, *args):
+        if self.service is not None:
+            return self._call_service(op, *args)
+        fn = OPERATIONS[op]
+        if self.workers <= 0:
+            return fn(*args)
+
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self._rejected += 1
+                raise HashingQueueFull(f"{self._pending} hashing jobs already queued")
+            self._pending += 1
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except Exception:
+                self._pending -= 1
+                raise
+        future.add_done_callback(self._job_done)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            logger.warning(f"Password hashing timed out after {self.timeout}s")
+            raise HashingTimeout(f"hashing did not finish within {self.timeout}s")
+        except BrokenProcessPool:
+            # A pool process died (e.g. OOM-killed); start a fresh pool for the next job
+            logger.error("Password hashing pool broke, restarting it")
+            with self._lock:
+                if self._executor is not None and self._executor._broken:
+                    self._executor = None
+            raise HashingUnavailable("hashing pool restarted")
+
+    def hash(self, password):
+        """Hash a password at the configured cost"""
+        return self._run('hash', password, self.rounds)
+
+    def verify(self, password, hashed):
+        """Verify a password against its hash"""
+        return self._run('verify', password, hashed)
+
+    def needs_rehash(self, hashed):
+        """True if a hash was made with a lower cost than the current one"""
+        cost = hash_cost(hashed)
+        return cost is not None and cost < self.rounds
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        if self.service is not None:
+            try:
+                return {**self._call_service('stats'), 'rounds': self.rounds}
+            except HashingUnavailable as e:
+                return {'scope': 'node', 'error': str(e), 'rounds': self.rounds}
+        with self._lock:
+            return {
+                'scope': 'process',
+                'queue_depth': self._pending,
+                'max_queue': self.max_queue,
+                'workers': self.workers,
+                'rounds': self.rounds,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts
+            }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='bcrypt hashing service for the workers of one node')
+    parser.add_argument('address', help='Unix socket path to listen on')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--max-queue', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    serve(args.address, args.workers, args.max_queue, args.timeout)
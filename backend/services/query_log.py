@@ -0,0 +1,256 @@
+"""
+Query Log
+Per-statement timings, row counts and errors for RDSService, with slow-query
+logging (parameter shapes, optionally EXPLAIN plans)
+"""
+import logging
+import re
+import threading
+import time
+from psycopg2 import extensions
+
+logger = logging.getLogger(__name__)
+
+# Distinct statements tracked; anything beyond is counted under OTHER so
+# ad-hoc SQL can't grow the table without bound
+MAX_STATEMENTS = 500
+OTHER = '<other statements>'
+MAX_KEY_CACHE = 1000
+MAX_ERROR_LENGTH = 200
+
+SORT_KEYS = ('max_ms', 'total_ms', 'mean_ms', 'calls', 'errors')
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'(?<![\w$.])\d+(?:\.\d+)?')
+_VALUES_LIST = re.compile(r'VALUES \([^()]*\)(?: ?, ?\([^()]*\))*', re.IGNORECASE)
+_EXECUTE = re.compile(r'EXECUTE (\w+)')
+
+
+def statement_key(query, literal_values=False):
+    """Normalised statement text statistics are grouped by
+
+    Whitespace is collapsed and EXECUTE parameter lists dropped. With
+    literal_values (SQL sent without parameters, e.g. built by
+    execute_values) literals are replaced by ? and a VALUES list by a
+    single (...), so rows don't leak into logs and batches of any size
+    share one entry.
+    """
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    query = _WHITESPACE.sub(' ', query).strip()
+    if literal_values:
+        query = _VALUES_LIST.sub('VALUES (...)', _STRING_LITERAL.sub('?', query))
+        query = _NUMBER_LITERAL.sub('?', query)
+    match = _EXECUTE.match(query)
+    return f"EXECUTE {match.group(1)}" if match else query
+
+
+def param_shape(params):
+    """Parameter types (and list lengths), never their values"""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {name: _value_shape(value) for name, value in params.items()}
+    return [_value_shape(value) for value in params]
+
+
+def _value_shape(value):
+    if value is None:
+        return 'None'
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+class TimedCursor(extensions.cursor):
+    """Default cursor whose every execute is recorded in query_log
+
+    Used as the connections' cursor_factory, so plain, named and
+    execute_values/StatementCache executes are all covered without the
+    service methods changing. Exceptions are recorded and re-raised.
+    """
+
+    query_log = None
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        except Exception as e:
+            self.query_log.record(self, query, vars, time.perf_counter() - start, error=e)
+            raise
+        self.query_log.record(self, query, vars, time.perf_counter() - start)
+        return result
+
+
+class QueryLog:
+    """Statement statistics since startup, shared by every connection of a pool
+
+    Counters live in this process, so under gunicorn each worker reports
+    what it ran itself. Queries taking slow_ms or longer are logged with
+    their parameter shapes; with explain, read-only ones are also re-run
+    under EXPLAIN (ANALYZE, BUFFERS) inside a savepoint and the plan kept
+    with the statement's slowest sample. That doubles the cost of every
+    slow SELECT, and plans show the values a query ran with, so it is
+    meant for diagnosing, not for running always.
+
+    resolve(name) returns the SQL of a prepared statement, so EXECUTE
+    entries are listed (and judged read-only) by what they run.
+    """
+
+    def __init__(self, slow_ms=200, explain=False, resolve=None):
+        self.slow_ms = slow_ms
+        self.explain = explain
+        self.resolve = resolve
+        self.started_at = time.time()
+        self.cursor_factory = type('TimedCursor', (TimedCursor,), {'query_log': self})
+
+        self._lock = threading.Lock()
+        self._statements = {}  # key -> aggregate dict
+        self._keys = {}  # raw SQL with parameters -> key
+        self._local = threading.local()  # connection wait of this thread's last checkout
+
+        # Connection checkouts
+        self._checkouts = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+
+    def record_wait(self, seconds):
+        """Note how long a get_connection call waited for the pool"""
+        self._local.wait = seconds
+        with self._lock:
+            self._checkouts += 1
+            self._wait_time += seconds
+            self._max_wait = max(self._max_wait, seconds)
+
+    def _key(self, query, params):
+        if params is None:
+            return statement_key(query, literal_values=True)
+        key = self._keys.get(query)
+        if key is None:
+            key = statement_key(query)
+            if len(self._keys) < MAX_KEY_CACHE:
+                self._keys[query] = key
+        return key
+
+    def record(self, cursor, query, params, seconds, error=None):
+        """Add one execute to its statement's totals; log it if slow"""
+        key = self._key(query, params)
+        rows = cursor.rowcount if error is None and cursor.rowcount >= 0 else 0
+        elapsed_ms = seconds * 1000
+        slow = bool(self.slow_ms) and elapsed_ms >= self.slow_ms
+
+        with self._lock:
+            entry = self._statements.get(key)
+            if entry is None:
+                if len(self._statements) >= MAX_STATEMENTS:
+                    key = OTHER
+                entry = self._statements.setdefault(key, {
+                    'calls': 0, 'errors': 0, 'rows': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'last_error': None, 'slowest': None
+                })
+            entry['calls'] += 1
+            entry['rows'] += rows
+            entry['total_ms'] += elapsed_ms
+            if error is not None:
+                entry['errors'] += 1
+                # First line only: the rest (LINE/DETAIL) can quote parameter values
+                message = (str(error).strip().splitlines() or [''])[0]
+                entry['last_error'] = f"{type(error).__name__}: {message[:MAX_ERROR_LENGTH]}"
+            slowest = elapsed_ms > entry['max_ms']
+            if slowest:
+                entry['max_ms'] = elapsed_ms
+
+        if not (slow or slowest):
+            return
+
+        sample = {
+            'duration_ms': round(elapsed_ms, 3),
+            'rows': rows,
+            'connection_wait_ms': round(getattr(self._local, 'wait', 0.0) * 1000, 3),
+            'params': param_shape(params),
+            'at': time.time()
+        }
+        if slow:
+            if self.explain and error is None and self._read_only(cursor, key):
+                sample['plan'] = self._explain(cursor, query, params)
+            logger.warning(
+                f"Slow query {elapsed_ms:.1f}ms ({rows} rows, {sample['connection_wait_ms']:.1f}ms waiting "
+                f"for a connection): {self._sql(key)} params={sample['params']}"
+                + (f"\n{sample['plan']}" if sample.get('plan') else '')
+            )
+        if slowest:
+            with self._lock:
+                if entry['max_ms'] == elapsed_ms:
+                    entry['slowest'] = sample
+
+    def _sql(self, key):
+        """Statement text for key, EXECUTE name resolved to the prepared SQL"""
+        match = _EXECUTE.match(key)
+        sql = self.resolve(match.group(1)) if match and self.resolve else None
+        return statement_key(sql) if sql else key
+
+    def _read_only(self, cursor, key):
+        # Named (server-side) cursors have already been read from by now
+        return cursor.name is None and not cursor.connection.autocommit and \
+            self._sql(key).upper().startswith('SELECT')
+
+    def _explain(self, cursor, query, params):
+        """EXPLAIN (ANALYZE, BUFFERS) plan text, run unrecorded and rolled back"""
+        conn = cursor.connection
+        explain = conn.cursor(cursor_factory=extensions.cursor)
+        if isinstance(query, bytes):
+            query = query.decode('utf-8')
+        try:
+            explain.execute("SAVEPOINT query_log_explain")
+            try:
+                explain.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+                return "\n".join(row[0] for row in explain.fetchall())
+            finally:
+                explain.execute("ROLLBACK TO SAVEPOINT query_log_explain")
+                explain.execute("RELEASE SAVEPOINT query_log_explain")
+        except Exception as e:
+            logger.warning(f"Could not EXPLAIN slow query: {e}")
+            return None
+        finally:
+            explain.close()
+
+    def top(self, limit=20, sort='max_ms'):
+        """The limit statements with the highest sort value, slowest sample included"""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_KEYS)}")
+
+        with self._lock:
+            statements = [(key, dict(entry)) for key, entry in self._statements.items()]
+        for key, entry in statements:
+            entry['statement'] = self._sql(key)
+            entry['mean_ms'] = entry['total_ms'] / entry['calls']
+        statements.sort(key=lambda item: item[1][sort], reverse=True)
+
+        return [
+            {
+                **entry,
+                'total_ms': round(entry['total_ms'], 3),
+                'max_ms': round(entry['max_ms'], 3),
+                'mean_ms': round(entry['mean_ms'], 3)
+            }
+            for _, entry in statements[:limit]
+        ]
+
+    def stats(self):
+        """Totals across statements plus connection checkout waits"""
+        with self._lock:
+            calls = sum(entry['calls'] for entry in self._statements.values())
+            return {
+                'since': self.started_at,
+                'statements': len(self._statements),
+                'calls': calls,
+                'errors': sum(entry['errors'] for entry in self._statements.values()),
+                'total_ms': round(sum(entry['total_ms'] for entry in self._statements.values()), 3),
+                'slow_ms': self.slow_ms,
+                'explain': self.explain,
+                'connection_checkouts': self._checkouts,
+                'connection_wait_total_ms': round(self._wait_time * 1000, 3),
+                'connection_wait_max_ms': round(self._max_wait * 1000, 3)
+            }
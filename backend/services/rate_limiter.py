@@ -0,0 +1,126 @@
+"""
+Rate Limiter
+Token-bucket rate limiting with an in-process backend and a pluggable shared backend
+"""
+from collections import OrderedDict
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rate(rate):
+    """Parse '<capacity>/<seconds>' into (capacity, tokens refilled per second)"""
+    capacity, seconds = rate.split('/')
+    capacity = float(capacity)
+    return capacity, capacity / float(seconds)
+
+
+class MemoryRateLimitBackend:
+    """Token buckets held in this process (per gunicorn worker)"""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate, cost=1):
+        """Take cost tokens; return 0 if allowed, else seconds until it would be"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+            retry_after = 0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                retry_after = (cost - tokens) / refill_rate
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+
+class RedisRateLimitBackend:
+    """Token buckets shared by every worker and node through Redis
+
+    Works with any client exposing redis-py's eval(), so a local stand-in
+    such as fakeredis can fill it in development and tests.
+    """
+
+    SCRIPT = """
+        local capacity = tonumber(ARGV[1])
+        local refill_rate = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local cost = tonumber(ARGV[4])
+        local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+        local tokens = tonumber(state[1]) or capacity
+        local updated_at = tonumber(state[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_rate)
+        local retry_after = 0
+        if tokens >= cost then
+            tokens = tokens - cost
+        else
+            retry_after = (cost - tokens) / refill_rate
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_rate) + 1)
+        return tostring(retry_after)
+    """
+
+    def __init__(self, client, prefix='ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+
+    def consume(self, key, capacity, refill_rate, cost=1):
+        try:
+            result = self.client.eval(
+                self.SCRIPT, 1, self.prefix + key,
+                capacity, refill_rate, time.time(), cost
+            )
+            return float(result)
+        except Exception as e:
+            # Fail open: an unavailable limiter must not take logins down
+            logger.error(f"Rate limit backend error: {e}")
+            return 0
+
+
+def create_rate_limit_backend(storage_url=None):
+    """Build the shared backend for storage_url, or the in-process one"""
+    if storage_url and storage_url.startswith(('redis://', 'rediss://')):
+        try:
+            import redis
+            return RedisRateLimitBackend(redis.Redis.from_url(storage_url))
+        except ImportError:
+            logger.warning("redis package not installed — using in-process rate limiting")
+    return MemoryRateLimitBackend()
+
+
+class RateLimiter:
+    """Named token-bucket rules applied to arbitrary identities"""
+
+    def __init__(self, rules, backend=None, enabled=True):
+        self.rules = {name: parse_rate(rate) for name, rate in rules.items()}
+        self.backend = backend or MemoryRateLimitBackend()
+        self.enabled = enabled
+
+        # Stats
+        self.allowed = 0
+        self.limited = 0
+
+    def hit(self, rule, identity):
+        """Count a request against rule for identity; return retry-after seconds or 0"""
+        if not self.enabled or rule not in self.rules:
+            return 0
+
+        capacity, refill_rate = self.rules[rule]
+        retry_after = self.backend.consume(f"{rule}:{identity}", capacity, refill_rate)
+        if retry_after:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return retry_after
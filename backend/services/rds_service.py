@@ -2,35 +2,124 @@ import psycopg2
 from psycopg2 import pool, extras
 from psycopg2.extensions import AsIs
 from config import Config
+from .connection_pool import ManagedConnectionPool, per_worker_pool_size
+from .pagination import encode_cursor, decode_cursor
+from .inventory_ops import fold_inventory_updates, bulk_results, InsufficientStock
+from .statement_cache import StatementCache
+from .query_log import QueryLog
+from .eligibility import DONOR_FIELDS, next_eligible_at, eligibility_key, split_eligibility_key, public_donor
+from .fieldsets import USER_FIELDS, INVENTORY_COLUMNS, request_select_list, project
 import logging
 from datetime import datetime
+import time
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Fixed hot-path queries, prepared once per connection. Prepared statements
+# name their columns: a SELECT * plan breaks when its table is altered
+USER_COLUMNS = ", ".join(USER_FIELDS)
+STATEMENTS = {
+    'insert_user': """
+        INSERT INTO users (user_id, name, email, password_hash, role, blood_type, phone, last_donation, next_eligible_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING user_id
+    """,
+    'user_by_id': f"SELECT {USER_COLUMNS} FROM users WHERE user_id = %s",
+    'user_by_email': f"SELECT {USER_COLUMNS} FROM users WHERE email = %s",
+    'insert_request': """
+        INSERT INTO blood_requests 
+        (request_id, blood_type, quantity, urgency, status, hospital_name, 
+         patient_name, contact_number, notes, created_by)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING request_id
+    """,
+    'request_by_id': f"""
+        SELECT {request_select_list(None)[0]}
+        FROM blood_requests r
+        LEFT JOIN users u ON r.created_by = u.user_id
+        WHERE r.request_id = %s
+    """,
+    'inventory_by_type': f"SELECT {', '.join(INVENTORY_COLUMNS)} FROM inventory WHERE blood_type = %s",
+    'inventory_all': f"SELECT {', '.join(INVENTORY_COLUMNS)} FROM inventory ORDER BY blood_type",
+    'update_inventory': """
+        UPDATE inventory 
+        SET units_available = %s, last_updated = CURRENT_TIMESTAMP, updated_by = %s
+        WHERE blood_type = %s
+    """,
+    'table_version': "SELECT sum(version)::bigint, max(updated_at) FROM table_versions WHERE table_name = %s",
+    'request_version': "SELECT updated_at FROM blood_requests WHERE request_id = %s"
+}
+
+# Columns update_user/update_request may set
+USER_UPDATE_COLUMNS = {'name', 'phone', 'blood_type', 'last_donation', 'next_eligible_at', 'password_hash', 'role'}
+REQUEST_UPDATE_COLUMNS = {
+    'status', 'notes', 'quantity', 'urgency', 'hospital_name',
+    'patient_name', 'contact_number', 'fulfilled_at'
+}
+
+def row_dicts(cursor, rows):
+    """Plain dicts for rows fetched from a (default, tuple) cursor
+    
+    Rows are still turned into one dict each before serialization: routes,
+    project() and the cache index them by name, and the memory and Dynamo
+    services return dicts too. What this saves is RealDictCursor's
+    per-column OrderedDict building in Python plus the dict() copy callers
+    made of it; the column names are read once per result and each row is
+    a single dict(zip()).
+    """
+    columns = [column.name for column in cursor.description]
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def row_dict(cursor, row):
+    """Plain dict for one fetched row, or None"""
+    return dict(zip([column.name for column in cursor.description], row)) if row else None
+
+
 class RDSService:
     """Service for PostgreSQL RDS operations"""
     
     def __init__(self, config: Config):
         self.config = config
         self.connection_pool = None
+        self.statements = StatementCache(enabled=getattr(config, 'DB_PREPARED_STATEMENTS', True))
+        self.statements.register_many(STATEMENTS)
+        self.query_log = QueryLog(
+            slow_ms=getattr(config, 'SLOW_QUERY_MS', 200),
+            explain=getattr(config, 'SLOW_QUERY_EXPLAIN', False),
+            resolve=self.statements.sql
+        )
         self._initialize_pool()
     
     def _initialize_pool(self):
         """Initialize connection pool"""
         try:
-            self.connection_pool = psycopg2.pool.SimpleConnectionPool(
-                1, 20,  # min and max connections
-                self.config.DATABASE_URL
+            max_size = per_worker_pool_size(
+                self.config.DB_POOL_MAX_SIZE,
+                self.config.DB_POOL_TOTAL_CONNECTIONS,
+                self.config.WEB_CONCURRENCY
+            )
+            self.connection_pool = ManagedConnectionPool(
+                self.config.DATABASE_URL,
+                min_size=min(self.config.DB_POOL_MIN_SIZE, max_size),
+                max_size=max_size,
+                timeout=self.config.DB_POOL_TIMEOUT,
+                max_lifetime=self.config.DB_POOL_MAX_LIFETIME,
+                max_waiters=self.config.DB_POOL_MAX_WAITERS,
+                cursor_factory=self.query_log.cursor_factory  # every execute is timed
             )
-            logger.info("Database connection pool created successfully")
+            logger.info(f"Database connection pool created successfully (max {max_size} connections)")
         except Exception as e:
             logger.error(f"Error creating connection pool: {e}")
             raise
     
     def get_connection(self):
         """Get a connection from the pool"""
-        return self.connection_pool.getconn()
+        start = time.perf_counter()
+        conn = self.connection_pool.getconn()
+        self.query_log.record_wait(time.perf_counter() - start)
+        return conn
     
     def return_connection(self, conn):
         """Return a connection to the pool"""
@@ -41,6 +130,18 @@ class RDSService:
         if self.connection_pool:
             self.connection_pool.closeall()
     
+    def get_pool_stats(self):
+        """Get connection pool statistics"""
+        return self.connection_pool.stats() if self.connection_pool else {}
+    
+    def get_statement_stats(self):
+        """Get prepared statement cache statistics"""
+        return self.statements.stats()
+    
+    def get_query_stats(self, limit=20, sort='max_ms'):
+        """Get per-statement timings since startup, top limit by sort"""
+        return {**self.query_log.stats(), 'top': self.query_log.top(limit, sort)}
+    
     # User operations
     def create_user(self, user_data):
         """Create a new user"""
@@ -50,12 +151,7 @@ class RDSService:
             cursor = conn.cursor()
             
             user_id = str(uuid.uuid4())
-            query = """
-                INSERT INTO users (user_id, name, email, password_hash, role, blood_type, phone, last_donation)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING user_id
-            """
-            cursor.execute(query, (
+            self.statements.execute(cursor, 'insert_user', (
                 user_id,
                 user_data.get('name'),
                 user_data.get('email'),
@@ -63,7 +159,8 @@ class RDSService:
                 user_data.get('role'),
                 user_data.get('blood_type'),
                 user_data.get('phone'),
-                user_data.get('last_donation')
+                user_data.get('last_donation'),
+                next_eligible_at(user_data.get('last_donation'), self.config.DONATION_INTERVAL_DAYS)
             ))
             
             conn.commit()
@@ -83,14 +180,13 @@ class RDSService:
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor = conn.cursor()
             
-            query = "SELECT * FROM users WHERE user_id = %s"
-            cursor.execute(query, (user_id,))
+            self.statements.execute(cursor, 'user_by_id', (user_id,))
             user = cursor.fetchone()
             
             cursor.close()
-            return dict(user) if user else None
+            return row_dict(cursor, user)
         except Exception as e:
             logger.error(f"Error getting user by ID: {e}")
             return None
@@ -98,19 +194,26 @@ class RDSService:
             if conn:
                 self.return_connection(conn)
     
-    def get_user_by_email(self, email):
-        """Get user by email"""
+    def get_user_by_email(self, email, fields=None):
+        """Get user by email, only the given columns if fields is set
+        
+        Callers other than login should pass fields, so password_hash and
+        the rest of the row are not read.
+        """
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor = conn.cursor()
             
-            query = "SELECT * FROM users WHERE email = %s"
-            cursor.execute(query, (email,))
+            if fields:
+                name = self.statements.select_statement('users', 'email', fields, USER_FIELDS)
+                self.statements.execute(cursor, name, (email,))
+            else:
+                self.statements.execute(cursor, 'user_by_email', (email,))
             user = cursor.fetchone()
             
             cursor.close()
-            return dict(user) if user else None
+            return row_dict(cursor, user)
         except Exception as e:
             logger.error(f"Error getting user by email: {e}")
             return None
@@ -125,13 +228,20 @@ class RDSService:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            # Build dynamic UPDATE query
-            set_clause = ", ".join([f"{key} = %s" for key in update_data.keys()])
-            values = list(update_data.values())
+            # Keep the precomputed eligibility date in step with last_donation
+            if 'last_donation' in update_data:
+                update_data = dict(update_data, next_eligible_at=next_eligible_at(
+                    update_data['last_donation'], self.config.DONATION_INTERVAL_DAYS
+                ))
+            
+            # Compiled once per distinct set of (whitelisted) columns
+            name, columns = self.statements.update_statement(
+                'users', 'user_id', update_data.keys(), USER_UPDATE_COLUMNS
+            )
+            values = [update_data[column] for column in columns]
             values.append(user_id)
             
-            query = f"UPDATE users SET {set_clause} WHERE user_id = %s"
-            cursor.execute(query, values)
+            self.statements.execute(cursor, name, values)
             
             conn.commit()
             cursor.close()
@@ -145,6 +255,95 @@ class RDSService:
             if conn:
                 self.return_connection(conn)
     
+    def get_donor_columns(self, blood_types=None, user_ids=None):
+        """Get user_id, blood_type and last_donation of donors as parallel lists"""
+        conditions = ["role = 'donor'"]
+        params = []
+        if blood_types:
+            conditions.append("blood_type = ANY(%s)")
+            params.append(list(blood_types))
+        if user_ids:
+            conditions.append("user_id = ANY(%s::uuid[])")
+            params.append(list(user_ids))
+        
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            query = f"SELECT user_id, blood_type, last_donation FROM users WHERE {' AND '.join(conditions)}"
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            ids, types, last_donations = zip(*rows) if rows else ((), (), ())
+            return {
+                'user_id': [str(user_id) for user_id in ids],
+                'blood_type': list(types),
+                'last_donation': list(last_donations)
+            }
+        except Exception as e:
+            logger.error(f"Error getting donor columns: {e}")
+            return {'user_id': [], 'blood_type': [], 'last_donation': []}
+        finally:
+            if conn:
+                self.return_connection(conn)
+    
+    def get_eligible_donors(self, blood_types, eligible_at, limit, cursor=None):
+        """Get donors of the given blood types eligible by eligible_at
+        
+        One index range scan per blood type (LIMIT limit + 1 each), merged in
+        (next_eligible_at, user_id) order. Returns (donors, next_cursor).
+        Raises ValueError for a malformed cursor.
+        """
+        after = None
+        if cursor:
+            last_eligible, last_id = split_eligibility_key(decode_cursor(cursor))
+            after = (last_eligible, str(uuid.UUID(last_id)))
+        
+        columns = ", ".join(DONOR_FIELDS)
+        branches = []
+        params = []
+        for blood_type in blood_types:
+            keyset_clause = "AND (next_eligible_at, user_id) > (%s, %s::uuid)" if after else ""
+            branches.append(f"""
+                (SELECT {columns} FROM users
+                 WHERE role = 'donor' AND blood_type = %s AND next_eligible_at <= %s {keyset_clause}
+                 ORDER BY next_eligible_at, user_id
+                 LIMIT %s)
+            """)
+            params.extend([blood_type, eligible_at, *(after or ()), limit + 1])
+        if not branches:
+            return [], None
+        params.append(limit + 1)
+        
+        conn = None
+        try:
+            conn = self.get_connection()
+            db_cursor = conn.cursor()
+            
+            query = f"""
+                SELECT * FROM ({' UNION ALL '.join(branches)}) donors
+                ORDER BY next_eligible_at, user_id
+                LIMIT %s
+            """
+            db_cursor.execute(query, params)
+            rows = row_dicts(db_cursor, db_cursor.fetchall())
+            db_cursor.close()
+            
+            donors = [public_donor(row) for row in rows]
+            if len(donors) <= limit:
+                return donors, None
+            
+            last = rows[limit - 1]
+            return donors[:limit], encode_cursor(eligibility_key(last['next_eligible_at'], last['user_id']))
+        except Exception as e:
+            logger.error(f"Error getting eligible donors: {e}")
+            return [], None
+        finally:
+            if conn:
+                self.return_connection(conn)
+    
     # Blood request operations
     def create_request(self, request_data):
         """Create a new blood request"""
@@ -154,14 +353,7 @@ class RDSService:
             cursor = conn.cursor()
             
             request_id = str(uuid.uuid4())
-            query = """
-                INSERT INTO blood_requests 
-                (request_id, blood_type, quantity, urgency, status, hospital_name, 
-                 patient_name, contact_number, notes, created_by)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING request_id
-            """
-            cursor.execute(query, (
+            self.statements.execute(cursor, 'insert_request', (
                 request_id,
                 request_data.get('blood_type'),
                 request_data.get('quantity'),
@@ -191,19 +383,13 @@ class RDSService:
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor = conn.cursor()
             
-            query = """
-                SELECT r.*, u.name as created_by_name 
-                FROM blood_requests r
-                LEFT JOIN users u ON r.created_by = u.user_id
-                WHERE r.request_id = %s
-            """
-            cursor.execute(query, (request_id,))
+            self.statements.execute(cursor, 'request_by_id', (request_id,))
             request = cursor.fetchone()
             
             cursor.close()
-            return dict(request) if request else None
+            return row_dict(cursor, request)
         except Exception as e:
             logger.error(f"Error getting request by ID: {e}")
             return None
@@ -216,7 +402,7 @@ class RDSService:
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor = conn.cursor()
             
             if status:
                 query = """
@@ -239,7 +425,7 @@ class RDSService:
             
             requests = cursor.fetchall()
             cursor.close()
-            return [dict(req) for req in requests]
+            return row_dicts(cursor, requests)
         except Exception as e:
             logger.error(f"Error getting requests by blood type: {e}")
             return []
@@ -247,12 +433,39 @@ class RDSService:
             if conn:
                 self.return_connection(conn)
     
+    def get_requests_for_blood_types(self, blood_types, status=None):
+        """Get requests for several blood types in one indexed query"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            status_clause = "AND r.status = %s" if status else ""
+            query = f"""
+                SELECT r.*, u.name as created_by_name 
+                FROM blood_requests r
+                LEFT JOIN users u ON r.created_by = u.user_id
+                WHERE r.blood_type = ANY(%s) {status_clause}
+                ORDER BY r.created_at DESC
+            """
+            cursor.execute(query, [list(blood_types)] + ([status] if status else []))
+            
+            requests = cursor.fetchall()
+            cursor.close()
+            return row_dicts(cursor, requests)
+        except Exception as e:
+            logger.error(f"Error getting requests by blood types: {e}")
+            return []
+        finally:
+            if conn:
+                self.return_connection(conn)
+    
     def get_all_requests(self, status=None):
         """Get all requests, optionally filtered by status"""
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor = conn.cursor()
             
             if status:
                 query = """
@@ -274,7 +487,7 @@ class RDSService:
             
             requests = cursor.fetchall()
             cursor.close()
-            return [dict(req) for req in requests]
+            return row_dicts(cursor, requests)
         except Exception as e:
             logger.error(f"Error getting all requests: {e}")
             return []
@@ -282,6 +495,120 @@ class RDSService:
             if conn:
                 self.return_connection(conn)
     
+    def get_requests_page(self, blood_type=None, status=None, limit=None, cursor=None, fields=None):
+        """Get requests newest first, one keyset page at a time
+        
+        fields limits the columns read; the users join is only made for
+        created_by_name.
+        Returns (requests, next_cursor); next_cursor is None on the last page.
+        Raises ValueError for a malformed cursor.
+        """
+        conditions = []
+        params = []
+        
+        if blood_type:
+            conditions.append("r.blood_type = %s")
+            params.append(blood_type)
+        if status:
+            conditions.append("r.status = %s")
+            params.append(status)
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor)
+            conditions.append("(r.created_at, r.request_id) < (%s, %s)")
+            params.extend([last_created_at, last_id])
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        select_list, join_users = request_select_list(fields)
+        join_clause = "LEFT JOIN users u ON r.created_by = u.user_id" if join_users else ""
+        limit_clause = ""
+        if limit is not None:
+            # Fetch one extra row to know whether another page exists
+            limit_clause = "LIMIT %s"
+            params.append(limit + 1)
+        
+        conn = None
+        try:
+            conn = self.get_connection()
+            db_cursor = conn.cursor()
+            
+            query = f"""
+                SELECT {select_list}
+                FROM blood_requests r
+                {join_clause}
+                {where_clause}
+                ORDER BY r.created_at DESC, r.request_id DESC
+                {limit_clause}
+            """
+            db_cursor.execute(query, params)
+            rows = db_cursor.fetchall()
+            db_cursor.close()
+            
+            requests = row_dicts(db_cursor, rows)
+            next_cursor = None
+            if limit is not None and len(requests) > limit:
+                requests = requests[:limit]
+                last = requests[-1]
+                next_cursor = encode_cursor([last['created_at'].isoformat(), str(last['request_id'])])
+            
+            if fields:
+                requests = [project(row, fields) for row in requests]
+            return requests, next_cursor
+        except Exception as e:
+            logger.error(f"Error getting requests page: {e}")
+            return [], None
+        finally:
+            if conn:
+                self.return_connection(conn)
+    
+    def iter_requests(self, blood_type=None, status=None, fetch_size=1000):
+        """Yield requests newest first without loading them all
+        
+        Uses a named (server-side) cursor, so only fetch_size rows are held
+        in memory at a time. The pooled connection is kept until the
+        generator is exhausted or closed. Errors are raised, not swallowed:
+        a stream that just ended would pass for a complete export.
+        """
+        conditions = []
+        params = []
+        
+        if blood_type:
+            conditions.append("r.blood_type = %s")
+            params.append(blood_type)
+        if status:
+            conditions.append("r.status = %s")
+            params.append(status)
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        conn = None
+        try:
+            conn = self.get_connection()
+            db_cursor = conn.cursor(name=f"export_{uuid.uuid4().hex}")
+            db_cursor.itersize = fetch_size
+            
+            db_cursor.execute(f"""
+                SELECT r.*, u.name as created_by_name
+                FROM blood_requests r
+                LEFT JOIN users u ON r.created_by = u.user_id
+                {where_clause}
+                ORDER BY r.created_at DESC, r.request_id DESC
+            """, params)
+            columns = None
+            for row in db_cursor:
+                if columns is None:
+                    # A named cursor only has a description after the first fetch
+                    columns = [column.name for column in db_cursor.description]
+                yield dict(zip(columns, row))
+            db_cursor.close()
+        except Exception as e:
+            logger.error(f"Error streaming requests: {e}")
+            raise
+        finally:
+            if conn:
+                # Read-only; ends the transaction that held the named cursor
+                conn.rollback()
+                self.return_connection(conn)
+    
     def update_request(self, request_id, update_data):
         """Update request data"""
         conn = None
@@ -289,13 +616,14 @@ class RDSService:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            # Build dynamic UPDATE query
-            set_clause = ", ".join([f"{key} = %s" for key in update_data.keys()])
-            values = list(update_data.values())
+            # Compiled once per distinct set of (whitelisted) columns
+            name, columns = self.statements.update_statement(
+                'blood_requests', 'request_id', update_data.keys(), REQUEST_UPDATE_COLUMNS
+            )
+            values = [update_data[column] for column in columns]
             values.append(request_id)
             
-            query = f"UPDATE blood_requests SET {set_clause} WHERE request_id = %s"
-            cursor.execute(query, values)
+            self.statements.execute(cursor, name, values)
             
             conn.commit()
             cursor.close()
@@ -315,18 +643,16 @@ class RDSService:
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor = conn.cursor()
             
             if blood_type:
-                query = "SELECT * FROM inventory WHERE blood_type = %s"
-                cursor.execute(query, (blood_type,))
+                self.statements.execute(cursor, 'inventory_by_type', (blood_type,))
                 inventory = cursor.fetchone()
-                result = dict(inventory) if inventory else None
+                result = row_dict(cursor, inventory)
             else:
-                query = "SELECT * FROM inventory ORDER BY blood_type"
-                cursor.execute(query)
+                self.statements.execute(cursor, 'inventory_all')
                 inventory = cursor.fetchall()
-                result = [dict(item) for item in inventory]
+                result = row_dicts(cursor, inventory)
             
             cursor.close()
             return result
@@ -344,12 +670,7 @@ class RDSService:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            query = """
-                UPDATE inventory 
-                SET units_available = %s, last_updated = CURRENT_TIMESTAMP, updated_by = %s
-                WHERE blood_type = %s
-            """
-            cursor.execute(query, (units_available, updated_by, blood_type))
+            self.statements.execute(cursor, 'update_inventory', (units_available, updated_by, blood_type))
             
             conn.commit()
             cursor.close()
@@ -363,19 +684,123 @@ class RDSService:
             if conn:
                 self.return_connection(conn)
     
+    def adjust_inventory(self, blood_type, delta, updated_by):
+        """Atomically add delta (negative to issue units) to a blood type
+        
+        One round trip: the UPDATE only applies if the result stays >= 0 and
+        returns the new level.
+        Returns the new units_available, or None for an unknown blood type or error.
+        Raises InsufficientStock if the result would be below zero.
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            query = """
+                WITH updated AS (
+                    UPDATE inventory
+                    SET units_available = units_available + %s,
+                        last_updated = CURRENT_TIMESTAMP, updated_by = %s
+                    WHERE blood_type = %s AND units_available + %s >= 0
+                    RETURNING units_available
+                )
+                SELECT (SELECT units_available FROM updated),
+                       (SELECT units_available FROM inventory WHERE blood_type = %s)
+            """
+            cursor.execute(query, (delta, updated_by, blood_type, delta, blood_type))
+            units, previous = cursor.fetchone()
+            
+            conn.commit()
+            cursor.close()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Error adjusting inventory: {e}")
+            return None
+        finally:
+            if conn:
+                self.return_connection(conn)
+        
+        if units is None and previous is not None:
+            raise InsufficientStock(f"Only {previous} units of {blood_type} available")
+        return units
+    
+    def bulk_update_inventory(self, updates, updated_by):
+        """Apply several {blood_type, units_available | delta} changes atomically
+        
+        All changes go out as one batched statement in one transaction.
+        Returns (success, per-item results); nothing is applied if any item
+        fails. success is None when the database failed rather than an item.
+        """
+        folded = fold_inventory_updates(updates)
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            query = """
+                WITH changes (blood_type, units, delta, updated_by) AS (VALUES %s),
+                updated AS (
+                    UPDATE inventory i
+                    SET units_available = COALESCE(c.units, i.units_available) + c.delta,
+                        last_updated = CURRENT_TIMESTAMP,
+                        updated_by = c.updated_by
+                    FROM changes c
+                    WHERE i.blood_type = c.blood_type
+                      AND COALESCE(c.units, i.units_available) + c.delta >= 0
+                    RETURNING i.blood_type, i.units_available
+                )
+                SELECT c.blood_type, u.units_available, i.blood_type IS NOT NULL
+                FROM changes c
+                LEFT JOIN updated u ON u.blood_type = c.blood_type
+                LEFT JOIN inventory i ON i.blood_type = c.blood_type
+            """
+            rows = extras.execute_values(
+                cursor, query,
+                [(blood_type, absolute, delta, updated_by) for blood_type, (absolute, delta) in folded.items()],
+                template="(%s, %s::integer, %s::integer, %s::uuid)",
+                fetch=True
+            )
+            
+            levels = {}
+            failed = {}
+            for blood_type, units, known in rows:
+                if not known:
+                    failed[blood_type] = 'Unknown blood type'
+                elif units is None:
+                    failed[blood_type] = 'Insufficient units'
+                else:
+                    levels[blood_type] = units
+            
+            if failed:
+                conn.rollback()
+            else:
+                conn.commit()
+            cursor.close()
+            return not failed, bulk_results(updates, levels, failed)
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Error bulk updating inventory: {e}")
+            return None, bulk_results(updates, {}, {bt: 'Database error' for bt in folded})
+        finally:
+            if conn:
+                self.return_connection(conn)
+    
     def get_low_stock_items(self, threshold=5):
         """Get blood types with low stock"""
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor = conn.cursor()
             
             query = "SELECT * FROM inventory WHERE units_available < %s ORDER BY units_available ASC"
             cursor.execute(query, (threshold,))
             items = cursor.fetchall()
             
             cursor.close()
-            return [dict(item) for item in items]
+            return row_dicts(cursor, items)
         except Exception as e:
             logger.error(f"Error getting low stock items: {e}")
             return []
@@ -383,6 +808,47 @@ class RDSService:
             if conn:
                 self.return_connection(conn)
     
+    # Change versions (conditional GET)
+    def get_table_version(self, table):
+        """Get (version, modified) of a table from its table_versions slots, or None"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            self.statements.execute(cursor, 'table_version', (table,))
+            row = cursor.fetchone()
+            
+            cursor.close()
+            return tuple(row) if row and row[0] is not None else None
+        except Exception as e:
+            logger.error(f"Error getting table version: {e}")
+            return None
+        finally:
+            if conn:
+                self.return_connection(conn)
+    
+    def get_request_version(self, request_id):
+        """Get (version, modified) of one request from its updated_at, or None"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            self.statements.execute(cursor, 'request_version', (request_id,))
+            row = cursor.fetchone()
+            
+            cursor.close()
+            if not row or row[0] is None:
+                return None
+            return row[0].isoformat(), row[0]
+        except Exception as e:
+            logger.error(f"Error getting request version: {e}")
+            return None
+        finally:
+            if conn:
+                self.return_connection(conn)
+    
     # Health check
     def health_check(self):
         """Check database connection health"""
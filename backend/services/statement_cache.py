@@ -0,0 +1,170 @@
+"""
+Statement Cache
+Server-side prepared statements for RDSService, prepared once per connection
+"""
+import re
+import threading
+import weakref
+import psycopg2
+from psycopg2 import extensions
+
+# Statements a connection no longer has (DISCARD ALL, pooler) or that a
+# schema change invalidated ("cached plan must not change result type")
+STALE_STATEMENT_ERRORS = (psycopg2.errors.InvalidSqlStatementName, psycopg2.errors.FeatureNotSupported)
+
+
+class StatementCache:
+    """Runs named statements through PREPARE/EXECUTE, preparing lazily per connection
+
+    Statements are written with psycopg2 %s placeholders. The first time a
+    connection runs one it is sent as PREPARE; afterwards only EXECUTE with
+    the parameters goes over the wire, so the server skips parse and plan.
+    With enabled=False the same SQL is executed directly (e.g. behind
+    PgBouncer in transaction mode, where prepared statements don't survive).
+
+    A statement the server dropped, or whose plan a schema change
+    invalidated, is prepared again and, if it was the first statement of
+    its transaction, retried once after a rollback. Otherwise the error is
+    raised and the statement is prepared afresh on the connection's next
+    use. Registered SQL should name its columns: a SELECT * statement fails
+    on any ALTER TABLE of its table.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._sql = {}  # name -> SQL with %s placeholders
+        self._prepare_sql = {}  # name -> PREPARE text with $n placeholders
+        self._updates = {}  # (table, key_column, columns) -> statement name
+        self._selects = {}  # (table, key_column, columns) -> statement name
+        self._prepared = weakref.WeakKeyDictionary()  # connection -> names prepared on it
+        self._invalidated = weakref.WeakKeyDictionary()  # connection -> names to DEALLOCATE before preparing
+        self._lock = threading.Lock()
+
+        # Stats
+        self.prepares = 0
+        self.executions = 0
+        self.retries = 0
+
+    def register(self, name, sql):
+        """Add a statement; re-registering the same name must use the same SQL"""
+        with self._lock:
+            if name not in self._sql:
+                position = iter(range(1, sql.count('%s') + 1))
+                self._sql[name] = sql
+                self._prepare_sql[name] = f"PREPARE {name} AS " + re.sub(r'%s', lambda _: f"${next(position)}", sql)
+
+    def register_many(self, statements):
+        for name, sql in statements.items():
+            self.register(name, sql)
+
+    def update_statement(self, table, key_column, fields, allowed_columns):
+        """Compile UPDATE table SET ... WHERE key_column = %s once per field set
+
+        fields must be a subset of allowed_columns (column names can't be
+        bound as parameters). Returns (name, ordered fields); pass values in
+        that order followed by the key.
+        """
+        columns = tuple(sorted(fields))
+        invalid = set(columns) - set(allowed_columns)
+        if invalid:
+            raise ValueError(f"Cannot update {table} columns: {', '.join(sorted(invalid))}")
+
+        key = (table, key_column, columns)
+        name = self._updates.get(key)
+        if name is None:
+            set_clause = ", ".join(f"{column} = %s" for column in columns)
+            with self._lock:
+                name = self._updates.setdefault(key, f"update_{table}_{len(self._updates)}")
+            self.register(name, f"UPDATE {table} SET {set_clause} WHERE {key_column} = %s")
+        return name, columns
+
+    def select_statement(self, table, key_column, fields, allowed_columns):
+        """Compile SELECT fields FROM table WHERE key_column = %s once per field set
+
+        The projection counterpart of update_statement: fields must be a
+        subset of allowed_columns. Returns the statement name.
+        """
+        columns = tuple(sorted(set(fields)))
+        invalid = set(columns) - set(allowed_columns)
+        if invalid:
+            raise ValueError(f"Cannot select {table} columns: {', '.join(sorted(invalid))}")
+
+        key = (table, key_column, columns)
+        name = self._selects.get(key)
+        if name is None:
+            with self._lock:
+                name = self._selects.setdefault(key, f"select_{table}_{len(self._selects)}")
+            self.register(name, f"SELECT {', '.join(columns)} FROM {table} WHERE {key_column} = %s")
+        return name
+
+    def execute(self, cursor, name, params=()):
+        """Execute a registered statement on cursor"""
+        self.executions += 1
+        if not self.enabled:
+            cursor.execute(self._sql[name], params)
+            return
+
+        conn = cursor.connection
+        # A statement that opens its transaction can be retried: rolling back loses nothing
+        retryable = conn.info.transaction_status == extensions.TRANSACTION_STATUS_IDLE
+        try:
+            self._execute_prepared(cursor, name, params)
+        except STALE_STATEMENT_ERRORS as e:
+            self._invalidate(conn, name, isinstance(e, psycopg2.errors.FeatureNotSupported))
+            if not retryable:
+                raise
+            conn.rollback()
+            self.retries += 1
+            self._execute_prepared(cursor, name, params)
+
+    def _execute_prepared(self, cursor, name, params):
+        conn = cursor.connection
+        with self._lock:
+            prepared = self._prepared.setdefault(conn, set())
+            needs_prepare = name not in prepared
+            needs_deallocate = name in self._invalidated.get(conn, ())
+
+        if needs_deallocate:
+            cursor.execute(f"DEALLOCATE {name}")
+            with self._lock:
+                self._invalidated[conn].discard(name)
+        if needs_prepare:
+            cursor.execute(self._prepare_sql[name])
+            self.prepares += 1
+            with self._lock:
+                prepared.add(name)
+
+        placeholders = ", ".join(["%s"] * len(params))
+        cursor.execute(f"EXECUTE {name} ({placeholders})" if params else f"EXECUTE {name}", params)
+
+    def _invalidate(self, conn, name, exists):
+        """Prepare name again on conn's next use, dropping the old one first if it still exists
+
+        A missing statement usually means all of them went (DISCARD ALL), so
+        everything is forgotten then.
+        """
+        if exists:
+            with self._lock:
+                self._prepared.get(conn, set()).discard(name)
+                self._invalidated.setdefault(conn, set()).add(name)
+        else:
+            self.forget(conn)
+
+    def sql(self, name):
+        """SQL of a registered statement, or None"""
+        return self._sql.get(name)
+
+    def forget(self, conn):
+        """Drop what we know about statements prepared on conn"""
+        with self._lock:
+            self._prepared.pop(conn, None)
+            self._invalidated.pop(conn, None)
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'statements': len(self._sql),
+            'prepares': self.prepares,
+            'executions': self.executions,
+            'retries': self.retries
+        }
@@ -0,0 +1,64 @@
+"""
+Token Cache
+Bounded LRU cache of verified JWT payloads
+"""
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+
+
+class TokenCache:
+    """Maps sha256(token) -> verified payload until the token's exp"""
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # digest -> (exp, payload)
+        self._lock = threading.Lock()
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token):
+        """Return a copy of the cached payload, or None if absent or expired"""
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            exp, payload = entry
+            if exp is not None and time.time() >= exp:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(payload)
+
+    def put(self, token, payload):
+        """Cache a payload that has just been verified"""
+        if self.max_size <= 0:
+            return
+        key = self._digest(token)
+        exp = payload.get('exp')
+        with self._lock:
+            self._entries[key] = (exp, dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}